@@ -2,17 +2,26 @@
 Módulo para gerar seção About Me em estilo terminal para README.md
 """
 
-def generate_about_me_section():
+def generate_about_me_section(username=None, display_name=None, about_text=None):
     """
     Gera a seção About Me em estilo terminal
     
+    Args:
+        username (str): Usuário do GitHub (padrão: o deste perfil)
+        display_name (str): Nome exibido no `whoami`
+        about_text (str): Texto do "About me"
+    
     Returns:
         str: Seção About Me formatada em Markdown
     """
-    # Configurações personalizáveis
+    # Configurações personalizáveis (as deste perfil, quando nenhum usuário é passado)
     USERNAME = "dudupys"
     DISPLAY_NAME = "Dudu"
     ABOUT_TEXT = "💻 Desenvolvedor de Sistemas em formação\n🤖 Interesse em Automação, Inteligência Artificial e Desenvolvimento de Software\n🎓 Estudante de Informática para Internet\n📚 Projetos em Tecnologia Educacional"
+    if username is not None:
+        USERNAME, DISPLAY_NAME, ABOUT_TEXT = username, username, ""
+    DISPLAY_NAME = display_name or DISPLAY_NAME
+    ABOUT_TEXT = about_text if about_text is not None else ABOUT_TEXT
     
     about_me_content = f"""```bash
 $ whoami
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Modo batch: gera o GIF e o README de vários usuários do GitHub num só processo
+
+As estatísticas de todos os usuários são buscadas em paralelo, por uma única
+sessão HTTP (um pool de conexões e um controle de limite da API para o
+token). Depois as fontes são carregadas e as cenas comuns a vários usuários
+(a BIOS, o boot com as mesmas fontes) são renderizadas uma vez, e um pool de
+processos criado com fork herda tudo isso: cada processo renderiza e
+codifica os perfis que recebe reaproveitando o mesmo atlas de glifos.
+
+Uso:
+    python batch.py usuarios.json [--output-dir profiles] [--workers 4]
+
+usuarios.json é uma lista de objetos; só "username" é obrigatório:
+    [{"username": "octocat",
+      "display_name": "Octo",
+      "about": "Texto do About me",
+      "timezone": "America/Sao_Paulo",
+      "birth_date": "2007-12-03",
+      "details": {"OS": "Linux", "Email": "octo@example.com"},
+      "fonts": {"logo": "./fonts/...", "bitmap": "./fonts/...", "mona": "./fonts/..."}}]
+
+Cada usuário ganha <output-dir>/<username>/output.gif e README.md. O token
+vem de GITHUB_TOKEN; sem ele (ou se a busca falhar) o usuário recebe as
+estatísticas mock, como no main.py. As cenas comuns usam o cache em disco
+do main.py (SCENE_CACHE_DIR; vazio desliga).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from functools import partial
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import main
+import run_profile
+from reflexao_diaria_generator import generate_reflexao_diaria_section
+from scene_cache import DEFAULT_CACHE_DIR, SceneCache
+
+DEFAULT_OUTPUT_DIR = "profiles"
+FONT_KEYS = ("logo", "bitmap", "mona")
+# Cenas que dependem do usuário; as demais podem ser iguais entre usuários
+USER_SCENES = ("login", "fetch")
+
+# Frames das cenas comuns e entradas de cada usuário, preparados antes do fork e
+# herdados pelos processos (só o nome do usuário passa pelo pickle)
+_shared_frames: Dict[str, list] = {}
+_jobs: Dict[str, tuple] = {}
+
+
+class UserConfig:
+    """Configuração de um perfil do modo batch
+
+    Attributes:
+        username: Usuário do GitHub
+        display_name / about: `whoami` e texto do About me do README
+        timezone: Fuso do "Last login" e do rodapé do README
+        birth_date: Data (AAAA-MM-DD) para o Uptime do fetch.sh, ou None para omiti-lo
+        details: Linhas "Campo: valor" do fetch.sh
+        fonts: Fontes "logo", "bitmap" e "mona" que substituem as do main.py
+    """
+
+    FIELDS = ("username", "display_name", "about", "timezone", "birth_date", "details", "fonts")
+
+    def __init__(self, username: str, display_name: Optional[str] = None, about: Optional[str] = None,
+                 timezone: str = main.TIMEZONE, birth_date: Optional[str] = None,
+                 details: Optional[Dict[str, str]] = None, fonts: Optional[Dict[str, str]] = None):
+        if not username or "/" in username:
+            raise ValueError(f"usuário inválido: {username!r}")
+        try:
+            ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"{username}: fuso horário desconhecido: {timezone!r}") from None
+        unknown = set(fonts or {}) - set(FONT_KEYS)
+        if unknown:
+            raise ValueError(f"{username}: fontes desconhecidas: {', '.join(sorted(unknown))}")
+        self.username = username
+        self.display_name = display_name
+        self.about = about
+        self.timezone = timezone
+        self.birth_date = date.fromisoformat(birth_date) if birth_date else None
+        self.details = dict(details or {})
+        self.fonts = {"logo": main.FONT_FILE_LOGO, "bitmap": main.FONT_FILE_BITMAP,
+                      "mona": main.FONT_FILE_MONA, **(fonts or {})}
+
+    @property
+    def font_key(self) -> tuple:
+        return tuple(sorted(self.fonts.items()))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UserConfig':
+        unknown = set(data) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"campos desconhecidos: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+
+def load_users(path: str) -> List[UserConfig]:
+    """Lê a lista de usuários (JSON); usuários repetidos são um erro"""
+    with open(path, "r", encoding="utf-8") as f:
+        users = [UserConfig.from_dict(item) for item in json.load(f)]
+    names = [user.username.lower() for user in users]
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"usuários repetidos: {', '.join(duplicated)}")
+    return users
+
+
+def fetch_all(users: List[UserConfig], token: Optional[str], workers: int = 8) -> Dict[str, Any]:
+    """Estatísticas de todos os usuários, em paralelo, por uma única sessão HTTP"""
+    token = main.resolve_github_token(token)  # sem token, ainda vale um cassete (GITHUB_CASSETTE)
+    if not token:
+        print("Token GitHub não encontrado - usando dados mock para todos os usuários")
+        return {user.username: main.mock_user_details() for user in users}
+    from github_stats import DEFAULT_MAX_WORKERS, RateLimiter, shared_session
+
+    # cada busca REST usa até DEFAULT_MAX_WORKERS threads; o pool comporta todas
+    session = shared_session(workers * DEFAULT_MAX_WORKERS)
+    options = {"session": session, "rate_limiter": RateLimiter()}
+
+    def fetch(user: UserConfig):
+        with run_profile.span("batch.fetch", user=user.username):
+            return main.fetch_user_details(user.username, token, **options)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(min(workers, len(users)), 1)) as executor:
+            return dict(zip([user.username for user in users], executor.map(fetch, users)))
+    finally:
+        session.close()
+
+
+def user_scenes(user: UserConfig, details, year_now: str, time_now: str) -> list:
+    """Cenas do usuário; as que dependem dele ganham o nome do usuário (cache e semente)"""
+    birth = user.birth_date
+    user_age = main.calc_user_age(birth.day, birth.month, birth.year) if birth else None
+    profile_lines = None
+    if user.details or user.username != main.USERNAME:
+        profile_lines = main.profile_details_text(user.details, user_age)
+    elif user_age is None:
+        user_age = main.calc_user_age()  # o bloco padrão do dudupys tem o Uptime
+    lines = main.user_details_text(details, user_age, user.username, profile_lines)
+    scenes = main.build_scenes(year_now, time_now, lines, user.username, user.fonts)
+    for scene in scenes:
+        if scene.name in USER_SCENES:
+            scene.name = f"{scene.name}-{user.username}"
+    return scenes
+
+
+class SharedSceneCache(SceneCache):
+    """Cache de cenas dos processos do pool: só as cenas comuns, renderizadas antes do fork
+
+    As cenas de cada usuário (o login tem o horário, o fetch as estatísticas do
+    dia) quase nunca se repetem entre execuções, então não vão para o disco.
+    """
+
+    def __init__(self, fingerprint: bytes):
+        super().__init__(os.getenv("SCENE_CACHE_DIR", DEFAULT_CACHE_DIR) or DEFAULT_CACHE_DIR, fingerprint)
+
+    def load(self, scene) -> Optional[list]:
+        frames = _shared_frames.get(self.key(scene))
+        (self.misses if frames is None else self.hits).append(scene.name)
+        return frames
+
+    def store(self, scene, frames: list) -> None:
+        pass
+
+
+def render_user(user: UserConfig, details, fingerprint: bytes, output_dir: str,
+                reflexao_diaria_section: str) -> Dict[str, Any]:
+    """Renderiza o GIF e grava o README de um usuário (roda num processo do pool)"""
+    from gif_writer import gif_writer_for
+    from scenes import render_scenes
+
+    start = time.perf_counter()
+    folder = Path(output_dir) / user.username
+    folder.mkdir(parents=True, exist_ok=True)
+    year_now, time_now = main.now_strings(user.timezone)
+
+    # o paralelismo do batch é por usuário: cada processo comprime o próprio GIF
+    make_terminal = partial(main.new_terminal, font_file=user.fonts["bitmap"],
+                            prompt=main.prompt_for(user.username))
+    with gif_writer_for(str(folder / "output.gif"), workers=1) as gif_writer:
+        render_scenes(user_scenes(user, details, year_now, time_now), make_terminal, gif_writer,
+                      workers=1, cache=SharedSceneCache(fingerprint))
+
+    about_me_section = main.generate_about_me_section(user.username, user.display_name, user.about)
+    main.write_readme(time_now, about_me_section, reflexao_diaria_section,
+                      username=user.username, path=str(folder / "README.md"))
+    return {"username": user.username, "frames": gif_writer.frame_count,
+            "bytes": os.path.getsize(gif_writer.file_name), "seconds": round(time.perf_counter() - start, 3)}
+
+
+def _prepare_shared(users: List[UserConfig], all_details: Dict[str, Any],
+                    fingerprints: Dict[tuple, bytes]) -> None:
+    """Carrega as fontes e renderiza uma vez as cenas iguais para mais de um usuário"""
+    from cell_terminal import shared_atlas
+    from scenes import render_scene
+
+    atlas = shared_atlas()
+    for font_file in {user.fonts["bitmap"] for user in users}:
+        atlas.font(font_file, 15, 4)
+
+    seen: Dict[str, tuple] = {}
+    repeated: Dict[str, tuple] = {}
+    for user in users:
+        year_now, time_now = main.now_strings(user.timezone)
+        keys = SharedSceneCache(fingerprints[user.font_key])
+        for scene in user_scenes(user, all_details[user.username], year_now, time_now):
+            key = keys.key(scene)
+            if key in seen:
+                repeated[key] = seen[key]
+            seen[key] = (scene, user)
+    # as cenas comuns usam o cache em disco (SCENE_CACHE_DIR) como o main.py
+    directory = os.getenv("SCENE_CACHE_DIR", DEFAULT_CACHE_DIR)
+    for key, (scene, user) in repeated.items():
+        with run_profile.span("batch.shared_scene", scene=scene.name) as attrs:
+            cache = SceneCache(directory, fingerprints[user.font_key]) if directory else None
+            frames = cache.load(scene) if cache else None
+            attrs["hit"] = frames is not None
+            if frames is None:
+                make_terminal = partial(main.new_terminal, font_file=user.fonts["bitmap"],
+                                        prompt=main.prompt_for(user.username))
+                frames = render_scene(scene, make_terminal)
+                if cache:
+                    cache.store(scene, frames)
+        _shared_frames[key] = frames
+
+
+def run_batch(users: List[UserConfig], output_dir: str = DEFAULT_OUTPUT_DIR,
+              workers: Optional[int] = None, token: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Gera os perfis de todos os usuários
+
+    Args:
+        users (list): Configurações dos usuários
+        output_dir (str): Pasta onde fica uma subpasta por usuário
+        workers (int): Processos de renderização; padrão RENDER_WORKERS ou o número de CPUs
+        token (str): Token do GitHub (padrão GITHUB_TOKEN)
+
+    Returns:
+        list: Um resultado por usuário, na ordem recebida ({"username", "frames",
+        "bytes", "seconds"} ou {"username", "error"})
+    """
+    if workers is None:
+        from scenes import render_workers_from_env
+
+        # no batch cada processo renderiza um perfil inteiro: vale um por CPU
+        workers = render_workers_from_env(default=os.cpu_count() or 1)
+    token = os.getenv("GITHUB_TOKEN") if token is None else token
+
+    with run_profile.span("batch.fetch_all", users=len(users)):
+        all_details = fetch_all(users, token)
+    reflexao_diaria_section = generate_reflexao_diaria_section()
+    fingerprints = {}
+    for user in users:
+        if user.font_key not in fingerprints:
+            fingerprints[user.font_key] = main.render_fingerprint_for_gif(
+                [*user.fonts.values(), main.FONT_FILE_TRUETYPE])
+    # o gifos, as fontes e as cenas comuns são carregados antes do fork e herdados pelo pool
+    main.preload_gifos()
+    _prepare_shared(users, all_details, fingerprints)
+
+    for user in users:
+        _jobs[user.username] = (user, all_details[user.username], fingerprints[user.font_key],
+                                output_dir, reflexao_diaria_section)
+    try:
+        with run_profile.span("batch.render", users=len(users), workers=workers):
+            if workers <= 1 or len(users) <= 1:
+                return [_run_job(user.username) for user in users]
+            with ProcessPoolExecutor(max_workers=min(workers, len(users)),
+                                     mp_context=get_context("fork")) as executor:
+                return list(executor.map(_run_job, [user.username for user in users]))
+    finally:
+        _jobs.clear()
+        _shared_frames.clear()
+
+
+def _run_job(username: str) -> Dict[str, Any]:
+    """`render_user` de um usuário preparado por `run_batch`; um erro não interrompe os demais"""
+    try:
+        return render_user(*_jobs[username])
+    except Exception as e:
+        return {"username": username, "error": f"{type(e).__name__}: {e}"}
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("users", help="arquivo JSON com a lista de usuários")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, help="processos de renderização (padrão: CPUs)")
+    args = parser.parse_args(argv)
+
+    try:
+        users = load_users(args.users)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Erro na lista de usuários: {e}")
+        return 2
+
+    profile_path = os.getenv("RUN_PROFILE", run_profile.DEFAULT_PROFILE_FILE)
+    if profile_path:
+        run_profile.start(profile_path)
+    start = time.perf_counter()
+    try:
+        results = run_batch(users, args.output_dir, args.workers)
+    finally:
+        run_profile.finish()
+    for result in results:
+        if "error" in result:
+            print(f"{result['username']}: ERRO {result['error']}")
+        else:
+            print(f"{result['username']}: {result['frames']} frames, {result['bytes'] / 1024:.1f} KB, "
+                  f"{result['seconds']:.2f}s")
+    elapsed = time.perf_counter() - start
+    print(f"{len(users)} perfis em {elapsed:.2f}s ({len(users) / elapsed:.2f} perfis/s)")
+    return 1 if any("error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
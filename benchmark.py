@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""Benchmarks da renderização, da codificação do GIF e da busca no GitHub, sem rede
+
+Mede cada cena do main.py, a codificação do GIF (direto dos frames, como no
+main.py, serial e no pool de processos, e a partir de frames/*.png, como no
+create_gif_only.py) e o
+fetch_github_stats (REST e GraphQL) contra o servidor local do github_stub
+ou, com --cassette, reproduzindo um cassete gravado de uma conta real (ver
+github_cassette.py).
+Para cada caso são registrados frames, bytes, requisições, segundos e pico de
+memória (tracemalloc), comparados com benchmark_baseline.json; uma piora além
+da tolerância faz o script terminar com erro.
+
+Uso:
+    python benchmark.py                      # compara com a linha de base
+    python benchmark.py --update-baseline    # grava os resultados como nova linha de base
+    python benchmark.py --repos 60 --latency 0.05 --fonts /caminho/das/fontes
+    python benchmark.py --cassette github.json --user octocat
+
+As fontes em fonts/ vêm do Git LFS; sem elas os casos de renderização e
+codificação são pulados.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_BASELINE_FILE = str(HERE / "benchmark_baseline.json")
+DEFAULT_REPOS = 30
+DEFAULT_LATENCY = 0.01
+
+# Piora relativa tolerada por métrica (0.5 = até 50% acima da linha de base),
+# mais uma folga absoluta para medidas pequenas e ruidosas
+TOLERANCES = {"seconds": 0.5, "peak_mb": 0.25, "bytes": 0.05}
+ABSOLUTE_SLACK = {"seconds": 0.05, "peak_mb": 1.0}
+# Contagens (frames, requisições) não podem aumentar
+DEFAULT_TOLERANCE = 0.0
+
+# Entradas fixas das cenas, para que os frames sejam os mesmos em toda execução
+BENCH_YEAR = "2025"
+BENCH_TIME = "Mon Jan 06 09:00:00 AM -03 2025"
+BENCH_AGE = type('obj', (object,), {'years': 18, 'months': 2, 'days': 13})()
+
+Result = Dict[str, float]
+
+
+@contextlib.contextmanager
+def _environ(**values: str):
+    """Define variáveis de ambiente só dentro do bloco"""
+    saved = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def measure(run: Callable[[], Result], repeat: int = 1) -> Result:
+    """Executa `run` e acrescenta o tempo (o menor de `repeat` execuções) e o pico de memória
+
+    O tempo é medido sem o tracemalloc, que deixa o código mais lento; o pico
+    de memória vem de uma execução extra com ele ligado.
+    """
+    seconds = float("inf")
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        result = run()
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {**result, "seconds": round(seconds, 4), "peak_mb": round(peak / 2**20, 2)}
+
+
+def bench_fetch(backend: str, stub) -> Tuple[Result, Any]:
+    """fetch_github_stats contra o stub já iniciado, sem cache em disco"""
+    from github_stats import fetch_github_stats
+
+    stub.requests.clear()
+    with _environ(GITHUB_API_URL=stub.url, GITHUB_CACHE_DIR=""), \
+            contextlib.redirect_stdout(io.StringIO()):
+        stats = fetch_github_stats("token", "dudupys", backend=backend)
+    if stats is None:
+        raise RuntimeError(f"fetch_github_stats ({backend}) falhou contra o stub")
+    return {"requests": len(stub.requests)}, stats
+
+
+def bench_fetch_cassette(backend: str, path: str, username: str,
+                         latency: float) -> Tuple[Result, Any]:
+    """fetch_github_stats reproduzindo o cassete, sem rede e sem cache em disco"""
+    from github_cassette import open_cassette
+    from github_stats import fetch_github_stats
+
+    cassette = open_cassette(path)
+    replayed = cassette.replayed
+    with _environ(GITHUB_CASSETTE=path, GITHUB_CASSETTE_MODE="replay",
+                  GITHUB_CASSETTE_LATENCY=str(latency), GITHUB_CACHE_DIR=""), \
+            contextlib.redirect_stdout(io.StringIO()):
+        stats = fetch_github_stats("token", username, backend=backend)
+    if stats is None:
+        raise RuntimeError(f"fetch_github_stats ({backend}) falhou com o cassete {path}")
+    return {"requests": cassette.replayed - replayed}, stats
+
+
+def bench_scene(scene) -> Tuple[Result, list]:
+    """Frames de uma cena do main.py"""
+    import main
+    from scenes import render_scene
+
+    frames = render_scene(scene, main.new_terminal)
+    return {"frames": len(frames), "source_frames": sum(count for _, count, _ in frames)}, frames
+
+
+def bench_encode(frames: list, file_name: str, workers: int = 1) -> Result:
+    """Codificação direta dos frames (índices da paleta), como no main.py"""
+    from gif_writer import GifWriter
+
+    with GifWriter(file_name, workers=workers) as gif_writer:
+        for indices, count, dirty in frames:
+            gif_writer.add_frame(indices, count, dirty)
+    return {"frames": gif_writer.frame_count, "bytes": os.path.getsize(file_name)}
+
+
+def write_png_frames(frames: list, folder: str) -> int:
+    """Grava os frames como frames/frame_N.png, a entrada do create_gif_only.py"""
+    from PIL import Image
+    from palette import ColorPalette
+
+    colors = ColorPalette.from_color_scheme().colors
+    os.makedirs(folder, exist_ok=True)
+    number = 0
+    for indices, count, _ in frames:
+        image = Image.fromarray(colors[indices])
+        for _ in range(count):
+            number += 1
+            image.save(os.path.join(folder, f"frame_{number}.png"), compress_level=1)
+    return number
+
+
+def bench_create_gif_only() -> Result:
+    """create_gif_only.py no diretório atual (lê frames/ e grava output.gif)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        runpy.run_path(str(HERE / "create_gif_only.py"), run_name="__main__")
+    return {"bytes": os.path.getsize("output.gif")}
+
+
+def fonts_available(fonts_dir: Path) -> bool:
+    """As fontes são arquivos reais (e não os ponteiros de texto do Git LFS)?"""
+    import main
+
+    for font_file in (main.FONT_FILE_LOGO, main.FONT_FILE_BITMAP, main.FONT_FILE_MONA):
+        path = fonts_dir / Path(font_file).name
+        try:
+            with open(path, "rb") as f:
+                if f.read(40).startswith(b"version https://git-lfs"):
+                    return False
+        except OSError:
+            return False
+    return True
+
+
+def run_benchmarks(repos: int = DEFAULT_REPOS, latency: float = DEFAULT_LATENCY,
+                   repeat: int = 1, fonts_dir: Optional[str] = None,
+                   render: bool = True, cassette: Optional[str] = None,
+                   username: str = "dudupys") -> Dict[str, Result]:
+    """Executa todos os casos e devolve {caso: {métrica: valor}}
+
+    Com `cassette`, as buscas reproduzem o cassete (com `latency` por resposta)
+    em vez de usar o stub, e as cenas mostram as estatísticas de `username`.
+    """
+    from github_stub import GitHubStub, sample_data
+
+    results: Dict[str, Result] = {}
+    if cassette:
+        for backend in ("rest", "graphql"):
+            results[f"fetch_{backend}"] = measure(
+                lambda: bench_fetch_cassette(backend, cassette, username, latency)[0], repeat)
+        _, stats = bench_fetch_cassette("rest", cassette, username, 0.0)
+    else:
+        # o stub fica de pé durante todos os casos (o shutdown do servidor leva até 0,5s)
+        with GitHubStub(sample_data(num_repos=repos), delay=latency) as stub:
+            for backend in ("rest", "graphql"):
+                results[f"fetch_{backend}"] = measure(lambda: bench_fetch(backend, stub)[0], repeat)
+            stub.delay = 0.0
+            _, stats = bench_fetch("rest", stub)
+    if not render:
+        return results
+
+    fonts = Path(fonts_dir or HERE / "fonts").resolve()
+    if not fonts_available(fonts):
+        print(f"Fontes indisponíveis em {fonts} (Git LFS?) - renderização e codificação puladas")
+        return results
+
+    import main
+    from scenes import render_scene
+
+    scenes = main.build_scenes(BENCH_YEAR, BENCH_TIME, main.user_details_text(stats, BENCH_AGE))
+    # Importar o gifos apaga output.gif e frames/ do diretório atual: tudo roda numa pasta temporária
+    cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix="benchmark-")
+    try:
+        os.chdir(work_dir)
+        os.symlink(fonts, "fonts")
+        render_scene(scenes[1], main.new_terminal)  # aquece imports e fontes
+        all_frames = []
+        for scene in scenes:
+            results[f"render_{scene.name}"] = measure(lambda: bench_scene(scene)[0], repeat)
+            all_frames.extend(bench_scene(scene)[1])
+        results["encode_main"] = measure(lambda: bench_encode(all_frames, "output.gif"), repeat)
+        # compressão no pool (GIF_WORKERS), com pelo menos 2 processos
+        results["encode_parallel"] = measure(
+            lambda: bench_encode(all_frames, "output.gif", max(os.cpu_count() or 1, 2)), repeat)
+        source_frames = write_png_frames(all_frames, "frames")
+        results["encode_create_gif_only"] = {
+            "source_frames": source_frames, **measure(bench_create_gif_only, repeat)}
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def compare(results: Dict[str, Result], baseline: Dict[str, Result],
+            tolerances: Optional[Dict[str, float]] = None) -> List[str]:
+    """Métricas que pioraram além da tolerância em relação à linha de base
+
+    Todas as métricas são "quanto menor, melhor"; casos ou métricas ausentes
+    de um dos lados são ignorados.
+    """
+    tolerances = {**TOLERANCES, **(tolerances or {})}
+    regressions = []
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(case, {}).get(metric)
+            if base is None:
+                continue
+            limit = base * (1 + tolerances.get(metric, DEFAULT_TOLERANCE)) + ABSOLUTE_SLACK.get(metric, 0)
+            if value > limit:
+                regressions.append(f"{case}.{metric}: {value} > {base} (limite {limit:.4g})")
+    return regressions
+
+
+def format_report(results: Dict[str, Result], baseline: Dict[str, Result]) -> str:
+    lines = []
+    for case, metrics in results.items():
+        cells = []
+        for metric, value in metrics.items():
+            base = baseline.get(case, {}).get(metric)
+            delta = f" ({(value - base) / base:+.0%})" if base else ""
+            cells.append(f"{metric}={value}{delta}")
+        lines.append(f"{case:<24} {'  '.join(cells)}")
+    return "\n".join(lines)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def bench_config(repos: int, latency: float, cassette: Optional[str] = None,
+                 username: str = "dudupys") -> Dict[str, Any]:
+    """O que precisa ser igual para que a comparação com a linha de base faça sentido"""
+    config = {
+        "repos": repos,
+        "latency": latency,
+        "fps": os.getenv("GIFOS_GENERAL_FPS", ""),
+        "color_scheme": os.getenv("GIFOS_GENERAL_COLOR_SCHEME", ""),
+        "engine": os.getenv("TERMINAL_ENGINE", "cell"),
+    }
+    if cassette:
+        config.update(cassette=os.path.basename(cassette), user=username, repos=None)
+    return config
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=DEFAULT_REPOS, help="repositórios no stub")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY,
+                        help="atraso do stub por requisição, em segundos")
+    parser.add_argument("--repeat", type=int, default=3, help="execuções por caso (vale a mais rápida)")
+    parser.add_argument("--fonts", help="pasta com as fontes reais (padrão: fonts/)")
+    parser.add_argument("--no-render", action="store_true", help="só os casos de busca no GitHub")
+    parser.add_argument("--cassette", help="reproduz as buscas deste cassete em vez do stub")
+    parser.add_argument("--user", default="dudupys", help="usuário gravado no cassete")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--time-tolerance", type=float, default=TOLERANCES["seconds"],
+                        help="piora de tempo tolerada (0.5 = 50%%)")
+    args = parser.parse_args(argv)
+
+    config = bench_config(args.repos, args.latency, args.cassette, args.user)
+    results = run_benchmarks(args.repos, args.latency, args.repeat, args.fonts, not args.no_render,
+                             args.cassette, args.user)
+    saved = load_baseline(args.baseline)
+    baseline = saved.get("results", {}) if saved.get("config") == config else {}
+    print(format_report(results, baseline))
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"Linha de base gravada em {args.baseline}")
+        return 0
+    if not baseline:
+        print("Sem linha de base para esta configuração - nada a comparar")
+        return 0
+    regressions = compare(results, baseline, {"seconds": args.time_tolerance})
+    for regression in regressions:
+        print(f"REGRESSÃO {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
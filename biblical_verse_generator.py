@@ -5,6 +5,31 @@ Módulo para gerar mensagem bíblica do dia de forma determinística
 import os
 from datetime import datetime
 
+from corpus_index import open_corpus
+
+
+def parse_verse(line):
+    """
+    Converte uma linha "livro|capítulo|versículo|texto" em versículo
+    
+    Args:
+        line (str): Linha do arquivo de versículos
+        
+    Returns:
+        dict: Versículo, ou None se a linha não for válida
+    """
+    line = line.strip()
+    if line and '|' in line:
+        parts = line.split('|')
+        if len(parts) >= 4:
+            return {
+                'book': parts[0].strip(),
+                'chapter': parts[1].strip(),
+                'verse': parts[2].strip(),
+                'text': parts[3].strip()
+            }
+    return None
+
 
 def load_verses(file_path="versiculos_biblicos.txt"):
     """
@@ -25,42 +50,42 @@ def load_verses(file_path="versiculos_biblicos.txt"):
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
             for line in file:
-                line = line.strip()
-                if line and '|' in line:
-                    parts = line.split('|')
-                    if len(parts) >= 4:
-                        verse = {
-                            'book': parts[0].strip(),
-                            'chapter': parts[1].strip(),
-                            'verse': parts[2].strip(),
-                            'text': parts[3].strip()
-                        }
-                        verses.append(verse)
+                verse = parse_verse(line)
+                if verse:
+                    verses.append(verse)
     except Exception as e:
         print(f"Erro ao carregar versículos: {e}")
     
     return verses
 
 
-def get_daily_verse():
+def get_daily_verse(file_path="versiculos_biblicos.txt"):
     """
     Seleciona o versículo do dia de forma determinística
     
+    Lê só o versículo do dia, pelo índice do arquivo (ver corpus_index), sem
+    carregar os demais.
+    
     Returns:
         dict: Versículo do dia ou None se não houver versículos
     """
-    verses = load_verses()
+    corpus = open_corpus(file_path, parse_verse)
     
-    if not verses:
+    if corpus is None:
+        print(f"Arquivo de versículos não encontrado: {file_path}")
         return None
     
-    # Calcula o dia do ano (1-366)
-    current_date = datetime.now()
-    day_of_year = current_date.timetuple().tm_yday
-    
-    # Seleciona versículo de forma determinística
-    verse_index = day_of_year % len(verses)
-    selected_verse = verses[verse_index]
+    with corpus:
+        if not len(corpus):
+            return None
+        
+        # Calcula o dia do ano (1-366)
+        current_date = datetime.now()
+        day_of_year = current_date.timetuple().tm_yday
+        
+        # Seleciona versículo de forma determinística
+        verse_index = day_of_year % len(corpus)
+        selected_verse = corpus[verse_index]
     
     return selected_verse
 
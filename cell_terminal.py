@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""Motor de terminal em grade de células (NumPy) com atlas de glifos
+
+Alternativa ao `gifos.Terminal` com a mesma API usada no main.py. Em vez de
+redesenhar cada palavra com o ImageDraw a cada chamada, a tela é mantida como
+uma grade de células que apontam para blocos (tiles) de um atlas. Cada
+combinação (fonte, caractere, cor do texto, cor de fundo) é rasterizada uma
+única vez, e os frames são montados copiando os tiles com NumPy, já nos
+índices da paleta global do GIF.
+"""
+
+import os
+import random
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+import run_profile
+from palette import TRANSPARENT_INDEX, ColorPalette, load_color_scheme
+
+# mesmas expressões usadas pelo gifos para separar sequências ANSI do texto
+ANSI_ESCAPE_PATTERN = re.compile(r"(\\x1b\[\d+(?:;\d+)*m|\x1b\[\d+(?:;\d+)*m)")
+COLOR_CODE_PATTERN = re.compile(r"\\x1b\[(\d+)(?:;(\d+))*m|\x1b\[(\d+)(?:;(\d+))*m")
+
+TXT_COLOR_CODES = {str(c) for c in [*range(30, 38), 39, *range(90, 98)]}
+BG_COLOR_CODES = {str(c) for c in [*range(40, 48), 49, *range(100, 108)]}
+
+EMPTY_TILE = 0  # tile totalmente transparente: mostra a camada de baixo
+
+# Retângulo (x1, y1, x2, y2) em pixels, x2/y2 exclusivos
+Rect = Tuple[int, int, int, int]
+NO_CHANGE: Rect = (0, 0, 0, 0)
+
+
+def union_rect(a: Optional[Rect], b: Optional[Rect]) -> Optional[Rect]:
+    """Menor retângulo que contém `a` e `b` (None ou vazio contam como nada)"""
+    if a is None or a[0] >= a[2] or a[1] >= a[3]:
+        return b
+    if b is None or b[0] >= b[2] or b[1] >= b[3]:
+        return a
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+class FontMetrics:
+    """Fonte carregada com as mesmas medidas de célula que o gifos calcula"""
+
+    def __init__(self, font_file: str, font_size: int, line_spacing: int):
+        self.key = (font_file, font_size, line_spacing)
+        self.font = self._load(font_file, font_size)
+        widths = [self.font.getbbox(chr(i))[2] for i in range(ord("A"), ord("Z") + 1)]
+        self.monospace = max(widths) == min(widths)
+        if self.monospace:
+            self.width = self.font.getbbox("W")[2]
+            self.height = self.font.getbbox(r'|(/QMW"')[3]
+        else:
+            self.width = int(round(sum(widths) / len(widths), 0))
+            ascent, descent = self.font.getmetrics()
+            self.height = ascent + descent
+        self.line_spacing = line_spacing
+
+    @staticmethod
+    def _load(font_file: str, font_size: int):
+        try:
+            return ImageFont.truetype(font_file, font_size)
+        except OSError:
+            pass
+        try:
+            return ImageFont.load(font_file)
+        except OSError:
+            print(f"ERROR: Could not locate font_file {font_file}")
+            sys.exit(1)
+
+    @property
+    def cell_height(self) -> int:
+        return self.height + self.line_spacing
+
+    @property
+    def fits_grid(self) -> bool:
+        """Se cada caractere (com o fundo, que o gifos pinta com 1px a mais) cabe numa célula"""
+        return self.monospace and self.line_spacing >= 1
+
+
+class GlyphAtlas:
+    """Tiles rasterizados uma única vez por (fonte, caractere, texto, fundo)
+
+    Cada tile tem o tamanho de uma célula e guarda índices da paleta. Pixels
+    fora do retângulo de fundo e do próprio glifo ficam transparentes, como
+    no gifos, que não pinta o espaçamento entre linhas.
+    """
+
+    def __init__(self, palette: ColorPalette):
+        self.palette = palette
+        self._fonts: Dict[tuple, FontMetrics] = {}
+        self._ids: Dict[tuple, int] = {}
+        self._tiles: Dict[tuple, List[np.ndarray]] = {}
+        self._stacked: Dict[tuple, np.ndarray] = {}
+        self._sprites: Dict[tuple, np.ndarray] = {}
+
+    def font(self, font_file: str, font_size: int, line_spacing: int) -> FontMetrics:
+        key = (font_file, font_size, line_spacing)
+        if key not in self._fonts:
+            self._fonts[key] = FontMetrics(font_file, font_size, line_spacing)
+        return self._fonts[key]
+
+    def _tile_list(self, font: FontMetrics) -> List[np.ndarray]:
+        if font.key not in self._tiles:
+            # tile EMPTY_TILE: célula vazia, totalmente transparente
+            self._tiles[font.key] = [
+                np.full((font.cell_height, font.width), TRANSPARENT_INDEX, dtype=np.uint8)]
+        return self._tiles[font.key]
+
+    def tile_id(self, font: FontMetrics, char: str, fg: str, bg: Optional[str]) -> int:
+        """Índice do tile no atlas da fonte, rasterizando-o na primeira vez
+
+        Com `bg=None` só os pixels do glifo são opacos (usado pelo cursor).
+        """
+        key = (font.key, char, fg, bg)
+        tile_id = self._ids.get(key)
+        if tile_id is None:
+            tiles = self._tile_list(font)
+            tiles.append(self._rasterize(font, char, fg, bg))
+            tile_id = self._ids[key] = len(tiles) - 1
+            self._stacked.pop(font.key, None)
+        return tile_id
+
+    def _rasterize(self, font: FontMetrics, char: str, fg: str, bg: Optional[str]) -> np.ndarray:
+        size = (font.width, font.cell_height)
+        image = Image.new("RGB", size, bg or self._rgb(0))
+        ImageDraw.Draw(image).text((0, 0), char, fg, font.font)
+        mask = Image.new("L", size, 0)
+        ImageDraw.Draw(mask).text((0, 0), char, 255, font.font)
+        opaque = np.asarray(mask) > 0
+        if bg is not None:
+            opaque[:font.height + 1] = True  # retângulo de fundo (inclusivo, como no gifos)
+        tile = self.palette.map_image(image)
+        tile[~opaque] = TRANSPARENT_INDEX
+        return tile
+
+    def word_sprite(self, font: FontMetrics, word: str, fg: str, bg: str) -> np.ndarray:
+        """Palavra inteira rasterizada do mesmo jeito que o gifos a desenha
+
+        Em fontes proporcionais (ou sem espaçamento entre linhas) os
+        caracteres não cabem numa grade, então a palavra é desenhada de uma
+        vez, com o retângulo de fundo até o fim do texto, e colada direto na
+        camada base.
+        """
+        key = ("word", font.key, word, fg, bg)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            _, _, right, bottom = font.font.getbbox(word)
+            size = (right + 1, max(bottom, font.height + 1))
+            image = Image.new("RGB", size, bg)
+            ImageDraw.Draw(image).text((0, 0), word, fg, font.font)
+            mask = Image.new("L", size, 0)
+            ImageDraw.Draw(mask).text((0, 0), word, 255, font.font)
+            opaque = np.asarray(mask) > 0
+            opaque[:font.height + 1] = True
+            sprite = self.palette.map_image(image)
+            sprite[~opaque] = TRANSPARENT_INDEX
+            self._sprites[key] = sprite
+        return sprite
+
+    def _rgb(self, index: int) -> tuple:
+        return tuple(int(c) for c in self.palette.colors[index])
+
+    def tiles(self, font: FontMetrics) -> np.ndarray:
+        """Todos os tiles da fonte empilhados num array (n, altura, largura)"""
+        stacked = self._stacked.get(font.key)
+        if stacked is None:
+            stacked = self._stacked[font.key] = np.stack(self._tile_list(font))
+        return stacked
+
+
+_shared_atlases: Dict[bytes, GlyphAtlas] = {}
+
+
+def shared_atlas(palette: Optional[ColorPalette] = None) -> GlyphAtlas:
+    """Atlas único do processo para a paleta (por padrão a do esquema de cores)
+
+    Terminais criados com ele reaproveitam as fontes carregadas e os tiles já
+    rasterizados, inclusive em processos filhos criados com fork.
+    """
+    palette = palette or ColorPalette.from_color_scheme()
+    key = palette.to_bytes()
+    if key not in _shared_atlases:
+        _shared_atlases[key] = GlyphAtlas(palette)
+    return _shared_atlases[key]
+
+
+class CellTerminal:
+    """Terminal em grade de células com a mesma interface do `gifos.Terminal`
+
+    Os frames são enviados para `sink.add_frame(indices, count, dirty)` como
+    arrays (altura, largura) de índices da paleta global. O array é sempre o
+    mesmo buffer, atualizado a cada frame: quem for guardá-lo deve copiá-lo.
+
+    A tela tem duas camadas: `base`, com pixels já fixados (fundo, texto de
+    fontes anteriores, rolagem), e a grade de células da fonte atual. Trocar
+    de fonte fixa a grade na base e começa uma grade nova, como o gifos faz
+    ao continuar desenhando sobre o mesmo frame.
+
+    Cada alteração marca o retângulo que ela afeta, e só esses pixels são
+    remontados no frame seguinte. `dirty` é o retângulo (x1, y1, x2, y2) que
+    contém tudo que pode ter mudado desde o frame anterior deste terminal
+    (`NO_CHANGE` se nada mudou), então o custo de cada frame acompanha o que
+    mudou (uma linha, na maioria das vezes) e não o tamanho da tela.
+    """
+
+    def __init__(self, sink, width: int, height: int, xpad: int, ypad: int,
+                 font_file: str, font_size: int = 16, line_spacing: int = 4,
+                 atlas: Optional[GlyphAtlas] = None):
+        self.sink = sink
+        self.atlas = atlas or GlyphAtlas(ColorPalette.from_color_scheme())
+        self._width = width
+        self._height = height
+        self._xpad = xpad
+        self._ypad = ypad
+        self._indices: Dict[str, int] = {}
+        self._colors = load_color_scheme()
+        self._txt_color = self._def_txt_color = self._colors["39"]
+        self._bg_color = self._def_bg_color = self._colors["49"]
+        self._def_bg_index = self._palette_index(self._def_bg_color)
+        self._frame_count = 0
+        self.curr_row = 0
+        self.curr_col = 0
+        self._base = np.full((height, width), self._def_bg_index, dtype=np.uint8)
+        self._frame = self._base.copy()  # último frame montado (com o cursor, se havia)
+        self._stale: Optional[Rect] = None  # pixels de `_frame` que precisam ser remontados
+        self._dirty: Optional[Rect] = None  # pixels alterados desde o último frame enviado
+        self._cells: Optional[np.ndarray] = None
+        self.set_font(font_file, font_size, line_spacing)
+        # mesmas configurações (e variáveis de ambiente) que o gifos lê
+        self._cursor = self._cursor_orig = os.getenv("GIFOS_GENERAL_CURSOR", "_")
+        self._show_cursor = os.getenv("GIFOS_GENERAL_SHOW_CURSOR", "true").lower() == "true"
+        self._blink_cursor = os.getenv("GIFOS_GENERAL_BLINK_CURSOR", "true").lower() == "true"
+        self._fps = float(os.getenv("GIFOS_GENERAL_FPS", "15"))
+        self._prompt = "\x1b[0;91mx0rzavi\x1b[0m@\x1b[0;93mgifos ~> \x1b[0m"
+        self.clear_frame()
+
+    def _palette_index(self, color: str) -> int:
+        index = self._indices.get(color)
+        if index is None:
+            hex_color = color.lstrip("#")
+            rgb = np.array([[[int(hex_color[i:i + 2], 16) for i in (0, 2, 4)]]], dtype=np.uint8)
+            index = self._indices[color] = int(self.atlas.palette.map_rgb(rgb)[0, 0])
+        return index
+
+    # -- estado -----------------------------------------------------------
+
+    def set_txt_color(self, txt_color: Optional[str] = None) -> None:
+        self._txt_color = txt_color or self._def_txt_color
+
+    def set_bg_color(self, bg_color: Optional[str] = None) -> None:
+        self._bg_color = bg_color or self._def_bg_color
+
+    def set_font(self, font_file: str, font_size: int = 16, line_spacing: int = 4) -> None:
+        with run_profile.span("font", file=os.path.basename(font_file), size=font_size):
+            self._set_font(font_file, font_size, line_spacing)
+
+    def _set_font(self, font_file: str, font_size: int, line_spacing: int) -> None:
+        if self._cells is not None:
+            # fixa o que foi desenhado com a fonte anterior; a tela não muda
+            self._sync()
+            self._base = self._frame.copy()
+        self._font = self.atlas.font(font_file, font_size, line_spacing)
+        self.num_rows = (self._height - 2 * self._ypad) // self._font.cell_height
+        self.num_cols = (self._width - 2 * self._xpad) // self._font.width
+        # como no gifos, o texto pode passar de num_cols até a borda do frame
+        grid_cols = -(-(self._width - self._xpad) // self._font.width)
+        self._cells = np.full((self.num_rows, grid_cols), EMPTY_TILE, dtype=np.int32)
+        self._col_in_row = {_ + 1: 1 for _ in range(self.num_rows)}
+
+    def toggle_show_cursor(self, choice: Optional[bool] = None) -> None:
+        self._show_cursor = not self._show_cursor if choice is None else choice
+
+    def toggle_blink_cursor(self, choice: Optional[bool] = None) -> None:
+        self._blink_cursor = not self._blink_cursor if choice is None else choice
+
+    def set_prompt(self, prompt: str) -> None:
+        self._prompt = prompt
+
+    def set_fps(self, fps: float) -> None:
+        self._fps = fps
+
+    # -- frames -----------------------------------------------------------
+
+    def _cell_origin(self, row_num: int, col_num: int) -> Tuple[int, int]:
+        x1 = self._xpad + (col_num - 1) * self._font.width
+        y1 = self._ypad + (row_num - 1) * self._font.cell_height
+        return x1, y1
+
+    def _mark(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        """Registra que os pixels do retângulo mudaram (na base ou na grade)"""
+        rect = (max(x1, 0), max(y1, 0), min(x2, self._width), min(y2, self._height))
+        self._stale = union_rect(self._stale, rect)
+        self._dirty = union_rect(self._dirty, rect)
+
+    def _mark_all(self) -> None:
+        self._mark(0, 0, self._width, self._height)
+
+    def _sync(self) -> None:
+        """Remonta em `_frame` os pixels alterados desde a última montagem"""
+        if self._stale is not None:
+            self._compose(*self._stale)
+            self._stale = None
+
+    def _compose(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        """Remonta um retângulo do frame: tiles da grade sobre a camada base"""
+        frame = self._frame
+        frame[y1:y2, x1:x2] = self._base[y1:y2, x1:x2]
+        cell_w, cell_h = self._font.width, self._font.cell_height
+        rows, cols = self._cells.shape
+        # células da grade que cobrem o retângulo
+        r1, r2 = max((y1 - self._ypad) // cell_h, 0), min(-(-(y2 - self._ypad) // cell_h), rows)
+        c1, c2 = max((x1 - self._xpad) // cell_w, 0), min(-(-(x2 - self._xpad) // cell_w), cols)
+        if r1 >= r2 or c1 >= c2:
+            return
+        tiles = self.atlas.tiles(self._font)[self._cells[r1:r2, c1:c2]]  # (linhas, colunas, altura, largura)
+        tiles = tiles.transpose(0, 2, 1, 3).reshape((r2 - r1) * cell_h, (c2 - c1) * cell_w)
+        gx, gy = self._xpad + c1 * cell_w, self._ypad + r1 * cell_h
+        sx1, sy1 = max(x1, gx), max(y1, gy)
+        sx2, sy2 = min(x2, gx + tiles.shape[1]), min(y2, gy + tiles.shape[0])
+        if sx1 >= sx2 or sy1 >= sy2:
+            return
+        tiles = tiles[sy1 - gy:sy2 - gy, sx1 - gx:sx2 - gx]
+        np.copyto(frame[sy1:sy2, sx1:sx2], tiles, where=tiles != TRANSPARENT_INDEX)
+
+    def _paste(self, frame: np.ndarray, tile: np.ndarray, x1: int, y1: int) -> None:
+        region = frame[y1:y1 + tile.shape[0], x1:x1 + tile.shape[1]]
+        tile = tile[:region.shape[0], :region.shape[1]]
+        np.copyto(region, tile, where=tile != TRANSPARENT_INDEX)
+        self._mark(x1, y1, x1 + tile.shape[1], y1 + tile.shape[0])
+
+    def _emit(self, count: int = 1, cursor: Optional[Tuple[int, int]] = None) -> None:
+        if count <= 0:
+            return
+        self._frame_count += count
+        self._sync()
+        if cursor is not None:
+            # o cursor é desenhado por cima do conteúdo, sem fundo próprio; o
+            # retângulo fica marcado para ser remontado sem ele no próximo frame
+            tile_id = self.atlas.tile_id(self._font, str(self._cursor), self._def_txt_color, None)
+            tile = self.atlas.tiles(self._font)[tile_id]
+            self._paste(self._frame, tile, *self._cell_origin(*cursor))
+        dirty, self._dirty = self._dirty or NO_CHANGE, self._stale
+        self.sink.add_frame(self._frame, count, dirty)
+
+    def clear_frame(self) -> None:
+        self._base = np.full((self._height, self._width), self._def_bg_index, dtype=np.uint8)
+        self._cells[:] = EMPTY_TILE
+        self._mark_all()
+        self._col_in_row = {_ + 1: 1 for _ in range(self.num_rows)}
+        self.cursor_to_box(1, 1)
+
+    def clone_frame(self, count: int = 1) -> None:
+        self._emit(count)
+
+    # -- cursor e texto ---------------------------------------------------
+
+    def cursor_to_box(self, row_num: int, col_num: int, text_num_lines: int = 1,
+                      text_num_chars: int = 1, contin: bool = False,
+                      force_col: bool = False) -> tuple:
+        """Mesma lógica de posicionamento (e rolagem) do gifos"""
+        if row_num < 1 or col_num < 1:
+            raise ValueError
+        elif row_num > self.num_rows:
+            row_num = self.num_rows
+        max_row_num = self.num_rows - text_num_lines + 1
+        min_col_num = self._col_in_row[row_num]
+
+        if not contin:
+            num_blank_rows = 0
+            first_blank_row = self.num_rows + 1
+            for i in range(self.num_rows, row_num - 1, -1):
+                if self._col_in_row[i] == 1:
+                    first_blank_row = i
+                    num_blank_rows += 1
+                else:
+                    break
+            if row_num > max_row_num:
+                row_num = max_row_num
+            elif first_blank_row > row_num:
+                self.scroll_up(first_blank_row - row_num)
+        elif col_num < min_col_num and not force_col:
+            col_num = self._col_in_row[row_num]
+        self.curr_row, self.curr_col = row_num, col_num
+
+        x1, y1 = self._cell_origin(row_num, col_num)
+        return x1, y1, x1 + self._font.width, y1 + self._font.cell_height
+
+    def _apply_escape(self, word: str) -> None:
+        codes = [code for _ in re.findall(COLOR_CODE_PATTERN, word) for code in _ if code]
+        for code in codes:
+            if code == "0":
+                self.set_txt_color()
+                self.set_bg_color()
+            elif code in TXT_COLOR_CODES:
+                self.set_txt_color(self._colors[code])
+            elif code in BG_COLOR_CODES:
+                self.set_bg_color(self._colors[code])
+
+    def _put_text(self, word: str) -> None:
+        if not self._font.fits_grid:
+            sprite = self.atlas.word_sprite(self._font, word, self._txt_color, self._bg_color)
+            self._paste(self._base, sprite, *self._cell_origin(self.curr_row, self.curr_col))
+            self.curr_col += len(word)
+            self._col_in_row[self.curr_row] = self.curr_col
+            return
+        row = self.curr_row - 1
+        start = self.curr_col - 1
+        end = min(start + len(word), self._cells.shape[1])
+        for offset, col in enumerate(range(start, end)):
+            self._cells[row, col] = self.atlas.tile_id(
+                self._font, word[offset], self._txt_color, self._bg_color)
+        x1, y1 = self._cell_origin(self.curr_row, self.curr_col)
+        self._mark(x1, y1, x1 + (end - start) * self._font.width, y1 + self._font.cell_height)
+        # o retângulo de fundo do gifos inclui a coluna logo após a palavra
+        x2 = x1 + len(word) * self._font.width
+        if x2 < self._width:
+            self._base[y1:y1 + self._font.height + 1, x2] = self._palette_index(self._bg_color)
+            self._mark(x2, y1, x2 + 1, y1 + self._font.height + 1)
+        self.curr_col += len(word)
+        self._col_in_row[self.curr_row] = self.curr_col
+
+    def gen_text(self, text, row_num: int, col_num: int = 1, count: int = 1,
+                 prompt: bool = False, contin: bool = False) -> None:
+        if prompt and contin:
+            print("ERROR: Both prompt and contin can't be simultaneously True")
+            sys.exit(1)
+
+        text_lines = text.splitlines() if isinstance(text, str) else text
+        for i, line in enumerate(text_lines):
+            self.cursor_to_box(row_num + i, col_num, 1, 1, contin)
+            for word in [word for word in re.split(ANSI_ESCAPE_PATTERN, line) if word]:
+                if re.match(ANSI_ESCAPE_PATTERN, word):
+                    self._apply_escape(word)
+                else:
+                    self.cursor_to_box(row_num + i, col_num, 1, len(word), True)
+                    self._put_text(word)
+        multiline = len(text_lines) > 1
+        if multiline:
+            self.cursor_to_box(self.curr_row + 1, 1, 1, 1, contin)
+        if prompt and multiline:
+            self.gen_prompt(self.curr_row, 1, 1)
+
+        if not self._show_cursor:
+            self._emit(count)
+            return
+        for _ in range(count):
+            x1, y1, _, _ = self.cursor_to_box(self.curr_row, self.curr_col, 1, 1, contin=True)
+            self._emit(1, cursor=(self.curr_row, self.curr_col))
+            # como no gifos, a célula do cursor volta a ficar com o fundo padrão
+            if self.curr_col <= self._cells.shape[1]:
+                self._cells[self.curr_row - 1, self.curr_col - 1] = EMPTY_TILE
+            self._base[y1:y1 + self._font.cell_height, x1:x1 + self._font.width] = self._def_bg_index
+            self._mark(x1, y1, x1 + self._font.width, y1 + self._font.cell_height)
+            if self._blink_cursor and self._frame_count % max(int(self._fps) // 3, 1) == 0:
+                self._cursor = self._cursor_orig if self._cursor != self._cursor_orig else " "
+
+    def gen_typing_text(self, text: str, row_num: int, col_num: int = 1,
+                        contin: bool = False, speed: int = 0) -> None:
+        if not contin:
+            self.cursor_to_box(row_num, col_num, 1, 1, contin)
+        for word in [word for word in re.split(ANSI_ESCAPE_PATTERN, text) if word]:
+            if re.match(ANSI_ESCAPE_PATTERN, word):
+                self.gen_text(word, row_num, self._col_in_row[row_num], 0, False, True)
+            else:
+                for char in word:
+                    count = speed if speed in [1, 2, 3] else random.choice([1, 2, 3])
+                    self.gen_text(char, row_num, self._col_in_row[row_num], count, False, True)
+
+    def gen_prompt(self, row_num: int, col_num: int = 1, count: int = 1) -> None:
+        self.clone_frame(1)
+        orig_cursor_state = self._show_cursor
+        self.toggle_show_cursor(True)
+        self.gen_text(self._prompt, row_num, col_num, count, False, False)
+        self._show_cursor = orig_cursor_state
+
+    def scroll_up(self, count: int = 1) -> None:
+        for _ in range(count):
+            self._sync()
+            shift = self._font.cell_height
+            self._base = np.full_like(self._frame, self._def_bg_index)
+            self._base[:self._height - shift] = self._frame[shift:]
+            self._cells[:] = EMPTY_TILE
+            self._mark_all()
+            self.curr_row -= 1
+            values = list(self._col_in_row.values())
+            self._col_in_row = dict(zip(self._col_in_row.keys(), values[1:] + [1]))
+
+    def delete_row(self, row_num: int, col_num: int = 1) -> None:
+        x1, y1, _, _ = self.cursor_to_box(row_num, col_num, 1, 1, True, force_col=True)
+        self._col_in_row[row_num] = col_num
+        self._cells[row_num - 1, col_num - 1:] = EMPTY_TILE
+        self._base[y1:y1 + self._font.cell_height, x1:] = self._palette_index(self._bg_color)
+        self._mark(x1, y1, self._width, y1 + self._font.cell_height)
@@ -0,0 +1,116 @@
+"""
+Módulo para consultar os arquivos de reflexões e versículos sem carregá-los inteiros
+
+Um índice binário guarda o início e o fim de cada registro válido do arquivo
+de texto. Ele é gerado uma vez (e de novo quando o arquivo muda); depois disso
+o registro N é lido em O(1) com mmap, qualquer que seja o tamanho do corpus.
+"""
+
+import mmap
+import os
+import struct
+
+INDEX_MAGIC = b"CIDX1\0\0\0"
+# magic, tamanho e mtime (ns) do arquivo de origem, número de registros
+HEADER = struct.Struct("<8sQQQ")
+RECORD = struct.Struct("<QQ")  # início e fim do registro no arquivo de origem
+DEFAULT_INDEX_DIR = ".cache/corpus"
+
+
+class CorpusIndex:
+    """
+    Acesso indexado aos registros de um arquivo com um registro por linha
+
+    Args:
+        source_path (str): Arquivo de texto (UTF-8) com um registro por linha
+        parse (callable): Converte uma linha em dicionário; devolve None para
+            linhas inválidas, que ficam fora do índice
+        index_path (str): Onde gravar o índice; por padrão em .cache/corpus
+    """
+
+    def __init__(self, source_path, parse, index_path=None):
+        self.source_path = source_path
+        self.parse = parse
+        self.index_path = index_path or os.path.join(
+            DEFAULT_INDEX_DIR, os.path.basename(source_path) + ".idx")
+        self._source = None
+        self._index = None
+        self._count = 0
+        self._open()
+
+    def _open(self):
+        stat = os.stat(self.source_path)
+        if not self._index_is_current(stat):
+            self._build(stat)
+        with open(self.index_path, 'rb') as index_file:
+            self._index = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = HEADER.unpack_from(self._index)[3]
+        if stat.st_size:
+            with open(self.source_path, 'rb') as source_file:
+                self._source = mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _index_is_current(self, stat):
+        try:
+            with open(self.index_path, 'rb') as index_file:
+                header = index_file.read(HEADER.size)
+        except OSError:
+            return False
+        if len(header) < HEADER.size:
+            return False
+        magic, size, mtime_ns, _ = HEADER.unpack(header)
+        return magic == INDEX_MAGIC and size == stat.st_size and mtime_ns == stat.st_mtime_ns
+
+    def _build(self, stat):
+        """Percorre o arquivo uma vez e grava as posições dos registros válidos"""
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        count = 0
+        with open(self.source_path, 'rb') as source_file, open(tmp_path, 'wb') as index_file:
+            index_file.write(HEADER.pack(INDEX_MAGIC, 0, 0, 0))
+            offset = 0
+            for line in source_file:
+                end = offset + len(line)
+                if self.parse(line.decode('utf-8', errors='replace')) is not None:
+                    index_file.write(RECORD.pack(offset, end))
+                    count += 1
+                offset = end
+            index_file.seek(0)
+            index_file.write(HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, count))
+        os.replace(tmp_path, self.index_path)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        start, end = RECORD.unpack_from(self._index, HEADER.size + i * RECORD.size)
+        return self.parse(self._source[start:end].decode('utf-8', errors='replace'))
+
+    def close(self):
+        for mapped in (self._source, self._index):
+            if mapped is not None:
+                mapped.close()
+        self._source = self._index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_corpus(source_path, parse, index_path=None):
+    """
+    Abre o índice do corpus, gerando-o se necessário
+
+    Returns:
+        CorpusIndex: Índice aberto, ou None se o arquivo não existir ou não puder ser lido
+    """
+    if not os.path.exists(source_path):
+        return None
+    try:
+        return CorpusIndex(source_path, parse, index_path)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Erro ao indexar {source_path}: {e}")
+        return None
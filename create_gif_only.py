@@ -2,8 +2,8 @@
 """Script para criar GIF com os frames já existentes"""
 
 import os
-from PIL import Image, ImageDraw, ImageFont
-from datetime import datetime
+from PIL import Image
+from gif_writer import BudgetedGifWriter, gif_writer_for
 
 # Encontrar todos os arquivos de frame
 frame_folder = "frames"
@@ -21,35 +21,18 @@ frame_files.sort(key=lambda x: int(x.replace("frame_", "").replace(".png", "")))
 
 print(f"Encontrados {len(frame_files)} frames")
 
-# Criar GIF com Pillow
+# Criar GIF em streaming: cada PNG é aberto, codificado e descartado em seguida
+# (com GIF_MAX_BYTES/GIF_MAX_FRAMES, guardado e reduzido até caber no limite)
 if len(frame_files) > 0:
     print("Criando GIF com Pillow...")
-    images = []
-    durations = []
-    
-    for file in frame_files:
-        img_path = os.path.join(frame_folder, file)
-        img = Image.open(img_path).convert("RGBA")
-        # (Removido: não adicionar data/hora nos frames)
-        images.append(img)
-        durations.append(100)  # 100ms por frame para evitar piscar
-    
-    # Adicionar delay extra nos últimos frames para melhor visualização
-    if len(durations) > 0:
-        durations[-1] = 1000  # 1s no último frame
-    if len(durations) > 1:
-        durations[-2] = 800  # 800ms no penúltimo frame
-    if len(durations) > 2:
-        durations[-3] = 600  # 600ms no antepenúltimo frame
-    
-    # Salvar GIF
-    images[0].save(
-        "output.gif",
-        save_all=True,
-        append_images=images[1:],
-        duration=durations,  # Lista com duração individual por frame
-        loop=0
-    )
-    print(f"GIF criado com sucesso! ({len(frame_files)} frames, duração total: {sum(durations)/1000:.1f}s)")
+    with gif_writer_for("output.gif") as gif_writer:
+        for file in frame_files:
+            img_path = os.path.join(frame_folder, file)
+            with Image.open(img_path) as img:
+                # (Removido: não adicionar data/hora nos frames)
+                gif_writer.add_frame(img)
+    if isinstance(gif_writer, BudgetedGifWriter):
+        print(gif_writer.report())
+    print(f"GIF criado com sucesso! ({gif_writer.frame_count} frames de {gif_writer.source_frame_count} renderizados, duração total: {gif_writer.total_duration/1000:.1f}s)")
 else:
     print("Nenhum frame encontrado para criar GIF")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Módulo que entrega os frames do gifos direto para o codificador do GIF"""
+
+import os
+
+import gifos
+
+import run_profile
+
+
+class SinkTerminal(gifos.Terminal):
+    """Terminal do gifos que envia cada frame para um `sink` em vez de salvar PNGs
+
+    O `sink` é qualquer objeto com um método `add_frame(frame)`, por exemplo o
+    `GifWriter`. O frame recebido é o buffer de trabalho do terminal, que
+    continua sendo alterado depois da chamada, então o `sink` deve consumi-lo
+    (ou copiá-lo) imediatamente.
+    """
+
+    def __init__(self, sink, *args, **kwargs):
+        self.sink = sink
+        super().__init__(*args, **kwargs)
+
+    def set_font(self, font_file, font_size=16, line_spacing=4):
+        with run_profile.span("font", file=os.path.basename(str(font_file)), size=font_size):
+            super().set_font(font_file, font_size, line_spacing)
+
+    def _Terminal__gen_frame(self, frame=None):
+        if frame is None:
+            return super()._Terminal__gen_frame()
+        self._Terminal__frame_count += 1
+        self.sink.add_frame(frame)
+        return frame
@@ -0,0 +1,635 @@
+#!/usr/bin/env python3
+"""Módulo para escrever o GIF em streaming, frame a frame"""
+
+import hashlib
+import io
+import math
+import os
+import struct
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import BinaryIO, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageFile
+
+import run_profile
+from palette import TRANSPARENT_INDEX, ColorPalette
+
+# Delay extra nos últimos frames para melhor visualização (antepenúltimo,
+# penúltimo e último)
+TAIL_DURATIONS = (600, 800, 1000)
+DEFAULT_DURATION = 100  # 100ms por frame quando GIFOS_GENERAL_FPS não está definido
+DISPOSAL_NONE = 1  # "do not dispose": cada frame é desenhado sobre o anterior
+
+# Orçamento do GIF (GIF_MAX_BYTES / GIF_MAX_FRAMES): níveis tentados em ordem,
+# do mais fiel ao mais econômico, como (FPS efetivo ou None para o original,
+# 1 a cada N frames de digitação)
+BUDGET_LEVELS = ((None, 1), (None, 2), (None, 3), (10, 3), (8, 3), (6, 4), (5, 4),
+                 (4, 4), (3, 6), (2, 8), (1, 8))
+SMALL_CHANGE_FRACTION = 0.01  # frames que mudam menos que isso da tela (uma tecla) são "digitação"
+REDRAW_FRACTION = 0.5  # frames que mudam mais que isso redesenham a tela (nova cena, tela limpa)
+KEY_HOLD_MS = 1000  # frames que ficam parados pelo menos isso são sempre mantidos
+
+# Compressão em paralelo (GIF_WORKERS): regiões menores que isso (uma tecla, uma
+# linha) são comprimidas na hora, porque mandá-las ao pool custaria mais
+PARALLEL_MIN_PIXELS = 16384
+SLOTS_PER_WORKER = 4  # regiões na memória compartilhada por processo do pool
+
+# Memórias compartilhadas dos GifWriter em paralelo, por nome; os processos do
+# pool (fork) herdam o mapeamento em vez de abri-lo de novo
+_shared_buffers: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def gif_workers_from_env() -> int:
+    """Processos de compressão de GIF_WORKERS (padrão 1: tudo neste processo; 0: um por CPU)"""
+    try:
+        workers = int(os.getenv("GIF_WORKERS", "1"))
+    except ValueError:
+        return 1
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def frame_duration_from_env() -> float:
+    """Duração de cada frame renderizado (ms) de acordo com GIFOS_GENERAL_FPS"""
+    try:
+        fps = float(os.getenv("GIFOS_GENERAL_FPS", ""))
+    except ValueError:
+        return DEFAULT_DURATION
+    return 1000 / fps if fps > 0 else DEFAULT_DURATION
+
+
+def _lzw_encode(indices: np.ndarray) -> bytes:
+    """Comprime um array de índices da paleta com o codificador LZW do Pillow"""
+    im = Image.fromarray(np.ascontiguousarray(indices))
+    fp = io.BytesIO()
+    ImageFile._save(im, fp, [("gif", (0, 0) + im.size, 0, im.mode)])
+    return fp.getvalue()
+
+
+def _image_block(region: np.ndarray, x: int, y: int) -> bytes:
+    """Descritor de imagem (sem tabela local) seguido dos dados LZW"""
+    height, width = region.shape
+    descriptor = b"," + struct.pack("<HHHHB", x, y, width, height, 0)
+    return descriptor + b"\x08" + _lzw_encode(region) + b"\0"
+
+
+def _encode_region(region: np.ndarray, previous: Optional[np.ndarray], x: int, y: int) -> Tuple[bytes, bool]:
+    """Bloco de imagem da região alterada, com transparência quando ela deixa o bloco menor
+
+    Args:
+        region (ndarray): Pixels (índices) da região no frame atual
+        previous (ndarray): Os mesmos pixels no frame anterior, ou None no primeiro frame
+        x, y (int): Posição da região no frame
+
+    Returns:
+        tuple: (bytes do frame, se o frame usa o índice transparente)
+    """
+    opaque = _image_block(region, x, y)
+    if previous is None:
+        return opaque, False
+    unchanged = region == previous
+    if not unchanged.any():
+        return opaque, False
+    # Transparência nem sempre ajuda: quando os pixels iguais são o próprio
+    # fundo, ela quebra sequências longas. Fica a versão menor
+    transparent = _image_block(np.where(unchanged, np.uint8(TRANSPARENT_INDEX), region), x, y)
+    if len(transparent) < len(opaque):
+        return transparent, True
+    return opaque, False
+
+
+def _encode_shared(name: str, offset: int, shape: Tuple[int, int], with_previous: bool,
+                   x: int, y: int) -> Tuple[bytes, bool]:
+    """`_encode_region` num processo do pool, lendo a região da memória compartilhada"""
+    buffer = _shared_buffers[name].buf
+    region = np.ndarray(shape, np.uint8, buffer, offset)
+    previous = np.ndarray(shape, np.uint8, buffer, offset + region.size) if with_previous else None
+    return _encode_region(region, previous, x, y)
+
+
+def _changed_bbox(previous: np.ndarray, current: np.ndarray,
+                  region: Optional[Tuple[int, int, int, int]] = None) -> Optional[Tuple[int, int, int, int]]:
+    """Retângulo (x1, y1, x2, y2) que contém todos os pixels diferentes
+
+    Args:
+        region (tuple): Retângulo fora do qual se sabe que nada mudou; só ele é comparado
+    """
+    x0, y0 = 0, 0
+    if region is not None:
+        x0, y0, x2, y2 = region
+        if x0 >= x2 or y0 >= y2:
+            return None
+        previous, current = previous[y0:y2, x0:x2], current[y0:y2, x0:x2]
+    changed = previous != current
+    rows = np.flatnonzero(changed.any(axis=1))
+    if not len(rows):
+        return None
+    cols = np.flatnonzero(changed[rows[0]:rows[-1] + 1].any(axis=0))
+    return x0 + int(cols[0]), y0 + int(rows[0]), x0 + int(cols[-1]) + 1, y0 + int(rows[-1]) + 1
+
+
+def _area(rect: Optional[Tuple[int, int, int, int]]) -> int:
+    return 0 if rect is None else (rect[2] - rect[0]) * (rect[3] - rect[1])
+
+
+class _PendingFrame:
+    """Frame já comprimido (ou em compressão, `block` é um Future) aguardando a duração final"""
+    __slots__ = ("block", "transparent", "duration", "digest")
+
+    def __init__(self, block: Union[bytes, Future], transparent: bool, duration: float,
+                 digest: Optional[bytes]):
+        self.block = block
+        self.transparent = transparent
+        self.duration = duration
+        self.digest = digest
+
+
+class GifWriter:
+    """Escreve um GIF animado em disco à medida que os frames chegam
+
+    Cada frame é convertido para índices da paleta global e comprimido assim
+    que é recebido, e só os bytes comprimidos dos últimos frames ficam em
+    memória (o suficiente para aplicar as durações finais), em vez de
+    centenas de imagens RGBA.
+
+    Todos os frames usam uma única tabela de cores global, montada a partir
+    do esquema de cores do gifos (`GIFOS_GENERAL_COLOR_SCHEME`), então não há
+    quantização por frame nem tabelas de cores locais.
+
+    Depois do primeiro, cada frame é gravado só como o retângulo que mudou em
+    relação ao anterior (disposal "do not dispose"), e os pixels que não
+    mudaram dentro desse retângulo podem virar o índice transparente, o que
+    deixa longas sequências iguais para o LZW; como no `gifsicle -O3`, a
+    versão com transparência só é usada quando fica menor.
+
+    Frames consecutivos idênticos (as pausas do `gen_text(..., count=N)`, o
+    `clone_frame` e as teclas repetidas do `gen_typing_text`) viram um único
+    frame do GIF com a soma das durações. Imagens são comparadas por hash;
+    arrays de índices, pixel a pixel, só dentro do retângulo `dirty` quando o
+    terminal o informa.
+
+    Com `workers` > 1 as regiões grandes (telas inteiras, o logo, a Mona) são
+    comprimidas num pool de processos: os pixels vão por memória
+    compartilhada e os blocos voltam e são gravados na ordem dos frames. A
+    compressão é a mesma função nos dois caminhos, então o arquivo é idêntico
+    ao da compressão serial.
+    """
+
+    def __init__(self, file_name: str = "output.gif", duration: Optional[float] = None,
+                 tail_durations: Sequence[int] = TAIL_DURATIONS, loop: int = 0,
+                 palette: Optional[ColorPalette] = None, workers: Optional[int] = None):
+        self.file_name = file_name
+        self.palette = palette or ColorPalette.from_color_scheme()
+        self.duration = duration if duration is not None else frame_duration_from_env()
+        self.tail_durations = tuple(tail_durations)
+        self.loop = loop
+        self.frame_count = 0  # frames gravados no GIF
+        self.source_frame_count = 0  # frames recebidos do terminal
+        self.total_duration = 0
+        self._fp: Optional[BinaryIO] = None
+        self._pending: Deque[_PendingFrame] = deque()
+        self._previous: Optional[np.ndarray] = None
+        self._elapsed = 0.0
+        self.workers = workers if workers is not None else gif_workers_from_env()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shared: Optional[shared_memory.SharedMemory] = None
+        self._slots: List[Optional[Future]] = []
+        self._next_slot = 0
+
+    def __enter__(self) -> 'GifWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # com uma exceção no bloco, o GIF anterior fica como estava
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def _write_header(self, size: Tuple[int, int]) -> None:
+        """Escreve o cabeçalho GIF89a, a tabela de cores global e a extensão de loop"""
+        # Escreve num arquivo temporário para não corromper o GIF anterior se a
+        # renderização falhar no meio
+        self._fp = open(self.file_name + ".tmp", "wb")
+        # 0xF7: tabela global presente, 8 bits por cor, 256 entradas
+        self._fp.write(b"GIF89a" + struct.pack("<HHBBB", size[0], size[1], 0xF7, 0, 0))
+        self._fp.write(self.palette.to_bytes())
+        self._fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", self.loop) + b"\0")
+
+    def _encode_frame(self, indices: np.ndarray,
+                      bbox: Optional[Tuple[int, int, int, int]] = None) -> Tuple[Union[bytes, Future], bool]:
+        """Gera o descritor de imagem e os dados LZW do frame
+
+        Args:
+            indices (ndarray): Frame em índices da paleta
+            bbox (tuple): Retângulo alterado em relação ao frame anterior, se já calculado
+
+        Returns:
+            tuple: (bytes do frame, se o frame usa o índice transparente); no
+            pool, (Future desse par, False)
+        """
+        previous, self._previous = self._previous, indices
+        if previous is None:
+            x1, y1, region, before = 0, 0, indices, None
+        else:
+            x1, y1, x2, y2 = bbox or _changed_bbox(previous, indices) or (0, 0, 1, 1)
+            region, before = indices[y1:y2, x1:x2], previous[y1:y2, x1:x2]
+        if self.workers > 1 and region.size >= PARALLEL_MIN_PIXELS:
+            return self._submit(region, before, x1, y1), False
+        return _encode_region(region, before, x1, y1)
+
+    def _submit(self, region: np.ndarray, previous: Optional[np.ndarray], x: int, y: int) -> Future:
+        """Copia a região (e a anterior) para uma vaga da memória compartilhada e a envia ao pool"""
+        if self._pool is None:
+            height, width = self._previous.shape
+            self._slots = [None] * (self.workers * SLOTS_PER_WORKER)
+            self._shared = shared_memory.SharedMemory(create=True, size=2 * height * width * len(self._slots))
+            _shared_buffers[self._shared.name] = self._shared
+            # o fork leva o mapeamento da memória compartilhada para os processos
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("fork"))
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % len(self._slots)
+        if self._slots[slot] is not None:
+            self._slots[slot].result()  # a vaga só é reaproveitada depois que o processo a leu
+        offset = slot * 2 * self._previous.size
+        buffer = self._shared.buf
+        np.ndarray(region.shape, np.uint8, buffer, offset)[:] = region
+        if previous is not None:
+            np.ndarray(region.shape, np.uint8, buffer, offset + region.size)[:] = previous
+        future = self._pool.submit(_encode_shared, self._shared.name, offset, region.shape,
+                                   previous is not None, x, y)
+        self._slots[slot] = future
+        run_profile.count("gif.parallel_frames")
+        return future
+
+    def _shutdown_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._shared is not None:
+            _shared_buffers.pop(self._shared.name, None)
+            self._shared.close()
+            self._shared.unlink()
+            self._shared = None
+
+    def _write_frame(self, pending: _PendingFrame, duration: float) -> None:
+        """Escreve a extensão de controle gráfico seguida do frame já comprimido"""
+        # O GIF guarda atrasos em centésimos de segundo; arredondar sobre o tempo
+        # acumulado evita que o erro de cada frame (ex.: 1000/13 ms) se some
+        delay = round((self._elapsed + duration) / 10) - round(self._elapsed / 10)
+        self._elapsed += duration
+        if isinstance(pending.block, Future):
+            pending.block, pending.transparent = pending.block.result()
+        packed = DISPOSAL_NONE << 2 | int(pending.transparent)
+        self._fp.write(b"!\xf9\x04" + struct.pack("<BHBB", packed, delay, TRANSPARENT_INDEX, 0))
+        self._fp.write(pending.block)
+        self.frame_count += 1
+        self.total_duration += delay * 10
+
+    def add_frame(self, frame: Union[Image.Image, np.ndarray], count: int = 1,
+                  dirty: Optional[Tuple[int, int, int, int]] = None) -> None:
+        """Recebe um frame do terminal e o comprime imediatamente
+
+        Args:
+            frame (Image | ndarray): Frame renderizado, ou um array (altura,
+                largura) já com os índices da paleta global
+            count (int): Quantas vezes o frame se repete (cada repetição dura
+                `self.duration` ms)
+            dirty (tuple): Para arrays, retângulo (x1, y1, x2, y2) fora do qual
+                o frame é igual ao anterior; None compara o frame inteiro
+        """
+        self.source_frame_count += count
+        bbox = digest = None
+        if isinstance(frame, np.ndarray):
+            if self._previous is not None and self._previous.shape == frame.shape:
+                bbox = _changed_bbox(self._previous, frame, dirty)
+                if bbox is None and self._pending:
+                    self._repeat_last(count)
+                    return
+        else:
+            rgb = frame if frame.mode == "RGB" else frame.convert("RGB")
+            digest = hashlib.sha256(rgb.tobytes()).digest()
+            if self._pending and self._pending[-1].digest == digest:
+                self._repeat_last(count)
+                return
+        start = time.perf_counter()
+        if digest is not None:
+            indices = self.palette.map_image(rgb)
+        else:
+            # O terminal continua desenhando no mesmo buffer depois desta chamada
+            indices = frame.copy()
+        if self._fp is None:
+            self._write_header((indices.shape[1], indices.shape[0]))
+        block, transparent = self._encode_frame(indices, bbox)
+        run_profile.add("gif.encode_frame", time.perf_counter() - start)
+        self._pending.append(_PendingFrame(block, transparent, self.duration * count, digest))
+        # Mantém ao menos o último frame pendente para poder somar repetições e,
+        # no pool, frames suficientes para ocupar todos os processos
+        lookahead = max(len(self.tail_durations), 1) + (len(self._slots) if self._pool else 0)
+        if len(self._pending) > lookahead:
+            pending = self._pending.popleft()
+            self._write_frame(pending, pending.duration)
+
+    def _repeat_last(self, count: int) -> None:
+        self._pending[-1].duration += self.duration * count
+        run_profile.count("gif.frames_deduplicated", count)
+
+    def close(self) -> None:
+        """Escreve os frames pendentes com as durações finais e fecha o arquivo"""
+        if self._fp is None:
+            return
+        with run_profile.span("gif.close", file=self.file_name) as attrs:
+            try:
+                self._close()
+            except BaseException:
+                self.abort()
+                raise
+            finally:
+                self._shutdown_pool()
+            attrs.update(frames=self.frame_count, source_frames=self.source_frame_count,
+                         bytes=os.path.getsize(self.file_name), workers=self.workers)
+        run_profile.count("gif.frames", self.frame_count)
+        run_profile.count("gif.source_frames", self.source_frame_count)
+
+    def abort(self) -> None:
+        """Descarta o GIF em andamento (temporário, pool, memória compartilhada) sem tocar no arquivo final"""
+        try:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+                try:
+                    os.remove(self.file_name + ".tmp")
+                except FileNotFoundError:
+                    pass
+            self._pending.clear()
+        finally:
+            self._shutdown_pool()
+
+    def _close(self) -> None:
+        tail = self.tail_durations[-len(self._pending):] if self._pending else ()
+        minimums = (0,) * (len(self._pending) - len(tail)) + tail
+        for pending, tail_duration in zip(list(self._pending), minimums):
+            self._write_frame(pending, max(pending.duration, tail_duration))
+        self._pending.clear()
+        self._fp.write(b";")
+        self._fp.close()
+        self._fp = None
+        os.replace(self.file_name + ".tmp", self.file_name)
+
+
+def _size_from_env(name: str) -> Optional[int]:
+    """Inteiro de uma variável de ambiente, aceitando os sufixos k e m (ex.: 300k)"""
+    value = os.getenv(name, "").strip().lower()
+    if not value:
+        return None
+    multiplier = {"k": 1024, "m": 1024 ** 2}.get(value[-1], 1)
+    try:
+        number = int(float(value.rstrip("km")) * multiplier)
+    except ValueError:
+        print(f"{name} inválido ignorado: {value!r}")
+        return None
+    return number if number > 0 else None
+
+
+class GifBudget:
+    """Limites do GIF final; None é sem limite
+
+    Attributes:
+        max_bytes: Tamanho máximo do arquivo
+        max_frames: Número máximo de frames gravados
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_frames: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_frames = max_frames
+
+    @classmethod
+    def from_env(cls) -> Optional['GifBudget']:
+        """Limites de GIF_MAX_BYTES e GIF_MAX_FRAMES, ou None se nenhum estiver definido"""
+        budget = cls(_size_from_env("GIF_MAX_BYTES"), _size_from_env("GIF_MAX_FRAMES"))
+        return budget if budget.max_bytes or budget.max_frames else None
+
+    def fits(self, size: int, frames: int) -> bool:
+        return ((self.max_bytes is None or size <= self.max_bytes)
+                and (self.max_frames is None or frames <= self.max_frames))
+
+    def describe(self) -> str:
+        limits = []
+        if self.max_bytes:
+            limits.append(f"{self.max_bytes / 1024:.0f} KB")
+        if self.max_frames:
+            limits.append(f"{self.max_frames} frames")
+        return " e ".join(limits) or "sem limite"
+
+
+class _SourceFrame:
+    """Frame recebido, guardado só como o retângulo que mudou em relação ao anterior"""
+    __slots__ = ("bbox", "region", "count")
+
+    def __init__(self, bbox: Optional[Tuple[int, int, int, int]], region: Optional[np.ndarray], count: int):
+        self.bbox = bbox
+        self.region = region
+        self.count = count
+
+
+class BudgetedGifWriter:
+    """GifWriter que reduz a animação até o GIF caber num orçamento de bytes e/ou frames
+
+    Os frames recebidos são guardados (só o retângulo alterado de cada um) e,
+    no `close`, codificados com os níveis de `BUDGET_LEVELS` até que o
+    resultado caiba no orçamento: primeiro são pulados frames de digitação
+    (mudanças do tamanho de uma tecla; o último de cada sequência fica),
+    depois o FPS efetivo cai (só ficam os frames que estariam na tela em
+    algum instante múltiplo de 1/FPS). O tempo de um frame descartado é somado
+    ao frame que continua na tela, então a duração total não muda, e como os
+    frames são aplicados em sequência nenhum texto se perde, só estados
+    intermediários.
+
+    O primeiro e o último frame, os que ficam parados por KEY_HOLD_MS ou mais
+    (ex.: "Memory Test: 64KB OK") e os que antecedem um redesenho da tela (o
+    fim de cada cena, como o logo) nunca são descartados.
+
+    Se nem o último nível couber, ele é usado assim mesmo e `fits` fica False.
+
+    Attributes:
+        settings: (FPS efetivo ou None, 1 a cada N frames de digitação) escolhidos
+        attempts: (FPS, N, bytes, frames) de cada tentativa
+        fits: Se o GIF gravado cabe no orçamento
+    """
+
+    def __init__(self, file_name: str = "output.gif", budget: Optional[GifBudget] = None,
+                 duration: Optional[float] = None, tail_durations: Sequence[int] = TAIL_DURATIONS,
+                 loop: int = 0, palette: Optional[ColorPalette] = None, workers: Optional[int] = None):
+        self.file_name = file_name
+        self.budget = budget or GifBudget()
+        self.workers = workers
+        self.palette = palette or ColorPalette.from_color_scheme()
+        self.duration = duration if duration is not None else frame_duration_from_env()
+        self.tail_durations = tuple(tail_durations)
+        self.loop = loop
+        self.frame_count = 0
+        self.source_frame_count = 0
+        self.total_duration = 0
+        self.bytes = 0
+        self.settings: Optional[Tuple[Optional[float], int]] = None
+        self.attempts: List[Tuple[Optional[float], int, int, int]] = []
+        self.fits = False
+        self._frames: List[_SourceFrame] = []
+        self._first: Optional[np.ndarray] = None
+        self._canvas: Optional[np.ndarray] = None
+
+    def __enter__(self) -> 'BudgetedGifWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # com uma exceção no bloco, o GIF anterior fica como estava
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def add_frame(self, frame: Union[Image.Image, np.ndarray], count: int = 1,
+                  dirty: Optional[Tuple[int, int, int, int]] = None) -> None:
+        """Guarda o frame (mesmos argumentos de `GifWriter.add_frame`)"""
+        self.source_frame_count += count
+        if isinstance(frame, np.ndarray):
+            indices = frame
+        else:
+            indices = self.palette.map_image(frame if frame.mode == "RGB" else frame.convert("RGB"))
+            dirty = None
+        if self._canvas is None or self._canvas.shape != indices.shape:
+            if self._canvas is not None:
+                raise ValueError("todos os frames precisam ter o mesmo tamanho")
+            self._first, self._canvas = indices.copy(), indices.copy()
+            self._frames.append(_SourceFrame(None, None, count))
+            return
+        bbox = _changed_bbox(self._canvas, indices, dirty)
+        if bbox is None:
+            self._frames[-1].count += count
+            return
+        x1, y1, x2, y2 = bbox
+        region = indices[y1:y2, x1:x2].copy()
+        self._canvas[y1:y2, x1:x2] = region
+        self._frames.append(_SourceFrame(bbox, region, count))
+
+    def _key_frames(self) -> set:
+        screen = self._first.size
+        keys = {0, len(self._frames) - 1}
+        for i, frame in enumerate(self._frames):
+            if frame.count * self.duration >= KEY_HOLD_MS:
+                keys.add(i)
+            if i > 0 and _area(frame.bbox) >= REDRAW_FRACTION * screen:
+                keys.add(i - 1)
+        return keys
+
+    def _select(self, fps: Optional[float], typing_step: int) -> List[List[int]]:
+        """[índice, repetições] dos frames mantidos, com o tempo dos descartados somado"""
+        keys = self._key_frames()
+        small = [i > 0 and _area(frame.bbox) <= SMALL_CHANGE_FRACTION * self._first.size
+                 for i, frame in enumerate(self._frames)]
+        tick = 1000 / fps if fps else None
+        selected: List[List[int]] = []
+        start = 0.0
+        run = 0
+        for i, frame in enumerate(self._frames):
+            duration = frame.count * self.duration
+            run = run + 1 if small[i] else 0
+            keep = i in keys
+            if not keep:
+                last_of_run = i + 1 == len(small) or not small[i + 1]
+                keep = not small[i] or run % typing_step == 0 or last_of_run
+                if keep and tick:
+                    # algum instante múltiplo de 1/FPS cai enquanto o frame está na tela?
+                    keep = math.ceil(start / tick - 1e-9) * tick < start + duration - 1e-9
+            if keep:
+                selected.append([i, frame.count])
+            else:
+                selected[-1][1] += frame.count
+            start += duration
+        return selected
+
+    def _encode(self, selected: List[List[int]], file_name: str) -> GifWriter:
+        writer = GifWriter(file_name, self.duration, self.tail_durations, self.loop, self.palette, self.workers)
+        canvas = self._first.copy()
+        dirty = None
+        position = 0
+        try:
+            for index, count in selected:
+                # aplica os frames descartados desde o último mantido e o próprio frame
+                for frame in self._frames[position:index + 1]:
+                    if frame.bbox is not None:
+                        x1, y1, x2, y2 = frame.bbox
+                        canvas[y1:y2, x1:x2] = frame.region
+                        dirty = frame.bbox if dirty is None else (
+                            min(dirty[0], x1), min(dirty[1], y1), max(dirty[2], x2), max(dirty[3], y2))
+                position = index + 1
+                writer.add_frame(canvas, count, dirty)
+                dirty = None
+            if writer._fp is not None:
+                writer._close()
+        except BaseException:
+            writer.abort()
+            raise
+        finally:
+            writer._shutdown_pool()
+        return writer
+
+    def close(self) -> None:
+        """Escolhe o primeiro nível que cabe no orçamento e grava o GIF"""
+        if self._first is None:
+            return
+        with run_profile.span("gif.budget", file=self.file_name) as attrs:
+            try:
+                self._close()
+            except BaseException:
+                self.abort()
+                raise
+            attrs.update(fps=self.settings[0], typing_step=self.settings[1], attempts=len(self.attempts),
+                         frames=self.frame_count, bytes=self.bytes, fits=self.fits)
+        run_profile.count("gif.frames", self.frame_count)
+        run_profile.count("gif.source_frames", self.source_frame_count)
+
+    def abort(self) -> None:
+        """Descarta os frames guardados sem tocar no arquivo final"""
+        self._frames, self._first, self._canvas = [], None, None
+        try:
+            os.remove(self.file_name + ".budget")
+        except FileNotFoundError:
+            pass
+
+    def _close(self) -> None:
+        source_fps = 1000 / self.duration
+        levels = [(fps, step) for fps, step in BUDGET_LEVELS if fps is None or fps < source_fps]
+        attempt_file = self.file_name + ".budget"
+        for fps, typing_step in levels:
+            writer = self._encode(self._select(fps, typing_step), attempt_file)
+            size = os.path.getsize(attempt_file)
+            self.attempts.append((fps, typing_step, size, writer.frame_count))
+            self.fits = self.budget.fits(size, writer.frame_count)
+            if self.fits:
+                break
+        os.replace(attempt_file, self.file_name)
+        self.settings = (fps, typing_step)
+        self.frame_count, self.total_duration, self.bytes = writer.frame_count, writer.total_duration, size
+        self._frames, self._first, self._canvas = [], None, None
+
+    def report(self) -> str:
+        """Resumo das configurações escolhidas, para o log"""
+        fps, typing_step = self.settings
+        rate = f"{fps:g} fps" if fps else f"{1000 / self.duration:.3g} fps (original)"
+        typing = "todas as teclas" if typing_step == 1 else f"1 a cada {typing_step} teclas"
+        status = "dentro do limite" if self.fits else "ACIMA do limite (nível mais econômico)"
+        return (f"Orçamento do GIF ({self.budget.describe()}): {rate}, {typing}; "
+                f"{self.frame_count} frames, {self.bytes / 1024:.1f} KB - {status}, "
+                f"{len(self.attempts)} tentativa(s)")
+
+
+def gif_writer_for(file_name: str = "output.gif", workers: Optional[int] = None) -> Union[GifWriter, BudgetedGifWriter]:
+    """GifWriter, ou BudgetedGifWriter se GIF_MAX_BYTES/GIF_MAX_FRAMES estiverem definidos"""
+    budget = GifBudget.from_env()
+    if budget:
+        return BudgetedGifWriter(file_name, budget, workers=workers)
+    return GifWriter(file_name, workers=workers)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Gravação e reprodução (cassete) do tráfego com a API do GitHub
+
+Um `CassetteAdapter` montado na sessão do `GitHubStatsFetcher` (ver
+`github_stats.shared_session`) grava cada requisição e resposta, com os
+cabeçalhos, num arquivo JSON, ou responde a partir dele sem acessar a rede.
+Com um cassete gravado de uma conta real, testes, benchmarks e ajustes na
+animação rodam o caminho completo das estatísticas offline e com dados reais.
+
+Variáveis de ambiente:
+    GITHUB_CASSETTE          arquivo do cassete (vazio: rede normal)
+    GITHUB_CASSETTE_MODE     "replay" (padrão) ou "record"
+    GITHUB_CASSETTE_LATENCY  atraso simulado por resposta na reprodução, em
+                             segundos, ou "recorded" para o tempo gravado
+
+Na gravação, o cabeçalho Authorization não é salvo e as requisições vão sem
+If-None-Match / If-Modified-Since, para que toda resposta gravada tenha corpo;
+na reprodução, uma requisição condicional com o ETag gravado recebe 304, como
+na API real. As requisições são reconhecidas pelo método, caminho, parâmetros
+e corpo (o host não importa); se nenhuma for igual, vale a mesma requisição
+com outros valores de `since`/`until` (a janela de um ano muda todo dia).
+Requisições repetidas recebem as respostas gravadas em ordem, e a última se
+repete depois disso; uma requisição que não está no cassete falha como um
+erro de conexão.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_VERSION = 1
+CASSETTE_MODES = ("replay", "record")
+# Parâmetros que mudam entre execuções sem mudar o sentido da requisição
+VOLATILE_PARAMS = ("since", "until")
+SECRET_HEADERS = ("Authorization",)
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+# O corpo gravado já vem descomprimido e inteiro
+DROPPED_RESPONSE_HEADERS = ("Content-Encoding", "Transfer-Encoding", "Content-Length")
+
+RequestKey = Tuple[str, str, Tuple[Tuple[str, str], ...], str]
+
+
+def _body_text(body: Union[bytes, str, None]) -> str:
+    if body is None:
+        return ""
+    return body.decode("utf-8", "replace") if isinstance(body, bytes) else body
+
+
+def request_key(method: str, url: str, body: str = "", loose: bool = False) -> RequestKey:
+    """Chave de uma requisição: método, caminho, parâmetros ordenados e corpo
+
+    Args:
+        loose (bool): Ignora os parâmetros de VOLATILE_PARAMS
+    """
+    parsed = urlparse(url)
+    params = sorted((name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+                    if not (loose and name in VOLATILE_PARAMS))
+    return method.upper(), parsed.path, tuple(params), body
+
+
+class Cassette:
+    """Interações gravadas de um arquivo
+
+    Attributes:
+        path: Arquivo JSON ({"version", "interactions": [{"request", "response", "elapsed"}]})
+        interactions: Interações na ordem em que aconteceram
+        replayed: Respostas reproduzidas a partir dele (por todos os adaptadores)
+    """
+
+    def __init__(self, path: str, interactions: Optional[List[Dict[str, Any]]] = None):
+        self.path = path
+        self.interactions: List[Dict[str, Any]] = []
+        self.replayed = 0
+        self._exact: Dict[RequestKey, List[Dict[str, Any]]] = {}
+        self._loose: Dict[RequestKey, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        for interaction in interactions or []:
+            self.add(interaction)
+
+    @classmethod
+    def load(cls, path: str) -> 'Cassette':
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"{path}: versão de cassete desconhecida {data.get('version')!r}")
+        return cls(path, data["interactions"])
+
+    def add(self, interaction: Dict[str, Any]) -> None:
+        request = interaction["request"]
+        with self._lock:
+            self.interactions.append(interaction)
+            for index, loose in ((self._exact, False), (self._loose, True)):
+                key = request_key(request["method"], request["url"], request["body"], loose)
+                index.setdefault(key, []).append(interaction)
+
+    def find(self, key: RequestKey, loose_key: RequestKey) -> Optional[List[Dict[str, Any]]]:
+        """Interações gravadas para a requisição (exatas, ou com outros `since`/`until`)"""
+        return self._exact.get(key) or self._loose.get(loose_key)
+
+    def save(self) -> None:
+        """Grava o cassete (de forma atômica)"""
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": list(self.interactions)}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+# Um cassete por arquivo e modo em cada processo: as sessões do GraphQL e do REST
+# (e as de vários usuários no modo batch) gravam no mesmo arquivo
+_cassettes: Dict[Tuple[str, str], Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def open_cassette(path: str, mode: str = "replay") -> Cassette:
+    """Cassete do arquivo; na gravação, o primeiro uso no processo começa vazio"""
+    key = (os.path.abspath(path), mode)
+    with _cassettes_lock:
+        if key not in _cassettes:
+            _cassettes[key] = Cassette(path) if mode == "record" else Cassette.load(path)
+        return _cassettes[key]
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Adaptador do requests que grava as interações num cassete ou as reproduz
+
+    Args:
+        cassette (Cassette): Onde gravar ou de onde reproduzir
+        mode (str): "record" (usa a rede e grava) ou "replay" (não usa a rede)
+        latency (float | str): Atraso por resposta na reprodução, em segundos,
+            ou "recorded" para o tempo que a resposta levou na gravação
+        **kwargs: Repassados ao HTTPAdapter (ex.: `pool_maxsize`)
+    """
+
+    def __init__(self, cassette: Cassette, mode: str = "replay",
+                 latency: Union[float, str] = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"modo de cassete desconhecido: {mode!r}")
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+        self._positions: Dict[RequestKey, int] = {}
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.mode == "record":
+            return self._record(request, **kwargs)
+        return self._replay(request)
+
+    def close(self) -> None:
+        super().close()
+        if self.mode == "record":
+            self.cassette.save()
+
+    def _record(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        for name in CONDITIONAL_HEADERS:
+            request.headers.pop(name, None)
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        body = response.content  # lê o corpo inteiro
+        elapsed = time.perf_counter() - start
+        self.cassette.add({
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "headers": {name: value for name, value in request.headers.items()
+                            if name not in SECRET_HEADERS},
+                "body": _body_text(request.body),
+            },
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {name: value for name, value in response.headers.items()
+                            if name not in DROPPED_RESPONSE_HEADERS},
+                "body": body.decode("utf-8", "replace"),
+            },
+            "elapsed": round(elapsed, 4),
+        })
+        return response
+
+    def _replay(self, request: requests.PreparedRequest) -> requests.Response:
+        body = _body_text(request.body)
+        key = request_key(request.method, request.url, body)
+        matches = self.cassette.find(key, request_key(request.method, request.url, body, loose=True))
+        if not matches:
+            raise requests.exceptions.ConnectionError(
+                f"requisição fora do cassete {self.cassette.path}: {request.method} {request.url}",
+                request=request)
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        with self.cassette._lock:
+            self.cassette.replayed += 1
+        interaction = matches[min(position, len(matches) - 1)]
+        delay = interaction.get("elapsed", 0.0) if self.latency == "recorded" else float(self.latency)
+        if delay > 0:
+            time.sleep(delay)
+        return self._response(request, interaction, delay)
+
+    def _response(self, request: requests.PreparedRequest, interaction: Dict[str, Any],
+                  delay: float) -> requests.Response:
+        recorded = interaction["response"]
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response._content = recorded["body"].encode("utf-8")
+        etag = response.headers.get("ETag")
+        if response.status_code == 200 and etag and request.headers.get("If-None-Match") == etag:
+            response.status_code, response.reason, response._content = 304, "Not Modified", b""
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=delay)
+        return response
+
+
+def cassette_from_env() -> Optional[Tuple[str, str, Union[float, str]]]:
+    """(arquivo, modo, latência) de GITHUB_CASSETTE*, ou None se não houver cassete"""
+    path = os.getenv("GITHUB_CASSETTE", "")
+    if not path:
+        return None
+    mode = os.getenv("GITHUB_CASSETTE_MODE", "replay").strip().lower() or "replay"
+    latency: Union[float, str] = os.getenv("GITHUB_CASSETTE_LATENCY", "").strip().lower() or 0.0
+    if latency != "recorded":
+        try:
+            latency = float(latency)
+        except ValueError:
+            print(f"GITHUB_CASSETTE_LATENCY inválido ignorado: {latency!r}")
+            latency = 0.0
+    return path, mode, latency
+
+
+def replaying_from_env() -> bool:
+    """Há um cassete para reproduzir (dispensa o token do GitHub)?"""
+    config = cassette_from_env()
+    return config is not None and config[1] == "replay"
+
+
+def adapter_from_env(**kwargs) -> Optional[CassetteAdapter]:
+    """CassetteAdapter configurado por GITHUB_CASSETTE*, ou None para usar a rede"""
+    config = cassette_from_env()
+    if config is None:
+        return None
+    path, mode, latency = config
+    return CassetteAdapter(open_cassette(path, mode), mode, latency, **kwargs)
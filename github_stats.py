@@ -1,27 +1,372 @@
 #!/usr/bin/env python3
 """Módulo para buscar estatísticas reais do GitHub"""
 
+import hashlib
+import os
 import requests
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from pathlib import Path
+from typing import Callable, List, Tuple, Dict, Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import run_profile
+from github_cassette import adapter_from_env
+
+DEFAULT_MAX_WORKERS = 8  # requisições simultâneas por repositório
+DEFAULT_CACHE_DIR = ".cache/github"
+DEFAULT_CACHE_MAX_AGE_DAYS = 7  # respostas não usadas há mais tempo são apagadas (o `since` muda todo dia)
+DEFAULT_RATE_LIMIT_RESERVE = 50  # requisições que nunca são gastas (sobram para outros usos do token)
+DEFAULT_RATE_LIMIT_MAX_WAIT = 60  # segundos que vale a pena esperar por um limite antes de adiar
+MAX_RETRIES = 3
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """O limite da API acabaria antes do reset; a requisição foi adiada"""
+
+class RateLimiter:
+    """Acompanha o orçamento de requisições do token pelos cabeçalhos de resposta
+    
+    Lê X-RateLimit-Remaining / X-RateLimit-Reset de cada resposta, separados
+    por X-RateLimit-Resource (core, search, graphql: cada um tem seu limite e
+    sua janela), reserva uma unidade antes de cada requisição (para que threads
+    paralelas não passem do limite) e calcula a espera pedida por Retry-After,
+    por limite esgotado ou pelo limite secundário (403/429). A reserva nunca
+    passa de um décimo do X-RateLimit-Limit do recurso (a busca tem só 30 por
+    minuto).
+    """
+    
+    def __init__(self, reserve: Optional[int] = None, max_wait: Optional[float] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.reserve = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", DEFAULT_RATE_LIMIT_RESERVE)) if reserve is None else reserve
+        self.max_wait = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", DEFAULT_RATE_LIMIT_MAX_WAIT)) if max_wait is None else max_wait
+        self.sleep = sleep
+        self.remaining: Dict[str, int] = {}
+        self.reset: Dict[str, float] = {}
+        self.limit: Dict[str, int] = {}
+        self.deferred = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def resource_for(path: str) -> str:
+        """Recurso do limite para o caminho da requisição (quando a resposta não diz)"""
+        path = urlparse(path).path.rstrip("/")
+        if path.endswith("/graphql"):
+            return "graphql"
+        if "/search/" in path:
+            return "search"
+        return "core"
+    
+    def _reserve(self, resource: str) -> int:
+        limit = self.limit.get(resource)
+        return self.reserve if limit is None else min(self.reserve, limit // 10)
+    
+    def available(self, resource: str = "core") -> Optional[int]:
+        """Requisições que ainda podem ser feitas (None enquanto o limite é desconhecido)"""
+        with self._lock:
+            remaining = self.remaining.get(resource)
+            return None if remaining is None else max(remaining - self._reserve(resource), 0)
+    
+    def acquire(self, resource: str = "core") -> None:
+        """Reserva uma requisição do recurso; espera o reset se for curto, senão adia"""
+        with self._lock:
+            remaining = self.remaining.get(resource)
+            if remaining is None or remaining > self._reserve(resource):
+                if remaining is not None:
+                    self.remaining[resource] = remaining - 1
+                return
+            wait = max(self.reset.get(resource, 0) - time.time(), 0)
+        self.wait(wait)
+        with self._lock:
+            # o limite foi renovado; o próximo cabeçalho diz o novo valor
+            self.remaining.pop(resource, None)
+    
+    def wait(self, seconds: float) -> None:
+        if seconds > self.max_wait:
+            with self._lock:
+                self.deferred += 1
+            raise RateLimitExceeded(f"limite da API: seria preciso esperar {seconds:.0f}s")
+        if seconds > 0:
+            print(f"Limite da API: aguardando {seconds:.0f}s...")
+            self.sleep(seconds)
+    
+    def update(self, response: requests.Response, resource: str = "core") -> None:
+        """Atualiza o orçamento do recurso com os cabeçalhos da resposta
+        
+        Args:
+            resource (str): Recurso usado se a resposta não tiver X-RateLimit-Resource
+        """
+        resource = response.headers.get("X-RateLimit-Resource") or resource
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        limit = response.headers.get("X-RateLimit-Limit")
+        with self._lock:
+            new_window = reset is not None and float(reset) != self.reset.get(resource)
+            if reset is not None:
+                self.reset[resource] = float(reset)
+            if limit is not None:
+                self.limit[resource] = int(limit)
+            if remaining is not None:
+                # na mesma janela, respostas chegam fora de ordem: fica com o menor valor visto
+                if resource not in self.remaining or new_window:
+                    self.remaining[resource] = int(remaining)
+                else:
+                    self.remaining[resource] = min(self.remaining[resource], int(remaining))
+    
+    def retry_after(self, response: requests.Response, attempt: int) -> Optional[float]:
+        """Segundos a esperar antes de repetir a requisição, ou None se não é limite"""
+        if response.status_code not in (403, 429):
+            return None
+        if response.headers.get("Retry-After"):
+            return float(response.headers["Retry-After"])
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            return max(float(response.headers.get("X-RateLimit-Reset", 0)) - time.time(), 0)
+        if "secondary rate limit" in response.text.lower():
+            return 60 * 2 ** attempt  # recomendação do GitHub: ao menos um minuto
+        return None
+
+class ResponseCache:
+    """Cache em disco das respostas da API, para requisições condicionais
+    
+    Guarda o corpo, o ETag e o Last-Modified de cada URL. Na execução seguinte
+    esses valores vão em If-None-Match / If-Modified-Since; se o GitHub
+    responder 304 (que não conta no rate limit), o corpo vem do disco.
+    Entradas sem uso há mais de `max_age_days` (padrão
+    GITHUB_CACHE_MAX_AGE_DAYS) são apagadas por `prune`.
+    """
+    
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, token: str = "",
+                 max_age_days: Optional[float] = None):
+        self.directory = Path(directory)
+        # o conteúdo depende do token (repositórios privados), então ele entra na chave
+        self._salt = hashlib.sha256(token.encode()).hexdigest()
+        self.max_age_days = (float(os.getenv("GITHUB_CACHE_MAX_AGE_DAYS", DEFAULT_CACHE_MAX_AGE_DAYS))
+                             if max_age_days is None else max_age_days)
+    
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256((self._salt + url).encode()).hexdigest()[:40]}.json"
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Entrada salva para a URL: {"etag", "last_modified", "body"}"""
+        path = self._path(url)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # marca o uso (ver `prune`)
+        except (OSError, ValueError):
+            return None
+        return entry
+    
+    def put(self, url: str, response: requests.Response) -> None:
+        """Salva a resposta se ela tiver um validador (ETag ou Last-Modified)"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified,
+                       "headers": dict(response.headers), "body": response.text}, f)
+        os.replace(tmp_path, path)
+    
+    def prune(self) -> int:
+        """Apaga as entradas (e temporários) sem uso há mais de `max_age_days`; devolve quantas
+        
+        Os snapshots (`repos-<usuário>.json`) ficam na mesma pasta e não são tocados.
+        """
+        limit = time.time() - self.max_age_days * 86400
+        removed = 0
+        for path in [*self.directory.glob("*.json"), *self.directory.glob("*.tmp")]:
+            if path.suffix == ".json" and len(path.stem) != 40:
+                continue
+            try:
+                if path.stat().st_mtime < limit:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+    
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    @staticmethod
+    def to_response(url: str, entry: Dict[str, Any]) -> requests.Response:
+        """Reconstrói a resposta 200 guardada (marcada com `from_cache`)"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        response.encoding = "utf-8"
+        response._content = entry["body"].encode("utf-8")
+        response.from_cache = True
+        return response
+
+class RepoSnapshot:
+    """Contagens por repositório da última execução, válidas enquanto o `pushed_at` não mudar
+    
+    Arquivo JSON: {"repos": {full_name: {"pushed_at", "since", "commits"}}}.
+    Uma contagem só é reaproveitada para a mesma janela (`since`) e o mesmo
+    `pushed_at`; se a requisição de um repositório falhar ou for adiada pelo
+    limite da API, a última contagem conhecida é usada no lugar.
+    """
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.repos: Dict[str, Dict[str, Any]] = json.load(f).get("repos", {})
+        except (OSError, ValueError):
+            self.repos = {}
+        self._lock = threading.Lock()
+    
+    def get(self, full_name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.repos.get(full_name)
+    
+    def put(self, full_name: str, **values: Any) -> None:
+        with self._lock:
+            self.repos[full_name] = values
+    
+    def save(self, keep: Optional[List[str]] = None) -> None:
+        """Grava o arquivo, descartando repositórios que não existem mais"""
+        with self._lock:
+            if keep is not None:
+                self.repos = {name: values for name, values in self.repos.items() if name in keep}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"repos": self.repos}, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+def shared_session(pool_size: int = DEFAULT_MAX_WORKERS) -> requests.Session:
+    """Sessão com keep-alive e um pool de `pool_size` conexões por host
+
+    Pode ser passada para vários `GitHubStatsFetcher` (e usada de várias
+    threads) para que todos reaproveitem as mesmas conexões. Com
+    GITHUB_CASSETTE o tráfego é gravado num cassete ou reproduzido dele (ver
+    github_cassette.py).
+    """
+    session = requests.Session()
+    adapter = (adapter_from_env(pool_connections=1, pool_maxsize=pool_size)
+               or HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class GitHubStatsFetcher:
-    def __init__(self, token: str, username: str = "dudupys"):
+    def __init__(self, token: str, username: str = "dudupys", max_workers: Optional[int] = None,
+                 base_url: Optional[str] = None, cache_dir: Optional[str] = None,
+                 rate_limiter: Optional[RateLimiter] = None, session: Optional[requests.Session] = None):
         self.token = token
         self.username = username
         self.headers = {
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github.v3+json"
         }
-        self.base_url = "https://api.github.com"
+        self.base_url = (base_url or os.getenv("GITHUB_API_URL") or "https://api.github.com").rstrip("/")
+        self.max_workers = max_workers or int(os.getenv("GITHUB_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        # Uma sessão com keep-alive: a conexão TLS é reaproveitada entre as requisições,
+        # com um pool do tamanho do número de threads. Uma sessão recebida (ex.: no
+        # modo batch, compartilhada entre usuários) não é fechada por este objeto
+        self._owns_session = session is None
+        self.session = session or shared_session(self.max_workers)
+        self.session.headers.update(self.headers)
+        # Cache entre execuções (GITHUB_CACHE_DIR vazio desliga) e memória desta execução
+        cache_dir = os.getenv("GITHUB_CACHE_DIR", DEFAULT_CACHE_DIR) if cache_dir is None else cache_dir
+        self.cache = ResponseCache(cache_dir, token) if cache_dir else None
+        self.snapshot = RepoSnapshot(os.path.join(cache_dir, f"repos-{username}.json")) if cache_dir else None
+        self._memo: Dict[str, requests.Response] = {}
+        self._memo_lock = threading.Lock()
+        self.rate_limiter = rate_limiter or RateLimiter()
+    
+    def close(self) -> None:
+        """Apaga as respostas antigas do cache e fecha as conexões da sessão, se ela foi criada aqui"""
+        if self.cache:
+            self.cache.prune()
+        if self._owns_session:
+            self.session.close()
+    
+    def __enter__(self) -> 'GitHubStatsFetcher':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """GET na API usando a sessão compartilhada
+        
+        Cada URL é buscada no máximo uma vez por execução; respostas salvas em
+        execuções anteriores são revalidadas com uma requisição condicional.
+        """
+        url = requests.Request("GET", f"{self.base_url}/{endpoint}", params=params).prepare().url
+        with self._memo_lock:
+            if url in self._memo:
+                return self._memo[url]
+        
+        entry = self.cache.get(url) if self.cache else None
+        headers = ResponseCache.conditional_headers(entry) if entry else None
+        response = self._send("GET", url, headers=headers)
+        if response.status_code == 304 and entry:
+            response = ResponseCache.to_response(url, entry)
+        elif response.status_code == 200 and self.cache:
+            self.cache.put(url, response)
+        
+        with self._memo_lock:
+            self._memo[url] = response
+        return response
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Envia a requisição respeitando o limite da API
+        
+        Respostas de limite (403/429 com Retry-After, limite esgotado ou limite
+        secundário) são repetidas após a espera indicada, se ela for curta;
+        senão a requisição é adiada com RateLimitExceeded.
+        """
+        parsed = urlparse(url)
+        resource = RateLimiter.resource_for(parsed.path)
+        with run_profile.span("api", method=method, path=parsed.path, query=parsed.query) as attrs:
+            for attempt in range(MAX_RETRIES + 1):
+                self.rate_limiter.acquire(resource)
+                response = self.session.request(method, url, **kwargs)
+                self.rate_limiter.update(response, resource)
+                attrs.update(status=response.status_code, bytes=len(response.content), attempts=attempt + 1)
+                wait = self.rate_limiter.retry_after(response, attempt)
+                if wait is None or attempt == MAX_RETRIES:
+                    return response
+                self.rate_limiter.wait(wait)
+            return response
+    
+    def _prioritize(self, repos: List[Dict[str, Any]], label: str) -> List[Dict[str, Any]]:
+        """Repositórios mais recentes primeiro, até onde o limite da API permite"""
+        repos = sorted(repos, key=lambda repo: repo.get('pushed_at') or '', reverse=True)
+        budget = self.rate_limiter.available("core")
+        if budget is not None and budget < len(repos):
+            print(f"Limite da API: {label} de {budget} de {len(repos)} repositórios; o resto fica para a próxima execução")
+            repos = repos[:budget]
+        return repos
     
     def _make_request(self, endpoint: str) -> Dict[str, Any]:
         """Faz requisição para a API do GitHub"""
         url = f"{self.base_url}/{endpoint}"
         try:
-            response = requests.get(url, headers=self.headers)
-            print(f"API Request: {url} - Status: {response.status_code}")
+            response = self._get(endpoint)
+            cached = " (304, cache)" if getattr(response, "from_cache", False) else ""
+            print(f"API Request: {url} - Status: {response.status_code}{cached}")
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -30,6 +375,13 @@ class GitHubStatsFetcher:
                 print(f"Response body: {e.response.text}")
             return {}
     
+    def _map_repos(self, func: Callable[[Dict[str, Any]], Any], repos: List[Dict[str, Any]]) -> List[Any]:
+        """Aplica `func` a cada repositório em paralelo (no máximo `max_workers` por vez)"""
+        if not repos:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(repos))) as executor:
+            return list(executor.map(func, repos))
+    
     def get_user_info(self) -> Dict[str, Any]:
         """Obtém informações básicas do usuário"""
         return self._make_request(f"users/{self.username}")
@@ -51,69 +403,117 @@ class GitHubStatsFetcher:
         
         return repos
     
+    def _count(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """Tamanho de uma lista paginada da API com uma única requisição pequena
+        
+        Endpoints de busca devolvem o total direto em `total_count` (a paginação
+        deles para em 1000 resultados, então o Link não serve). Nas listas, pede
+        `per_page=1`: o número da página rel="last" do cabeçalho Link é o total
+        de itens; sem Link, a lista cabe numa página (0 ou 1 item).
+        """
+        response = self._get(endpoint, {**(params or {}), 'per_page': 1})
+        if response.status_code == 409:  # repositório vazio
+            return 0
+        response.raise_for_status()
+        data = response.json()
+        if isinstance(data, dict):
+            return data.get('total_count', 0)
+        last_url = response.links.get('last', {}).get('url')
+        if last_url:
+            return int(parse_qs(urlparse(last_url).query)['page'][0])
+        return len(data)
+    
+    def _full_name(self, repo: Dict[str, Any]) -> str:
+        return repo.get('full_name') or f"{self.username}/{repo['name']}"
+    
+    def _count_repo_commits(self, repo: Dict[str, Any], since: str) -> Optional[int]:
+        """Commits do próprio usuário em um repositório desde `since` (None se falhar)"""
+        try:
+            return self._count(f"repos/{self._full_name(repo)}/commits", {'since': since, 'author': self.username})
+        except (requests.exceptions.RequestException, ValueError, KeyError):
+            return None
+    
     def get_user_commits_last_year(self) -> int:
-        """Estima o número de commits no último ano"""
+        """Conta os commits do usuário no último ano (uma requisição por repositório alterado)
+        
+        Repositórios sem push desde o início da janela não têm commits nela e
+        não são consultados; os que não mudaram desde a última execução (mesmo
+        `pushed_at`, mesma janela) vêm do snapshot.
+        """
         repos = self.get_user_repos()
-        total_commits = 0
         one_year_ago = datetime.now().timestamp() - (365 * 24 * 60 * 60)
+        # Arredondado para o dia: a URL se repete entre execuções e pode ser revalidada pelo ETag
+        since = datetime.fromtimestamp(one_year_ago).strftime("%Y-%m-%dT00:00:00")
         
-        for repo in repos[:20]:  # Limita para não exceder rate limit
-            commits_url = f"repos/{self.username}/{repo['name']}/commits"
-            params = {
-                'since': datetime.fromtimestamp(one_year_ago).isoformat(),
-                'per_page': 100
-            }
-            
-            try:
-                response = requests.get(f"{self.base_url}/{commits_url}", 
-                                      headers=self.headers, params=params)
-                if response.status_code == 200:
-                    commits = response.json()
-                    # Conta apenas commits do próprio usuário
-                    user_commits = [c for c in commits if c.get('author', {}).get('login') == self.username]
-                    total_commits += len(user_commits)
-            except:
-                continue
+        counts: Dict[str, int] = {}
+        changed = []
+        for repo in repos:
+            full_name, pushed_at = self._full_name(repo), repo.get('pushed_at')
+            snapshot = self.snapshot.get(full_name) if self.snapshot else None
+            if pushed_at and pushed_at < since:
+                counts[full_name] = 0
+            elif snapshot and pushed_at and (snapshot['pushed_at'], snapshot['since']) == (pushed_at, since):
+                counts[full_name] = snapshot['commits']
+            else:
+                changed.append(repo)
+        if len(changed) < len(repos):
+            print(f"Commits: {len(repos) - len(changed)} repositórios sem mudanças, {len(changed)} consultados")
+        
+        changed = self._prioritize(changed, "commits")
+        for repo, commits in zip(changed, self._map_repos(lambda repo: self._count_repo_commits(repo, since), changed)):
+            if commits is not None:
+                counts[self._full_name(repo)] = commits
+                if self.snapshot:
+                    self.snapshot.put(self._full_name(repo), pushed_at=repo.get('pushed_at'), since=since, commits=commits)
         
-        return total_commits
+        if self.snapshot:
+            # falhas e repositórios adiados pelo limite usam a última contagem conhecida
+            for repo in repos:
+                full_name = self._full_name(repo)
+                if full_name not in counts and self.snapshot.get(full_name):
+                    counts[full_name] = self.snapshot.get(full_name)['commits']
+            if repos:
+                self.snapshot.save(keep=[self._full_name(repo) for repo in repos])
+        return sum(counts.values())
     
     def get_pull_requests_stats(self) -> Tuple[int, float]:
-        """Obtém estatísticas de Pull Requests"""
-        repos = self.get_user_repos()
-        total_prs = 0
-        merged_prs = 0
-        
-        for repo in repos[:10]:  # Limita para não exceder rate limit
-            # PRs criados pelo usuário
-            prs_url = f"repos/{self.username}/{repo['name']}/pulls"
-            params = {'state': 'all', 'per_page': 100}
-            
-            try:
-                response = requests.get(f"{self.base_url}/{prs_url}", 
-                                      headers=self.headers, params=params)
-                if response.status_code == 200:
-                    prs = response.json()
-                    user_prs = [pr for pr in prs if pr.get('user', {}).get('login') == self.username]
-                    total_prs += len(user_prs)
-                    merged_prs += len([pr for pr in user_prs if pr.get('merged_at')])
-            except:
-                continue
+        """Obtém estatísticas de Pull Requests (duas buscas, em qualquer repositório)"""
+        try:
+            total_prs = self._count("search/issues", {'q': f"author:{self.username} is:pr"})
+            merged_prs = self._count("search/issues", {'q': f"author:{self.username} is:pr is:merged"})
+        except (requests.exceptions.RequestException, ValueError, KeyError):
+            return 0, 0
         
         merge_percentage = (merged_prs / total_prs * 100) if total_prs > 0 else 0
         return total_prs, merge_percentage
     
-    def get_language_stats(self) -> List[Tuple[str, int]]:
+    def _own_repos(self, repos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Repositórios do próprio usuário que não são forks (os mesmos da consulta GraphQL)"""
+        return [repo for repo in repos
+                if not repo.get('fork')
+                and (repo.get('owner') or {}).get('login', self.username) == self.username]
+    
+    def get_stars_earned(self, repos: List[Dict[str, Any]]) -> int:
+        """Estrelas recebidas pelos repositórios do usuário"""
+        return sum(repo.get('stargazers_count', 0) for repo in self._own_repos(repos))
+    
+    def get_language_stats(self, repos: Optional[List[Dict[str, Any]]] = None) -> List[Tuple[str, int]]:
         """Analisa as linguagens mais usadas"""
-        repos = self.get_user_repos()
+        if repos is None:
+            repos = self.get_user_repos()
         language_bytes = {}
         
-        for repo in repos:
+        for repo in self._own_repos(repos):
             if repo.get('language'):
                 lang = repo['language']
                 size = repo.get('size', 0)
                 language_bytes[lang] = language_bytes.get(lang, 0) + size
         
-        # Ordena por bytes totais e converte para porcentagem
+        return self._language_percentages(language_bytes)
+    
+    @staticmethod
+    def _language_percentages(language_bytes: Dict[str, int]) -> List[Tuple[str, float]]:
+        """Ordena por bytes totais e converte para porcentagem (top 10)"""
         total = sum(language_bytes.values())
         sorted_languages = sorted(language_bytes.items(), key=lambda x: x[1], reverse=True)
         
@@ -121,9 +521,13 @@ class GitHubStatsFetcher:
                 for lang, bytes_count in sorted_languages[:10]]
     
     def get_complete_stats(self) -> 'GitHubDetails':
-        """Obtém estatísticas simplificadas mas reais"""
+        """Obtém estatísticas reais pela API REST"""
         print("Obtendo informações básicas do usuário...")
-        user_info = self.get_user_info()
+        # Perfil e lista de repositórios são independentes: buscados ao mesmo tempo
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            user_info_future = executor.submit(self.get_user_info)
+            repos_future = executor.submit(self.get_user_repos)
+        user_info = user_info_future.result()
         
         if not user_info:
             print("Falha ao obter informações do usuário")
@@ -136,24 +540,26 @@ class GitHubStatsFetcher:
         
         print(f"Dados obtidos: {followers} followers, {public_repos} repos")
         
-        # Estatísticas simples baseadas nos dados disponíveis
-        commits_last_year = public_repos * 15  # Estimativa conservadora
-        total_prs = public_repos * 2  # Estimativa baseada em repos
-        merge_percentage = 75.0  # Estimativa razoável
+        # Contagens exatas: uma requisição pequena por repositório e duas buscas de PRs
+        commits_last_year = self.get_user_commits_last_year()
+        total_prs, merge_percentage = self.get_pull_requests_stats()
+        merge_percentage = round(merge_percentage, 2)
         
-        # Linguagens baseadas nos repositórios públicos
-        languages = self.get_language_stats()
+        # Linguagens e estrelas baseadas nos repositórios
+        repos = repos_future.result()
+        languages = self.get_language_stats(repos)
+        stars = self.get_stars_earned(repos)
         
         # Determina ranking baseado em estatísticas reais
         level = self._calculate_user_level(commits_last_year, followers, public_repos)
         
         return GitHubDetails(
             user_rank=type('UserRank', (), {'level': level})(),
-            total_stargazers=followers,  # Followers reais
+            total_stargazers=stars,
             total_commits_last_year=commits_last_year,
             total_pull_requests_made=total_prs,
             pull_requests_merge_percentage=merge_percentage,
-            total_repo_contributions=public_repos,  # Repos reais
+            total_repo_contributions=public_repos,  # Repos públicos reais
             languages_sorted=languages
         )
     
@@ -172,6 +578,113 @@ class GitHubStatsFetcher:
         else:
             return "Junior Developer"
 
+GRAPHQL_STATS_QUERY = """
+query($login: String!, $first: Int!, $cursor: String) {
+  user(login: $login) {
+    followers { totalCount }
+    contributionsCollection {
+      totalCommitContributions
+      restrictedContributionsCount
+    }
+    pullRequests { totalCount }
+    mergedPullRequests: pullRequests(states: MERGED) { totalCount }
+    publicRepositories: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+    repositories(first: $first, after: $cursor, ownerAffiliations: OWNER, isFork: false) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        stargazerCount
+        languages(first: 10, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+      }
+    }
+  }
+}
+"""
+
+class GitHubGraphQLFetcher(GitHubStatsFetcher):
+    """Busca as mesmas estatísticas com a API GraphQL, em uma requisição por 100 repositórios
+    
+    Backend alternativo (GITHUB_STATS_BACKEND=graphql): em vez de uma
+    requisição por repositório, os números vêm prontos do
+    `contributionsCollection` (último ano) e dos totais das conexões de pull
+    requests. Os campos do `GitHubDetails` têm o mesmo sentido nos dois
+    backends (estrelas dos próprios repositórios, repositórios públicos), então
+    o fallback para o REST não muda o que o GIF mostra.
+    """
+    
+    def __init__(self, token: str, username: str = "dudupys", graphql_url: Optional[str] = None,
+                 page_size: int = 100, **kwargs):
+        super().__init__(token, username, **kwargs)
+        self.graphql_url = graphql_url or os.getenv("GITHUB_GRAPHQL_URL") or f"{self.base_url}/graphql"
+        self.page_size = page_size
+    
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Executa a consulta; devolve `data` ou {} em caso de erro"""
+        try:
+            response = self._send("POST", self.graphql_url, json={"query": query, "variables": variables})
+            print(f"GraphQL Request: {self.graphql_url} - Status: {response.status_code}")
+            response.raise_for_status()
+            result = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Erro na consulta GraphQL: {e}")
+            return {}
+        if result.get("errors"):
+            print(f"Erros na consulta GraphQL: {result['errors']}")
+            return {}
+        return result.get("data") or {}
+    
+    def get_complete_stats(self) -> 'GitHubDetails':
+        """Obtém estatísticas reais em uma ou poucas consultas GraphQL"""
+        print("Obtendo estatísticas via GraphQL...")
+        user = None
+        repositories = []
+        cursor = None
+        while True:
+            data = self._graphql(GRAPHQL_STATS_QUERY,
+                                 {"login": self.username, "first": self.page_size, "cursor": cursor})
+            page = data.get("user")
+            if not page:
+                print("Falha ao obter informações do usuário")
+                return None
+            user = user or page
+            repositories.extend(page["repositories"]["nodes"])
+            page_info = page["repositories"]["pageInfo"]
+            if not page_info["hasNextPage"]:
+                break
+            cursor = page_info["endCursor"]
+        
+        contributions = user["contributionsCollection"]
+        commits_last_year = contributions["totalCommitContributions"] + contributions["restrictedContributionsCount"]
+        total_prs = user["pullRequests"]["totalCount"]
+        merged_prs = user["mergedPullRequests"]["totalCount"]
+        merge_percentage = round(merged_prs / total_prs * 100, 2) if total_prs > 0 else 0
+        followers = user["followers"]["totalCount"]
+        # o mesmo `public_repos` do REST: os dois backends preenchem os campos com o mesmo sentido
+        public_repos = user["publicRepositories"]["totalCount"]
+        
+        stars = 0
+        language_bytes = {}
+        for repo in repositories:
+            stars += repo["stargazerCount"]
+            for edge in repo["languages"]["edges"]:
+                lang = edge["node"]["name"]
+                language_bytes[lang] = language_bytes.get(lang, 0) + edge["size"]
+        
+        print(f"Dados obtidos: {commits_last_year} commits, {total_prs} PRs, {public_repos} repos")
+        level = self._calculate_user_level(commits_last_year, followers, public_repos)
+        
+        return GitHubDetails(
+            user_rank=type('UserRank', (), {'level': level})(),
+            total_stargazers=stars,
+            total_commits_last_year=commits_last_year,
+            total_pull_requests_made=total_prs,
+            pull_requests_merge_percentage=merge_percentage,
+            total_repo_contributions=public_repos,
+            languages_sorted=self._language_percentages(language_bytes)
+        )
+
 class GitHubDetails:
     """Classe compatível com o formato esperado pelo main.py"""
     def __init__(self, user_rank, total_stargazers, total_commits_last_year, 
@@ -185,7 +698,24 @@ class GitHubDetails:
         self.total_repo_contributions = total_repo_contributions
         self.languages_sorted = languages_sorted
 
-def fetch_github_stats(token: str, username: str = "dudupys") -> GitHubDetails:
-    """Função principal para buscar estatísticas do GitHub"""
-    fetcher = GitHubStatsFetcher(token, username)
-    return fetcher.get_complete_stats()
+def fetch_github_stats(token: str, username: str = "dudupys", backend: Optional[str] = None,
+                       **fetcher_options: Any) -> GitHubDetails:
+    """Função principal para buscar estatísticas do GitHub
+    
+    Args:
+        token (str): Token de acesso
+        username (str): Usuário
+        backend (str): "rest" (padrão) ou "graphql"; por padrão GITHUB_STATS_BACKEND.
+            Se a consulta GraphQL falhar, as estatísticas vêm do REST
+        **fetcher_options: Repassados ao fetcher (ex.: `session` e `rate_limiter`
+            compartilhados entre vários usuários)
+    """
+    backend = backend or os.getenv("GITHUB_STATS_BACKEND", "rest")
+    if backend == "graphql":
+        with GitHubGraphQLFetcher(token, username, **fetcher_options) as fetcher:
+            details = fetcher.get_complete_stats()
+        if details is not None:
+            return details
+        print("GraphQL indisponível - usando a API REST")
+    with GitHubStatsFetcher(token, username, **fetcher_options) as fetcher:
+        return fetcher.get_complete_stats()
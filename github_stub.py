@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Servidor local que imita as APIs REST e GraphQL do GitHub, para testes sem rede
+
+Os dados vêm de um dicionário simples; as respostas têm ETag e aceitam
+If-None-Match. O servidor registra as requisições, o número de conexões TCP
+abertas e o pico de requisições simultâneas.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+# A busca do GitHub só pagina os primeiros 1000 resultados (o total_count é exato)
+SEARCH_RESULT_LIMIT = 1000
+
+
+def sample_data(username: str = "dudupys", num_repos: int = 12) -> Dict[str, Any]:
+    """Conta de exemplo com `num_repos` repositórios, commits e PRs"""
+    languages = ["Python", "JavaScript", "HTML", "CSS", "TypeScript"]
+    repos = []
+    now = datetime.now(timezone.utc)  # repo-0 é o push mais antigo, o último é o mais recente
+    for i in range(num_repos):
+        name = f"repo-{i}"
+        repos.append({
+            "name": name,
+            "language": languages[i % len(languages)],
+            "size": 100 * (i + 1),
+            "pushed_at": (now - timedelta(hours=num_repos - i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "stargazers_count": i % 3,
+            "commits": [{"sha": f"{i}-{c}", "author": {"login": username}} for c in range(i + 1)]
+            + [{"sha": f"{i}-other", "author": None}],
+            "pulls": [{"number": p, "user": {"login": username},
+                       "merged_at": "2025-01-01T00:00:00Z" if p % 2 == 0 else None}
+                      for p in range(i % 4)],
+        })
+    return {
+        "user": {"login": username, "followers": 7, "following": 3, "public_repos": num_repos},
+        "repos": repos,
+    }
+
+
+class GitHubStub:
+    """API do GitHub falsa rodando em 127.0.0.1 numa porta livre
+
+    Uso:
+        with GitHubStub(sample_data(), delay=0.05) as stub:
+            fetcher = GitHubStatsFetcher("token", base_url=stub.url)
+
+    Attributes:
+        data: Dados servidos (ver `sample_data`)
+        delay: Atraso artificial por requisição, em segundos (latência de rede)
+        requests: Caminhos requisitados, na ordem de chegada
+        connections: Quantas conexões TCP os clientes abriram
+        max_in_flight: Pico de requisições atendidas ao mesmo tempo
+        not_modified: Quantas respostas foram 304 (If-None-Match com ETag atual)
+        rate_limit_remaining: Se definido, enviado em X-RateLimit-Remaining e
+            decrementado a cada requisição (com X-RateLimit-Reset = rate_limit_reset)
+        search_rate_limit_remaining: O mesmo para o recurso "search" (buscas,
+            30 por minuto, com reset em search_rate_limit_reset); as outras
+            requisições ficam no recurso "core"
+        failures: Respostas (status, cabeçalhos, corpo) devolvidas, em ordem, antes
+            das normais; simula limites secundários e outros erros
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, delay: float = 0.0):
+        self.data = data or sample_data()
+        self.delay = delay
+        self.requests: List[str] = []
+        self.connections = 0
+        self.max_in_flight = 0
+        self.not_modified = 0
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset = int(time.time()) + 3600
+        self.search_rate_limit_remaining: Optional[int] = None
+        self.search_rate_limit_reset = int(time.time()) + 60
+        self.failures: List[tuple] = []
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> 'GitHubStub':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _repo(self, name: str) -> Optional[Dict[str, Any]]:
+        return next((repo for repo in self.data["repos"] if repo["name"] == name), None)
+
+    def _page(self, items: list, path: str, query: Dict[str, List[str]]):
+        """Uma página da lista, com o cabeçalho Link (rel="next"/"last") como na API real"""
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", ["30"])[0])
+        last = max(-(-len(items) // per_page), 1)
+        links = []
+        params = {key: values[0] for key, values in query.items()}
+        for rel, number in (("next", page + 1), ("last", last)):
+            if page < last:
+                params["page"] = str(number)
+                links.append(f'<{self.url}{path}?{urlencode(params)}>; rel="{rel}"')
+        headers = {"Link": ", ".join(links)} if links else {}
+        return 200, items[(page - 1) * per_page:page * per_page], headers
+
+    def _search_issues(self, query: Dict[str, List[str]]):
+        """search/issues para `author:USER is:pr [is:merged]`: só total_count e a página pedida"""
+        terms = query.get("q", [""])[0].split()
+        author = next((term.split(":", 1)[1] for term in terms if term.startswith("author:")), None)
+        prs = [pr for repo in self.data["repos"] for pr in repo["pulls"]
+               if (pr.get("user") or {}).get("login") == author]
+        if "is:merged" in terms:
+            prs = [pr for pr in prs if pr.get("merged_at")]
+        _, items, headers = self._page(prs[:SEARCH_RESULT_LIMIT], "/search/issues", query)
+        return 200, {"total_count": len(prs), "incomplete_results": False, "items": items}, headers
+
+    def route(self, path: str, query: Dict[str, List[str]]):
+        """Resposta (status, corpo JSON, cabeçalhos) para um GET em `path`"""
+        user = self.data["user"]
+        parts = [part for part in path.split("/") if part]
+        if parts == ["users", user["login"]]:
+            return 200, user, {}
+        if parts == ["users", user["login"], "repos"]:
+            listing = [{key: value for key, value in repo.items() if key not in ("commits", "pulls")}
+                       for repo in self.data["repos"]]
+            return self._page(listing, path, query)
+        if parts == ["search", "issues"]:
+            return self._search_issues(query)
+        if len(parts) == 4 and parts[0] == "repos" and parts[3] in ("commits", "pulls"):
+            repo = self._repo(parts[2])
+            if repo is not None:
+                items = repo[parts[3]]
+                if parts[3] == "commits" and "author" in query:
+                    items = [c for c in items if (c.get("author") or {}).get("login") == query["author"][0]]
+                return self._page(items, path, query)
+        return 404, {"message": "Not Found"}, {}
+
+    def graphql(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Resposta da consulta de estatísticas (GRAPHQL_STATS_QUERY) a partir dos dados
+
+        O cursor é o índice do próximo repositório; `first` define o tamanho da página.
+        """
+        user = self.data["user"]
+        if variables.get("login") != user["login"]:
+            return {"data": {"user": None},
+                    "errors": [{"type": "NOT_FOUND", "message": "Could not resolve to a User"}]}
+        repos = self.data["repos"]
+        # repositories(ownerAffiliations: OWNER, isFork: false)
+        own_repos = [repo for repo in repos if not repo.get("fork")
+                     and (repo.get("owner") or {}).get("login", user["login"]) == user["login"]]
+        start = int(variables.get("cursor") or 0)
+        end = start + int(variables.get("first", 100))
+        own_prs = [pr for repo in repos for pr in repo["pulls"]
+                   if (pr.get("user") or {}).get("login") == user["login"]]
+        return {"data": {"user": {
+            "followers": {"totalCount": user["followers"]},
+            "contributionsCollection": {
+                "totalCommitContributions": sum(
+                    1 for repo in repos for c in repo["commits"]
+                    if (c.get("author") or {}).get("login") == user["login"]),
+                "restrictedContributionsCount": 0,
+            },
+            "pullRequests": {"totalCount": len(own_prs)},
+            "mergedPullRequests": {"totalCount": len([pr for pr in own_prs if pr.get("merged_at")])},
+            "publicRepositories": {"totalCount": user["public_repos"]},
+            "repositories": {
+                "totalCount": len(own_repos),
+                "pageInfo": {"hasNextPage": end < len(own_repos), "endCursor": str(end)},
+                "nodes": [{
+                    "stargazerCount": repo["stargazers_count"],
+                    "languages": {"edges": [{"size": repo["size"], "node": {"name": repo["language"]}}]},
+                } for repo in own_repos[start:end]],
+            },
+        }}}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, como a API real
+            # cabeçalhos e corpo saem em dois send(); sem isso o Nagle + ACK atrasado
+            # do cliente somam ~40ms a cada resposta numa conexão reaproveitada
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                self._respond(lambda url: stub.route(url.path, parse_qs(url.query)))
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                self._respond(lambda url: (200, stub.graphql(body.get("variables") or {}), {})
+                              if url.path == "/graphql" else (404, {"message": "Not Found"}, {}))
+
+            def _respond(self, handle):
+                with stub._lock:
+                    stub.requests.append(self.path)
+                    stub._in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub._in_flight)
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    headers = {}
+                    with stub._lock:
+                        failure = stub.failures.pop(0) if stub.failures else None
+                        if self.path.startswith("/search/"):
+                            if stub.search_rate_limit_remaining is not None:
+                                stub.search_rate_limit_remaining = max(stub.search_rate_limit_remaining - 1, 0)
+                                headers.update({"X-RateLimit-Resource": "search", "X-RateLimit-Limit": "30",
+                                                "X-RateLimit-Remaining": str(stub.search_rate_limit_remaining),
+                                                "X-RateLimit-Reset": str(stub.search_rate_limit_reset)})
+                        elif stub.rate_limit_remaining is not None:
+                            stub.rate_limit_remaining = max(stub.rate_limit_remaining - 1, 0)
+                            headers["X-RateLimit-Remaining"] = str(stub.rate_limit_remaining)
+                            headers["X-RateLimit-Reset"] = str(stub.rate_limit_reset)
+                    if failure:
+                        status, route_headers, body = failure
+                    else:
+                        status, body, route_headers = handle(urlparse(self.path))
+                    headers.update(route_headers)
+                    payload = json.dumps(body).encode()
+                    etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+                    if status == 200 and self.headers.get("If-None-Match") == etag:
+                        with stub._lock:
+                            stub.not_modified += 1
+                        status, payload = 304, b""
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    if status in (200, 304):
+                        self.send_header("ETag", etag)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with stub._lock:
+                        stub._in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
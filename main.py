@@ -1,11 +1,51 @@
+"""
+Gera o output.gif (terminal animado) e o README.md do perfil
+
+Modos:
+    python main.py                GIF + README (busca as estatísticas no GitHub)
+    python main.py --readme-only  Só as seções em Markdown do README; não renderiza
+                                  o GIF nem acessa a rede (o output.gif atual é mantido).
+                                  Também ativado com README_ONLY=1.
+
+gifos, Pillow, numpy e requests só são importados no caminho do GIF, para que
+o modo README-only inicie em milissegundos.
+
+Quando as entradas do GIF e do README (estatísticas, reflexão, fontes, cores,
+este roteiro...) são as mesmas da última execução, registradas em
+output.manifest.json, nada é renderizado nem regravado. MANIFEST_TIMESTAMPS=count
+faz o horário contar como mudança; FORCE_RENDER=1 renderiza sempre.
+
+Cada execução grava um perfil em JSON (RUN_PROFILE, padrão .cache/run-profile.json;
+vazio desliga) com a duração de cada fase, cena, troca de fonte, chamada à API e
+etapa do GIF; RUN_PROFILE_MEMORY=1 inclui os picos de memória (tracemalloc).
+
+OUTPUT_FORMATS escolhe as saídas da animação, separadas por vírgula (padrão "gif"):
+gif (output.gif), svg (output.svg, SVG animado com CSS) e cast (output.cast,
+gravação do asciinema). svg e cast rodam as mesmas cenas no TextTerminal, sem
+rasterizar nem comprimir frames; sem gif, o README mostra o output.svg.
+
+GIF_WORKERS comprime os frames grandes do GIF em vários processos (0: um por
+CPU; o arquivo é o mesmo da compressão serial). GIF_MAX_BYTES e GIF_MAX_FRAMES
+reduzem a animação até o GIF caber no limite.
+
+GITHUB_CASSETTE grava o tráfego com a API do GitHub num arquivo
+(GITHUB_CASSETTE_MODE=record) ou o reproduz sem rede e sem token (ver
+github_cassette.py).
+
+Para gerar os perfis de vários usuários num só processo, veja batch.py; para
+servir o GIF e o README por HTTP, atualizando em segundo plano, veja service.py.
+"""
+
 from datetime import datetime
 import os
+import sys
+from pathlib import Path
 
-import gifos
 from zoneinfo import ZoneInfo
-from github_stats import fetch_github_stats
 from about_me_generator import generate_about_me_section
 from reflexao_diaria_generator import generate_reflexao_diaria_section
+from output_manifest import OutputManifest
+import run_profile
 
 FONT_FILE_LOGO = "./fonts/vtks-blocketo.regular.ttf"
 # FONT_FILE_BITMAP = "./fonts/ter-u14n.pil"
@@ -14,32 +54,69 @@ FONT_FILE_TRUETYPE = "./fonts/IosevkaTermNerdFont-Bold.ttf"
 FONT_FILE_MONA = "./fonts/Inversionz.otf"
 
 
-def main():
-    import os
-    t = gifos.Terminal(750, 500, 15, 15, FONT_FILE_BITMAP, 15)
+USERNAME = "dudupys"
+TIMEZONE = "America/Sao_Paulo"
+
+
+def prompt_for(username):
+    """Prompt do terminal do usuário (usuario@gifos ~>)"""
+    return f"\x1b[0;91m{username}\x1b[0m@\x1b[0;93mgifos ~> \x1b[0m"
+
+
+PROMPT = prompt_for(USERNAME)
+
+OUTPUT_FILES = {"gif": "output.gif", "svg": "output.svg", "cast": "output.cast"}
+
+
+def new_terminal(sink, font_file=FONT_FILE_BITMAP, prompt=PROMPT):
+    """Cria o terminal de uma cena, enviando os frames para `sink`
+
+    TERMINAL_ENGINE=gifos usa o `gifos.Terminal` original em vez do motor
+    em grade de células (CellTerminal). Os terminais do CellTerminal de um
+    mesmo processo compartilham o atlas de glifos (fontes já carregadas e
+    tiles já rasterizados).
+    """
+    if os.getenv("TERMINAL_ENGINE", "cell") == "gifos":
+        from frame_sink import SinkTerminal
+        t = SinkTerminal(sink, 750, 500, 15, 15, font_file, 15)
+    else:
+        from cell_terminal import CellTerminal, shared_atlas
+        t = CellTerminal(sink, 750, 500, 15, 15, font_file, 15, atlas=shared_atlas())
     
     # FORÇAR cursor desligado permanentemente
     t.toggle_show_cursor(False)
     
-    # Mudar o prompt para dudupys@gifos
-    t._Terminal__prompt = "\x1b[0;91mdudupys\x1b[0m@\x1b[0;93mgifos ~> \x1b[0m"
-    
-    # Método personalizado para mostrar prompt sem ligar cursor
-    def gen_prompt_no_cursor(row_num, col_num=1, count=1):
-        t.clone_frame(1)
-        # FORÇAR cursor desligado antes de cada prompt
-        t.toggle_show_cursor(False)
-        t.gen_text(t._Terminal__prompt, row_num, col_num, count, False, False)
-        # FORÇAR cursor desligado depois do prompt também
-        t.toggle_show_cursor(False)
-    
+    # Mudar o prompt para usuario@gifos
+    t.set_prompt(prompt)
+    return t
+
+
+def new_text_terminal(sink):
+    """Como `new_terminal`, mas gerando frames de texto para o SVG e o asciicast"""
+    from text_backend import TextTerminal
+
+    t = TextTerminal(sink, 750, 500, 15, 15, FONT_FILE_BITMAP, 15)
+    t.toggle_show_cursor(False)
+    t.set_prompt(PROMPT)
+    return t
+
+
+# Método personalizado para mostrar prompt sem ligar cursor
+def gen_prompt_no_cursor(t, row_num, col_num=1, count=1, prompt=PROMPT):
+    t.clone_frame(1)
+    # FORÇAR cursor desligado antes de cada prompt
+    t.toggle_show_cursor(False)
+    t.gen_text(prompt, row_num, col_num, count, False, False)
+    # FORÇAR cursor desligado depois do prompt também
+    t.toggle_show_cursor(False)
+
+
+# Cada cena começa de um terminal limpo e pode ser renderizada em outro processo
+def scene_bios(t, year_now):
+    """BIOS e teste de memória"""
     t.gen_text("", 1, count=20)
     # FORÇAR cursor desligado
     t.toggle_show_cursor(False)
-    year_now = datetime.now(ZoneInfo("America/Sao_Paulo")).strftime("%Y")
-    time_now = datetime.now(ZoneInfo("America/Sao_Paulo")).strftime(
-        "%a %b %d %I:%M:%S %p %Z %Y"
-    )
     t.gen_text("GIF_OS Modular BIOS v1.0.11", 1)
     t.gen_text(f"Copyright (C) {year_now}, \x1b[31mEduardo Vinícios Softwares Inc.\x1b[0m", 2)
     t.gen_text("\x1b[94mGitHub Profile ReadMe Terminal, Rev 1011\x1b[0m", 4)
@@ -60,11 +137,15 @@ def main():
     t.gen_text("Memory Test: 64KB OK", 7, count=10, contin=True)
     t.gen_text("", 11, count=10, contin=True)
 
-    t.clear_frame()
+
+def scene_boot(t, font_logo=FONT_FILE_LOGO):
+    """Sequência de boot com o logo GIF OS embaralhado"""
+    import gifos
+
     t.gen_text("Initiating Boot Sequence ", 1, contin=True)
     t.gen_typing_text(".....", 1, contin=True)
     t.gen_text("\x1b[96m", 1, count=0, contin=True)  # buffer to be removed
-    t.set_font(FONT_FILE_LOGO, 66)
+    t.set_font(font_logo, 66)
     # Garantir cursor desligado mesmo aqui
     t.toggle_show_cursor(False)
     os_logo_text = "GIF OS"
@@ -77,8 +158,9 @@ def main():
         t.delete_row(mid_row + 1)
         t.gen_text(effect_lines[i], mid_row + 1, mid_col + 1)
 
-    t.set_font(FONT_FILE_BITMAP, 15)
-    t.clear_frame()
+
+def scene_login(t, time_now, username=USERNAME):
+    """Login no tty1"""
     t.clone_frame(5)
     # FORÇAR cursor desligado
     t.toggle_show_cursor(False)
@@ -86,7 +168,7 @@ def main():
     t.gen_text("login: ", 3, count=5)
     # FORÇAR cursor desligado
     t.toggle_show_cursor(False)
-    t.gen_typing_text("dudupys", 3, contin=True)
+    t.gen_typing_text(username, 3, contin=True)
     t.gen_text("", 4, count=5)
     # FORÇAR cursor desligado
     t.toggle_show_cursor(False)
@@ -96,97 +178,30 @@ def main():
     t.gen_typing_text("*********", 4, contin=True)
     # FORÇAR cursor desligado
     t.toggle_show_cursor(False)
-    time_now = datetime.now(ZoneInfo("America/Sao_Paulo")).strftime(
-        "%a %b %d %I:%M:%S %p %Z %Y"
-    )
     t.gen_text(f"Last login: {time_now} on tty1", 6)
 
-    gen_prompt_no_cursor(7, count=5)
+    gen_prompt_no_cursor(t, 7, count=5, prompt=prompt_for(username))
     prompt_col = t.curr_col
     # Cursor já está desligado permanentemente
     t.gen_typing_text("\x1b[91mclea", 7, contin=True)
     t.delete_row(7, prompt_col)  # simulate syntax highlighting
     t.gen_text("\x1b[92mclear\x1b[0m", 7, count=3, contin=True)
 
-    # Tentar obter dados reais da API do GitHub
-    git_user_details = None
-    
-    # Restaurar cálculo dinâmico da idade
-    try:
-        user_age = gifos.utils.calc_age(3, 12, 2007)
-    except:
-        user_age = type('obj', (object,), {'years': 18, 'months': 2, 'days': 13})()
-    
-    t.clear_frame()
-    
-    # Restaurar busca real do GitHub
-    github_token = os.getenv('GITHUB_TOKEN')
-    if github_token:
-        try:
-            print("Buscando dados reais do GitHub...")
-            print(f"Token encontrado: {github_token[:10]}...{github_token[-4:]}")
-            git_user_details = fetch_github_stats(github_token, "dudupys")
-            if git_user_details:
-                print("Dados do GitHub obtidos com sucesso!")
-            else:
-                print("Falha ao obter dados do GitHub - usando fallback")
-                git_user_details = None
-        except Exception as e:
-            print(f"Erro ao buscar dados do GitHub: {e}")
-            print("Usando dados mock como fallback...")
-            git_user_details = None
-    else:
-        print("Token GitHub não encontrado - usando dados mock")
-    
-    # Se não conseguir obter dados do GitHub, usa dados mock
-    if git_user_details is None:
-        print("Usando dados mock como fallback...")
-        class MockGitHubDetails:
-            def __init__(self):
-                self.user_rank = type('obj', (object,), {'level': 'Active Developer'})()
-                self.total_stargazers = 11
-                self.total_commits_last_year = 358  # Contributions reais
-                self.total_pull_requests_made = 23
-                self.pull_requests_merge_percentage = 85
-                self.total_repo_contributions = 10
-                self.languages_sorted = [('Python', 35), ('JavaScript', 25), ('HTML', 20), ('CSS', 15), ('TypeScript', 5)]
-        git_user_details = MockGitHubDetails()
-    
-    top_languages = [lang[0] for lang in git_user_details.languages_sorted]
-    user_details_lines = f"""
-    \x1b[30;101mdudupys@GitHub\x1b[0m
-    --------------
-    \x1b[96mOS:     \x1b[93mWindows 11, Android 14\x1b[0m
-    \x1b[96mSchool: \x1b[93mInstituto Federal do Rio Grande do Norte \x1b[94m#IFRN\x1b[0m
-    \x1b[96mCourse: \x1b[93mInformática para Internet \x1b[94m#IFRN\x1b[0m
-    \x1b[96mUptime: \x1b[93m{user_age.years} years, {user_age.months} months, {user_age.days} days\x1b[0m
-    \x1b[96mIDE:    \x1b[93mVSCode, Cursor, Windsurf\x1b[0m
-    
-    \x1b[30;101mContact:\x1b[0m
-    --------------
-    \x1b[96mEmail:      \x1b[93meduardo.vinicios.xt1@gmail.com\x1b[0m
-    \x1b[96mLinkedIn:   \x1b[93meduardo-vin%C3%ADcius-344269361\x1b[0m
-    
-    \x1b[30;101mGitHub Stats:\x1b[0m
-    --------------
-    \x1b[96mUser Rating: \x1b[93m{git_user_details.user_rank.level}\x1b[0m
-    \x1b[96mTotal Stars Earned: \x1b[93m{git_user_details.total_stargazers}\x1b[0m
-    \x1b[96mTotal Commits: \x1b[93m{git_user_details.total_commits_last_year}\x1b[0m
-    \x1b[96mTotal PRs: \x1b[93m{git_user_details.total_pull_requests_made}\x1b[0m
-    \x1b[96mMerged PR %: \x1b[93m{git_user_details.pull_requests_merge_percentage}\x1b[0m
-    \x1b[96mTotal Contributions: \x1b[93m{git_user_details.total_repo_contributions}\x1b[0m
-    \x1b[96mTop Languages: \x1b[93m{', '.join(top_languages[:5])}\x1b[0m
-    """
-    gen_prompt_no_cursor(1)
+
+def scene_fetch(t, user_details_lines, username=USERNAME, font_mona=FONT_FILE_MONA,
+                font_bitmap=FONT_FILE_BITMAP):
+    """fetch.sh com a Mona e as estatísticas do GitHub"""
+    prompt = prompt_for(username)
+    gen_prompt_no_cursor(t, 1, prompt=prompt)
     prompt_col = t.curr_col
     t.clone_frame(10)
     # Cursor já está desligado permanentemente
     t.gen_typing_text("\x1b[91mfetch.s", 1, contin=True)
     t.delete_row(1, prompt_col)
     t.gen_text("\x1b[92mfetch.sh\x1b[0m", 1, contin=True)
-    t.gen_typing_text(" -u dudupys", 1, contin=True)
+    t.gen_typing_text(f" -u {username}", 1, contin=True)
 
-    t.set_font(FONT_FILE_MONA, 16, 0)
+    t.set_font(font_mona, 16, 0)
     # Cursor já está desligado permanentemente
     monaLines = r"""
     \x1b[49m     \x1b[90;100m}}\x1b[49m     \x1b[90;100m}}\x1b[0m
@@ -214,11 +229,11 @@ def main():
     """
     t.gen_text(monaLines, 10)
 
-    t.set_font(FONT_FILE_BITMAP)
+    t.set_font(font_bitmap)
     # Cursor já está desligado permanentemente
     # t.pasteImage("./temp/x0rzavi.jpg", 3, 5, sizeMulti=0.5)
     t.gen_text(user_details_lines, 2, 35, count=5, contin=True)
-    gen_prompt_no_cursor(t.curr_row)
+    gen_prompt_no_cursor(t, t.curr_row, prompt=prompt)
     t.gen_typing_text(
         "\x1b[92m# Have a nice day kind stranger :D Thanks for stopping by!",
         t.curr_row,
@@ -227,65 +242,283 @@ def main():
     # t.save_frame("fetch_details.png")
     t.gen_text("", t.curr_row, count=120, contin=True)
 
-    # Método alternativo para criar GIF sem ffmpeg
-    print("Criando GIF com método alternativo...")
-    import os
-    from PIL import Image
-    
-    # Verificar pasta de frames
-    frame_folder = "frames"
-    if not os.path.exists(frame_folder):
-        os.makedirs(frame_folder)
+
+def readme_only_mode():
+    """True quando só o README deve ser gerado (--readme-only ou README_ONLY=1)"""
+    return "--readme-only" in sys.argv[1:] or os.getenv("README_ONLY", "") not in ("", "0")
+
+
+def output_formats():
+    """Formatos pedidos em OUTPUT_FORMATS (gif, svg, cast), na ordem de OUTPUT_FILES"""
+    requested = {fmt.strip().lower() for fmt in os.getenv("OUTPUT_FORMATS", "gif").split(",")}
+    unknown = requested - set(OUTPUT_FILES) - {""}
+    if unknown:
+        print(f"Formatos desconhecidos em OUTPUT_FORMATS ignorados: {', '.join(sorted(unknown))}")
+    return [fmt for fmt in OUTPUT_FILES if fmt in requested] or ["gif"]
+
+
+def mock_user_details():
+    """Estatísticas usadas quando não é possível obtê-las da API"""
+    class MockGitHubDetails:
+        def __init__(self):
+            self.user_rank = type('obj', (object,), {'level': 'Active Developer'})()
+            self.total_stargazers = 11
+            self.total_commits_last_year = 358  # Contributions reais
+            self.total_pull_requests_made = 23
+            self.pull_requests_merge_percentage = 85
+            self.total_repo_contributions = 10
+            self.languages_sorted = [('Python', 35), ('JavaScript', 25), ('HTML', 20), ('CSS', 15), ('TypeScript', 5)]
+    return MockGitHubDetails()
+
+
+def resolve_github_token(token=None):
+    """Token da API: o recebido, GITHUB_TOKEN ou, reproduzindo um cassete
+    (GITHUB_CASSETTE), um marcador no lugar do token; None se não houver nenhum"""
+    from github_cassette import replaying_from_env
+
+    github_token = token or os.getenv('GITHUB_TOKEN')
+    if not github_token and replaying_from_env():
+        github_token = "cassete-sem-token"  # as respostas vêm do cassete
+    return github_token or None
+
+
+def fetch_user_details(username=USERNAME, token=None, **fetcher_options):
+    """Estatísticas do GitHub, ou dados mock se não for possível obtê-las
+
+    Args:
+        username (str): Usuário do GitHub
+        token (str): Token da API (padrão: GITHUB_TOKEN)
+        **fetcher_options: Repassados a `fetch_github_stats` (ex.: sessão compartilhada)
+    """
+    from github_stats import fetch_github_stats
+
+    # Tentar obter dados reais da API do GitHub
+    git_user_details = None
     
-    # Encontrar todos os arquivos de frame
-    frame_files = []
-    for file in os.listdir(frame_folder):
-        if file.startswith("frame_") and file.endswith(".png"):
-            frame_files.append(file)
+    # Restaurar busca real do GitHub
+    github_token = resolve_github_token(token)
+    if github_token:
+        try:
+            print("Buscando dados reais do GitHub...")
+            print(f"Token encontrado: {github_token[:10]}...{github_token[-4:]}")
+            git_user_details = fetch_github_stats(github_token, username, **fetcher_options)
+            if git_user_details:
+                print("Dados do GitHub obtidos com sucesso!")
+            else:
+                print("Falha ao obter dados do GitHub - usando fallback")
+                git_user_details = None
+        except Exception as e:
+            print(f"Erro ao buscar dados do GitHub: {e}")
+            print("Usando dados mock como fallback...")
+            git_user_details = None
+    else:
+        print("Token GitHub não encontrado - usando dados mock")
     
-    frame_files.sort()  # Ordenar por número
+    # Se não conseguir obter dados do GitHub, usa dados mock
+    if git_user_details is None:
+        print("Usando dados mock como fallback...")
+        git_user_details = mock_user_details()
+    return git_user_details
+
+
+def stats_summary(git_user_details):
+    """Os campos das estatísticas que aparecem no GIF"""
+    return {
+        "level": git_user_details.user_rank.level,
+        "stars": git_user_details.total_stargazers,
+        "commits": git_user_details.total_commits_last_year,
+        "pull_requests": git_user_details.total_pull_requests_made,
+        "merge_percentage": git_user_details.pull_requests_merge_percentage,
+        "contributions": git_user_details.total_repo_contributions,
+        "top_languages": [lang[0] for lang in git_user_details.languages_sorted][:5],
+    }
+
+
+def render_fingerprint_for_gif(font_files=None):
+    """Hash das fontes, do esquema de cores, deste roteiro e do motor de renderização"""
+    from palette import ColorPalette
+    from scene_cache import render_fingerprint
+
+    if font_files is None:
+        font_files = [FONT_FILE_LOGO, FONT_FILE_BITMAP, FONT_FILE_TRUETYPE, FONT_FILE_MONA]
+    return render_fingerprint([__file__, *font_files], ColorPalette.from_color_scheme().to_bytes())
+
+
+def profile_details_text(details, user_age=None):
+    """Linhas "Campo: valor" do fetch.sh para um perfil do modo batch
+
+    Args:
+        details (dict): Campos na ordem em que aparecem (ex.: {"OS": "Linux"})
+        user_age: Idade (calc_age) para o Uptime, ou None para omiti-lo
+    """
+    fields = dict(details)
+    if user_age is not None:
+        fields["Uptime"] = f"{user_age.years} years, {user_age.months} months, {user_age.days} days"
+    width = max((len(label) for label in fields), default=0) + 2
+    return "".join(f"\n    \x1b[96m{label + ':':<{width}}\x1b[93m{value}\x1b[0m" for label, value in fields.items())
+
+
+def user_details_text(git_user_details, user_age, username=USERNAME, profile_lines=None):
+    """Texto do fetch.sh: perfil, contato e estatísticas do GitHub
+
+    `profile_lines` substitui o bloco do perfil (sistema, escola, contato);
+    por padrão é o do dudupys.
+    """
+    top_languages = [lang[0] for lang in git_user_details.languages_sorted]
+    if profile_lines is None:
+        profile_lines = f"""
+    \x1b[96mOS:     \x1b[93mWindows 11, Android 14\x1b[0m
+    \x1b[96mSchool: \x1b[93mInstituto Federal do Rio Grande do Norte \x1b[94m#IFRN\x1b[0m
+    \x1b[96mCourse: \x1b[93mInformática para Internet \x1b[94m#IFRN\x1b[0m
+    \x1b[96mUptime: \x1b[93m{user_age.years} years, {user_age.months} months, {user_age.days} days\x1b[0m
+    \x1b[96mIDE:    \x1b[93mVSCode, Cursor, Windsurf\x1b[0m
     
-    print(f"Encontrados {len(frame_files)} frames")
+    \x1b[30;101mContact:\x1b[0m
+    --------------
+    \x1b[96mEmail:      \x1b[93meduardo.vinicios.xt1@gmail.com\x1b[0m
+    \x1b[96mLinkedIn:   \x1b[93meduardo-vin%C3%ADcius-344269361\x1b[0m"""
+    return f"""
+    \x1b[30;101m{username}@GitHub\x1b[0m
+    --------------{profile_lines}
     
-    # Criar GIF com método simples e funcionando
-    if len(frame_files) > 0:
-        print("Criando GIF com método simples...")
-        images = []
-        durations = []
-        
-        for file in frame_files:
-            img_path = os.path.join(frame_folder, file)
-            img = Image.open(img_path).convert("RGBA")
-            images.append(img)
-            durations.append(100)  # 100ms por frame
-        
-        # Adicionar delay extra nos últimos frames para melhor visualização
-        if len(durations) > 0:
-            durations[-1] = 1000  # 1s no último frame
-        if len(durations) > 1:
-            durations[-2] = 800  # 800ms no penúltimo frame
-        if len(durations) > 2:
-            durations[-3] = 600  # 600ms no antepenúltimo frame
-        
-        # Salvar GIF de forma simples
-        images[0].save(
-            "output.gif",
-            save_all=True,
-            append_images=images[1:],
-            duration=durations,
-            loop=0
+    \x1b[30;101mGitHub Stats:\x1b[0m
+    --------------
+    \x1b[96mUser Rating: \x1b[93m{git_user_details.user_rank.level}\x1b[0m
+    \x1b[96mTotal Stars Earned: \x1b[93m{git_user_details.total_stargazers}\x1b[0m
+    \x1b[96mTotal Commits: \x1b[93m{git_user_details.total_commits_last_year}\x1b[0m
+    \x1b[96mTotal PRs: \x1b[93m{git_user_details.total_pull_requests_made}\x1b[0m
+    \x1b[96mMerged PR %: \x1b[93m{git_user_details.pull_requests_merge_percentage}\x1b[0m
+    \x1b[96mTotal Contributions: \x1b[93m{git_user_details.total_repo_contributions}\x1b[0m
+    \x1b[96mTop Languages: \x1b[93m{', '.join(top_languages[:5])}\x1b[0m
+    """
+
+
+def build_scenes(year_now, time_now, user_details_lines, username=USERNAME, fonts=None):
+    """As cenas da animação, na ordem em que aparecem no GIF
+
+    Args:
+        fonts (dict): Fontes "logo", "mona" e "bitmap" que substituem as padrão
+    """
+    from scenes import Scene
+
+    fonts = fonts or {}
+    return [
+        Scene("bios", scene_bios, year_now=year_now),
+        Scene("boot", scene_boot, font_logo=fonts.get("logo", FONT_FILE_LOGO)),
+        Scene("login", scene_login, time_now=time_now, username=username),
+        Scene("fetch", scene_fetch, user_details_lines=user_details_lines, username=username,
+              font_mona=fonts.get("mona", FONT_FILE_MONA), font_bitmap=fonts.get("bitmap", FONT_FILE_BITMAP)),
+    ]
+
+
+def preload_gifos():
+    """Importa o gifos numa pasta temporária: o import apaga output.gif e frames/ do diretório atual
+
+    Usado por todo caminho que não regrava o output.gif: batch.py, service.py
+    e as saídas só em texto (OUTPUT_FORMATS=svg/cast). Depois do primeiro
+    import não faz nada.
+    """
+    if "gifos" in sys.modules:
+        return
+    import importlib
+    import tempfile
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        try:
+            importlib.import_module("gifos")
+        finally:
+            os.chdir(cwd)
+
+
+def calc_user_age(day=3, month=12, year=2007):
+    """Idade para o Uptime do fetch.sh"""
+    # Módulos pesados (gifos, Pillow, numpy) só são carregados na renderização;
+    # importar o gifos apaga o output.gif e a pasta frames/ do diretório atual
+    import gifos
+
+    # Restaurar cálculo dinâmico da idade
+    try:
+        return gifos.utils.calc_age(day, month, year)
+    except:
+        return type('obj', (object,), {'years': 18, 'months': 2, 'days': 13})()
+
+
+def render_gif(year_now, time_now, git_user_details, fingerprint):
+    """Renderiza o output.gif com as estatísticas já obtidas"""
+    user_details_lines = user_details_text(git_user_details, calc_user_age())
+
+    from gif_writer import BudgetedGifWriter, gif_writer_for
+    from scene_cache import DEFAULT_CACHE_DIR, SceneCache
+    from scenes import render_scenes
+
+    # Cenas que não mudaram desde a última execução vêm do cache em disco
+    scene_cache = None
+    cache_dir = os.getenv("SCENE_CACHE_DIR", DEFAULT_CACHE_DIR)
+    if cache_dir:
+        scene_cache = SceneCache(cache_dir, fingerprint)
+
+    # Os frames vão direto do terminal para o codificador, sem passar por frames/*.png;
+    # com GIF_MAX_BYTES/GIF_MAX_FRAMES a animação é reduzida até caber no limite
+    # (ao sair do bloco o GIF é finalizado; se a renderização falhar, o output.gif anterior fica)
+    with gif_writer_for("output.gif") as gif_writer:
+        render_scenes(
+            build_scenes(year_now, time_now, user_details_lines),
+            new_terminal,
+            gif_writer,
+            cache=scene_cache,
         )
-        print(f"GIF criado com sucesso! ({len(frame_files)} frames, duração total: {sum(durations)/1000:.1f}s)")
+    if scene_cache is not None:
+        print(f"Cache de cenas: reaproveitadas {scene_cache.hits or '-'}, renderizadas {scene_cache.misses or '-'}")
+
+    if isinstance(gif_writer, BudgetedGifWriter) and gif_writer.settings:
+        print(gif_writer.report())
+    if gif_writer.frame_count > 0:
+        print(f"GIF criado com sucesso! ({gif_writer.frame_count} frames de {gif_writer.source_frame_count} renderizados, duração total: {gif_writer.total_duration/1000:.1f}s)")
     else:
-        print("Nenhum frame encontrado para criar GIF")
+        print("Nenhum frame gerado para criar GIF")
     # image = gifos.utils.upload_imgbb("output.gif", 129600)  # 1.5 days expiration
-    
+    return gif_writer.frame_count > 0
+
+
+def render_text_outputs(year_now, time_now, git_user_details, formats):
+    """Grava o output.svg e/ou o output.cast a partir das mesmas cenas do GIF"""
+    from cell_terminal import FontMetrics
+    from text_backend import AsciicastWriter, SvgWriter, TextFanout, render_text_scenes
+
+    # a idade e a cena do boot usam o gifos; sem o GIF nesta execução, o
+    # output.gif já commitado não pode ser apagado pelo import
+    preload_gifos()
+    user_details_lines = user_details_text(git_user_details, calc_user_age())
+    writers = []
+    if "svg" in formats:
+        writers.append(SvgWriter(OUTPUT_FILES["svg"], 750, 500))
+    if "cast" in formats:
+        # grade da fonte bitmap, a mesma do terminal no início de cada cena
+        metrics = FontMetrics(FONT_FILE_BITMAP, 15, 4)
+        writers.append(AsciicastWriter(OUTPUT_FILES["cast"], 750, 500, 15, 15,
+                                       metrics.width, metrics.cell_height))
+    sink = TextFanout(*writers)
+    render_text_scenes(build_scenes(year_now, time_now, user_details_lines), new_text_terminal, sink)
+    sink.close()
+    for writer in writers:
+        size = os.path.getsize(writer.file_name) if writer.frame_count else 0
+        print(f"{writer.file_name} criado ({writer.frame_count} frames, {size / 1024:.1f} KB)")
+    return all(writer.frame_count > 0 for writer in writers)
+
+
+def readme_text(time_now, about_me_section=None, reflexao_diaria_section=None, animation="output.gif",
+                username=USERNAME):
+    """Conteúdo do README.md, gerando as seções dinâmicas que não forem passadas"""
     # Gerar seções dinâmicas
-    about_me_section = generate_about_me_section()
-    reflexao_diaria_section = generate_reflexao_diaria_section()
+    if about_me_section is None:
+        about_me_section = generate_about_me_section()
+    if reflexao_diaria_section is None:
+        reflexao_diaria_section = generate_reflexao_diaria_section()
     
     # GitHub Streak URL
-    github_streak_url = "https://streak-stats.demolab.com?user=dudupys"
+    github_streak_url = f"https://streak-stats.demolab.com?user={username}"
     
     readme_file_content = f"""<div align="justify">
 
@@ -294,9 +527,9 @@ def main():
 ---
 
 <picture>
-    <source media="(prefers-color-scheme: dark)" srcset="./output.gif">
-    <source media="(prefers-color-scheme: light)" srcset="./output.gif">
-    <img alt="GIFOS" src="output.gif">
+    <source media="(prefers-color-scheme: dark)" srcset="./{animation}">
+    <source media="(prefers-color-scheme: light)" srcset="./{animation}">
+    <img alt="GIFOS" src="{animation}">
 </picture>
 
 ---
@@ -324,9 +557,95 @@ def main():
 </div>
 
 <!-- Image deletion URL: NONE -->"""
-    with open("README.md", "w", encoding='utf-8') as f:
-        f.write(readme_file_content)
-        print("INFO: README.md file generated")
+    return readme_file_content
+
+
+def write_readme(time_now, about_me_section=None, reflexao_diaria_section=None, animation="output.gif",
+                 username=USERNAME, path="README.md"):
+    """Grava o README.md, gerando as seções dinâmicas que não forem passadas"""
+    readme_file_content = readme_text(time_now, about_me_section, reflexao_diaria_section, animation, username)
+    with run_profile.span("readme.write", bytes=len(readme_file_content.encode('utf-8'))):
+        with open(path, "w", encoding='utf-8') as f:
+            f.write(readme_file_content)
+            print(f"INFO: {path} file generated")
+
+
+def now_strings(timezone=TIMEZONE):
+    """Ano e horário ("Last login" e rodapé do README) no fuso do usuário"""
+    now = datetime.now(ZoneInfo(timezone))
+    return now.strftime("%Y"), now.strftime("%a %b %d %I:%M:%S %p %Z %Y")
+
+
+def add_output_inputs(manifest, git_user_details, about_me_section, reflexao_diaria_section,
+                      year_now, time_now, fingerprint, formats):
+    """Registra no manifesto tudo o que aparece no GIF e no README"""
+    manifest.add("stats", stats_summary(git_user_details))
+    manifest.add("about_me", about_me_section)
+    manifest.add("reflexao_diaria", reflexao_diaria_section)
+    manifest.add("year", year_now)
+    manifest.add("date", datetime.today().date())  # o Uptime do GIF muda a cada dia
+    manifest.add("render", fingerprint)
+    manifest.add("encoder", Path(__file__).with_name("gif_writer.py").read_bytes())
+    manifest.add("text_backend", Path(__file__).with_name("text_backend.py").read_bytes())
+    manifest.add("formats", formats)
+    manifest.add("gif_budget", [os.getenv("GIF_MAX_BYTES", ""), os.getenv("GIF_MAX_FRAMES", "")])
+    manifest.add("time", time_now, timestamp=True)
+
+
+def generate_outputs():
+    """Gera o GIF e o README (ou só o README), pulando o que não mudou"""
+    year_now, time_now = now_strings()
+
+    formats = output_formats()
+    animation = OUTPUT_FILES["svg" if "svg" in formats and "gif" not in formats else "gif"]
+
+    if readme_only_mode():
+        print("Modo README-only: GIF e API do GitHub ignorados")
+        write_readme(time_now, animation=animation)
+        return
+
+    with run_profile.span("fetch_stats"):
+        git_user_details = fetch_user_details()
+    with run_profile.span("sections"):
+        about_me_section = generate_about_me_section()
+        reflexao_diaria_section = generate_reflexao_diaria_section()
+    with run_profile.span("render_fingerprint"):
+        fingerprint = render_fingerprint_for_gif()
+
+    # Se nada que aparece no GIF ou no README mudou, as saídas atuais continuam valendo
+    manifest = OutputManifest(outputs=["README.md"] + [OUTPUT_FILES[fmt] for fmt in formats])
+    add_output_inputs(manifest, git_user_details, about_me_section, reflexao_diaria_section,
+                      year_now, time_now, fingerprint, formats)
+    if manifest.is_current() and os.getenv("FORCE_RENDER", "") in ("", "0"):
+        print("Nada mudou desde a última execução - GIF e README mantidos")
+        run_profile.count("manifest.unchanged")
+        return
+    print(f"Entradas alteradas: {', '.join(manifest.changed()) or '-'}")
+
+    rendered_ok = True
+    if "gif" in formats:
+        with run_profile.span("render_gif"):
+            rendered_ok = render_gif(year_now, time_now, git_user_details, fingerprint)
+    text_formats = [fmt for fmt in formats if fmt != "gif"]
+    if text_formats:
+        with run_profile.span("render_text", formats=",".join(text_formats)):
+            rendered_ok = render_text_outputs(year_now, time_now, git_user_details, text_formats) and rendered_ok
+    write_readme(time_now, about_me_section, reflexao_diaria_section, animation)
+    if rendered_ok:
+        manifest.save()
+
+
+def main():
+    # Perfil da execução (trechos, contadores, memória) em JSON; RUN_PROFILE="" desliga
+    profile_path = os.getenv("RUN_PROFILE", run_profile.DEFAULT_PROFILE_FILE)
+    if profile_path:
+        run_profile.start(profile_path, trace_memory=os.getenv("RUN_PROFILE_MEMORY", "") not in ("", "0"))
+    try:
+        generate_outputs()
+    finally:
+        saved = run_profile.finish()
+        if saved:
+            print(f"Perfil da execução gravado em {saved}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Manifesto das entradas que geraram o README.md e o output.gif
+
+Cada entrada semântica (estatísticas, reflexão, About Me, fontes, esquema de
+cores, roteiro da animação) vira um hash; o hash combinado fica salvo ao lado
+das saídas. Se a próxima execução chegar ao mesmo hash, nada precisa ser
+renderizado nem regravado, e o workflow não gera commit.
+
+Horários (o "Last login" do GIF e o rodapé do README) só contam como mudança
+se MANIFEST_TIMESTAMPS=count; o padrão é ignorá-los.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+MANIFEST_VERSION = 1  # mudar quando a forma de calcular os hashes mudar
+DEFAULT_MANIFEST_FILE = "output.manifest.json"
+DEFAULT_OUTPUTS = ["README.md", "output.gif"]
+TIMESTAMP_RULES = ("ignore", "count")
+
+
+def input_digest(value: Any) -> str:
+    """Hash estável de uma entrada (bytes, texto ou estrutura JSON)"""
+    if not isinstance(value, bytes):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode()
+    return hashlib.sha256(value).hexdigest()
+
+
+def timestamp_rule() -> str:
+    """Regra para horários vinda de MANIFEST_TIMESTAMPS ("ignore" ou "count")"""
+    rule = os.getenv("MANIFEST_TIMESTAMPS", "ignore").strip().lower()
+    return rule if rule in TIMESTAMP_RULES else "ignore"
+
+
+class OutputManifest:
+    """Compara as entradas desta execução com as da última renderização
+
+    Args:
+        path (str): Arquivo JSON do manifesto
+        outputs (list): Saídas que precisam existir para a execução ser pulada
+        rule (str): "ignore" (horários não contam) ou "count"; padrão de MANIFEST_TIMESTAMPS
+
+    Attributes:
+        inputs: Hash de cada entrada registrada com `add`
+        previous: Conteúdo do manifesto salvo, ou {} se não houver
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_FILE, outputs: Optional[Iterable[str]] = None,
+                 rule: Optional[str] = None):
+        self.path = Path(path)
+        self.outputs = list(DEFAULT_OUTPUTS if outputs is None else outputs)
+        self.rule = rule or timestamp_rule()
+        self.inputs: Dict[str, str] = {}
+        self.previous = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data
+
+    def add(self, name: str, value: Any, timestamp: bool = False) -> None:
+        """Registra uma entrada; horários (`timestamp=True`) só contam se a regra for "count" """
+        if timestamp and self.rule != "count":
+            return
+        self.inputs[name] = input_digest(value)
+
+    def digest(self) -> str:
+        """Hash combinado de todas as entradas registradas"""
+        return input_digest({"version": MANIFEST_VERSION, "inputs": self.inputs})
+
+    def changed(self) -> List[str]:
+        """Nomes das entradas que mudaram (ou surgiram/sumiram) desde o manifesto salvo"""
+        previous = self.previous.get("inputs", {})
+        return sorted(name for name in set(previous) | set(self.inputs)
+                      if previous.get(name) != self.inputs.get(name))
+
+    def is_current(self) -> bool:
+        """True se as entradas são as mesmas da última vez e as saídas ainda existem"""
+        return (self.previous.get("hash") == self.digest()
+                and all(os.path.exists(output) for output in self.outputs))
+
+    def save(self) -> None:
+        """Grava o manifesto (de forma atômica) depois que as saídas foram geradas"""
+        data = {"version": MANIFEST_VERSION, "hash": self.digest(),
+                "timestamps": self.rule, "inputs": dict(sorted(self.inputs.items()))}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+        self.previous = data
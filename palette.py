@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Módulo para montar a paleta global do GIF a partir do esquema de cores do gifos"""
+
+import importlib.util
+import os
+import tomllib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+# Mesmas cores padrão que o gifos usa quando o esquema não define uma cor (yoru)
+DEFAULT_COLORS = {
+    "default_colors": {"fg": "#edeff0", "bg": "#0c0e0f"},
+    "normal_colors": {
+        "black": "#232526", "red": "#df5b61", "green": "#78b892", "yellow": "#de8f78",
+        "blue": "#6791c9", "magenta": "#bc83e3", "cyan": "#67afc1", "white": "#e4e6e7",
+    },
+    "bright_colors": {
+        "black": "#2c2e2f", "red": "#e8646a", "green": "#81c19b", "yellow": "#e79881",
+        "blue": "#709ad2", "magenta": "#c58cec", "cyan": "#70b8ca", "white": "#f2f4f5",
+    },
+}
+COLOR_NAMES = ["black", "red", "green", "yellow", "blue", "magenta", "cyan", "white"]
+
+TRANSPARENT_INDEX = 255  # reservado para pixels transparentes no GIF
+RAMP_STEPS = 6  # tons intermediários entre cada cor de texto e o fundo (anti-aliasing)
+
+
+def _load_toml_colors() -> Dict[str, dict]:
+    """Lê o ansi_escape_colors.toml do gifos (e o do usuário, se existir)
+
+    O arquivo é lido diretamente porque importar o gifos apaga a pasta de
+    frames e o output.gif.
+    """
+    config = {}
+    spec = importlib.util.find_spec("gifos")
+    if spec and spec.submodule_search_locations:
+        def_config_file = Path(spec.submodule_search_locations[0]) / "config" / "ansi_escape_colors.toml"
+        if def_config_file.exists():
+            with def_config_file.open(mode="rb") as def_fp:
+                config = tomllib.load(def_fp)
+    user_config_file = Path.home() / ".config" / "gifos" / "ansi_escape_colors.toml"
+    if user_config_file.exists():
+        with user_config_file.open(mode="rb") as user_fp:
+            config.update(tomllib.load(user_fp))
+    return config
+
+
+def load_color_scheme(scheme: Optional[str] = None) -> Dict[str, str]:
+    """Obtém as cores ANSI do esquema ativo (GIFOS_GENERAL_COLOR_SCHEME)
+
+    Args:
+        scheme (str): Nome do esquema; por padrão o da variável de ambiente
+
+    Returns:
+        dict: Código ANSI (ex.: "31", "49", "100") -> cor em hexadecimal
+    """
+    scheme = scheme or os.getenv("GIFOS_GENERAL_COLOR_SCHEME", "yoru")
+    scheme_colors = _load_toml_colors().get(scheme, {})
+
+    def get_color(group: str, name: str) -> str:
+        colors = scheme_colors.get(group)
+        default = DEFAULT_COLORS[group][name]
+        return colors.get(name, default) if isinstance(colors, dict) else default
+
+    codes = {"39": get_color("default_colors", "fg"), "49": get_color("default_colors", "bg")}
+    for i, name in enumerate(COLOR_NAMES):
+        codes[str(30 + i)] = codes[str(40 + i)] = get_color("normal_colors", name)
+        codes[str(90 + i)] = codes[str(100 + i)] = get_color("bright_colors", name)
+    return codes
+
+
+def _hex_to_rgb(color: str) -> tuple:
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+class ColorPalette:
+    """Paleta global de até 255 cores usada por todos os frames do GIF
+
+    As primeiras entradas são as cores ANSI do esquema (o fundo padrão é o
+    índice 0); depois vêm rampas de cada cor de texto em direção ao fundo,
+    que cobrem o anti-aliasing das fontes TrueType. O índice 255 fica livre
+    para transparência.
+    """
+
+    def __init__(self, colors: List[str], background: str, ramp_steps: int = RAMP_STEPS):
+        entries = [_hex_to_rgb(background)]
+        for color in colors:
+            rgb = _hex_to_rgb(color)
+            if rgb not in entries:
+                entries.append(rgb)
+        bg = np.array(entries[0], dtype=float)
+        for rgb in list(entries[1:]):
+            for step in range(1, ramp_steps + 1):
+                mixed = tuple(int(round(c)) for c in bg + (np.array(rgb) - bg) * step / (ramp_steps + 1))
+                if mixed not in entries and len(entries) < TRANSPARENT_INDEX:
+                    entries.append(mixed)
+        self.colors = np.array(entries, dtype=np.uint8)
+        # Tabela de consulta de 2^24 entradas (16 MB): cor RGB -> índice. O valor
+        # TRANSPARENT_INDEX marca cores ainda não resolvidas, calculadas sob demanda
+        self._lookup = np.full(1 << 24, TRANSPARENT_INDEX, dtype=np.uint8)
+        self._lookup[self._keys(self.colors)] = np.arange(len(entries), dtype=np.uint8)
+
+    @classmethod
+    def from_color_scheme(cls, scheme: Optional[str] = None) -> 'ColorPalette':
+        """Monta a paleta a partir do esquema de cores ativo"""
+        codes = load_color_scheme(scheme)
+        return cls(list(codes.values()), codes["49"])
+
+    @staticmethod
+    def _keys(rgb: np.ndarray) -> np.ndarray:
+        rgb = rgb.reshape(-1, 3).astype(np.uint32)
+        return (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+
+    def to_bytes(self) -> bytes:
+        """Tabela de cores global (256 entradas RGB) para o cabeçalho do GIF"""
+        table = np.zeros((256, 3), dtype=np.uint8)
+        table[:len(self.colors)] = self.colors
+        return table.tobytes()
+
+    def map_rgb(self, rgb: np.ndarray) -> np.ndarray:
+        """Converte um array RGB (altura, largura, 3) em índices da paleta
+
+        Cores exatas do esquema são resolvidas pela tabela de consulta; as
+        demais (bordas suavizadas das fontes TTF) recebem a cor mais próxima,
+        calculada de forma vetorizada e memorizada na tabela.
+        """
+        keys = self._keys(rgb)
+        indices = self._lookup[keys]
+        missing = indices == TRANSPARENT_INDEX
+        if missing.any():
+            unknown = np.unique(keys[missing])
+            unknown_rgb = np.stack([(unknown >> 16) & 255, (unknown >> 8) & 255, unknown & 255], axis=1)
+            distances = ((unknown_rgb[:, None, :].astype(np.int32) - self.colors[None, :, :]) ** 2).sum(axis=2)
+            self._lookup[unknown] = distances.argmin(axis=1).astype(np.uint8)
+            indices[missing] = self._lookup[keys[missing]]
+        return indices.reshape(rgb.shape[:2])
+
+    def map_image(self, image: Image.Image) -> np.ndarray:
+        """Converte uma imagem do Pillow em índices da paleta"""
+        return self.map_rgb(np.asarray(image.convert("RGB")))
@@ -5,6 +5,29 @@ Módulo para gerar reflexão diária de forma determinística
 import os
 from datetime import datetime
 
+from corpus_index import open_corpus
+
+
+def parse_reflexao(line):
+    """
+    Converte uma linha "texto|autor" em reflexão
+    
+    Args:
+        line (str): Linha do arquivo de reflexões
+        
+    Returns:
+        dict: Reflexão, ou None se a linha não for válida
+    """
+    line = line.strip()
+    if line and '|' in line:
+        parts = line.split('|', 1)  # Divide apenas na primeira ocorrência
+        if len(parts) == 2:
+            return {
+                'texto': parts[0].strip(),
+                'autor': parts[1].strip() if parts[1].strip() else None
+            }
+    return None
+
 
 def load_reflexoes(file_path="reflexoes_diarias.txt"):
     """
@@ -25,40 +48,42 @@ def load_reflexoes(file_path="reflexoes_diarias.txt"):
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
             for line in file:
-                line = line.strip()
-                if line and '|' in line:
-                    parts = line.split('|', 1)  # Divide apenas na primeira ocorrência
-                    if len(parts) == 2:
-                        reflexao = {
-                            'texto': parts[0].strip(),
-                            'autor': parts[1].strip() if parts[1].strip() else None
-                        }
-                        reflexoes.append(reflexao)
+                reflexao = parse_reflexao(line)
+                if reflexao:
+                    reflexoes.append(reflexao)
     except Exception as e:
         print(f"Erro ao carregar reflexões: {e}")
     
     return reflexoes
 
 
-def get_daily_reflexao():
+def get_daily_reflexao(file_path="reflexoes_diarias.txt"):
     """
     Seleciona a reflexão do dia de forma determinística
     
+    Lê só a reflexão do dia, pelo índice do arquivo (ver corpus_index), sem
+    carregar as demais.
+    
     Returns:
         dict: Reflexão do dia ou None se não houver reflexões
     """
-    reflexoes = load_reflexoes()
+    corpus = open_corpus(file_path, parse_reflexao)
     
-    if not reflexoes:
+    if corpus is None:
+        print(f"Arquivo de reflexões não encontrado: {file_path}")
         return None
     
-    # Calcula o dia do ano (1-366)
-    current_date = datetime.now()
-    day_of_year = current_date.timetuple().tm_yday
-    
-    # Seleciona reflexão de forma determinística
-    reflexao_index = day_of_year % len(reflexoes)
-    selected_reflexao = reflexoes[reflexao_index]
+    with corpus:
+        if not len(corpus):
+            return None
+        
+        # Calcula o dia do ano (1-366)
+        current_date = datetime.now()
+        day_of_year = current_date.timetuple().tm_yday
+        
+        # Seleciona reflexão de forma determinística
+        reflexao_index = day_of_year % len(corpus)
+        selected_reflexao = corpus[reflexao_index]
     
     return selected_reflexao
 
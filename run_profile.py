@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Perfil de execução: trechos cronometrados, contadores e picos de memória em JSON
+
+Os módulos marcam as fases com `span("nome", **atributos)` e contam eventos
+frequentes (um frame codificado, um frame repetido) com `add`/`count`, que só
+somam totais em vez de guardar um trecho por evento. Sem um perfil ativo
+(`start` não foi chamado) tudo isso não faz nada.
+
+Uso:
+    profile = run_profile.start("run-profile.json", trace_memory=True)
+    with run_profile.span("render_gif"):
+        ...
+    run_profile.finish()
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+PROFILE_VERSION = 1
+DEFAULT_PROFILE_FILE = ".cache/run-profile.json"
+
+_MB = 2 ** 20
+
+
+class _OpenSpan:
+    def __init__(self, record: Dict[str, Any]):
+        self.record = record
+        self.peak = 0
+
+
+class RunProfile:
+    """Trechos e totais de uma execução
+
+    Attributes:
+        path: Onde o JSON é gravado por `save`
+        trace_memory: Se o tracemalloc mede o pico de memória de cada trecho
+            (só os trechos da thread principal; os das threads de rede não têm pico)
+        spans: Trechos concluídos: nome, início e duração (s, relativos ao início
+            do perfil), trecho pai, thread e atributos
+        aggregates: {nome: {"count", "seconds"}} dos eventos somados com `add`
+        counters: {nome: valor} dos eventos contados com `count`
+    """
+
+    def __init__(self, path: str = DEFAULT_PROFILE_FILE, trace_memory: bool = False):
+        self.path = path
+        self.trace_memory = trace_memory
+        self.started_at = datetime.now(timezone.utc)
+        self.origin = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.aggregates: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_id = 0
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _stack(self) -> List[_OpenSpan]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _measures_memory(self) -> bool:
+        return (self.trace_memory and tracemalloc.is_tracing()
+                and threading.current_thread() is threading.main_thread())
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """Cronometra o bloco; o dicionário devolvido aceita atributos extras"""
+        stack = self._stack()
+        with self._lock:
+            self._next_id += 1
+            span_id = self._next_id
+        record: Dict[str, Any] = {
+            "id": span_id,
+            "name": name,
+            "parent": stack[-1].record["id"] if stack else None,
+            "thread": threading.current_thread().name,
+            "attrs": attrs,
+        }
+        opened = _OpenSpan(record)
+        memory = self._measures_memory()
+        if memory:
+            # o pico acumulado até aqui pertence ao trecho pai
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(opened)
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            record["start"] = round(start - self.origin, 6)
+            record["duration"] = round(time.perf_counter() - start, 6)
+            stack.pop()
+            if memory:
+                peak = max(opened.peak, tracemalloc.get_traced_memory()[1])
+                record["peak_mb"] = round(peak / _MB, 2)
+                if stack:
+                    stack[-1].peak = max(stack[-1].peak, peak)
+            with self._lock:
+                self.spans.append(record)
+
+    def add(self, name: str, seconds: float, count: int = 1) -> None:
+        """Soma um evento cronometrado frequente (sem criar um trecho por evento)"""
+        with self._lock:
+            total = self.aggregates.setdefault(name, {"count": 0, "seconds": 0.0})
+            total["count"] += count
+            total["seconds"] += seconds
+
+    def count(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, spans: List[Dict[str, Any]], aggregates: Dict[str, Dict[str, float]],
+              counters: Dict[str, float]) -> None:
+        """Incorpora o que foi medido num processo filho (cenas renderizadas em paralelo)
+
+        Os ids criados no filho são renumerados; um pai que não é do filho é um
+        trecho deste processo que estava aberto no fork e é mantido.
+        """
+        with self._lock:
+            ids = {}
+            for record in spans:
+                self._next_id += 1
+                ids[record["id"]] = self._next_id
+            for record in spans:
+                self.spans.append({**record, "id": ids[record["id"]],
+                                   "parent": ids.get(record["parent"], record["parent"])})
+            for name, total in aggregates.items():
+                mine = self.aggregates.setdefault(name, {"count": 0, "seconds": 0.0})
+                mine["count"] += total["count"]
+                mine["seconds"] += total["seconds"]
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "version": PROFILE_VERSION,
+            "started_at": self.started_at.isoformat(),
+            "argv": sys.argv,
+            "total_seconds": round(time.perf_counter() - self.origin, 6),
+            "spans": sorted(self.spans, key=lambda record: record["start"]),
+            "aggregates": {name: {"count": total["count"], "seconds": round(total["seconds"], 6)}
+                           for name, total in sorted(self.aggregates.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+        if self.trace_memory and tracemalloc.is_tracing():
+            data["peak_memory_mb"] = round(max(
+                [tracemalloc.get_traced_memory()[1] / _MB]
+                + [record.get("peak_mb", 0) for record in self.spans]), 2)
+        return data
+
+    def save(self) -> None:
+        """Grava o JSON (de forma atômica)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False, default=str)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+_profile: Optional[RunProfile] = None
+
+
+def start(path: str = DEFAULT_PROFILE_FILE, trace_memory: bool = False) -> RunProfile:
+    """Ativa o perfil global desta execução"""
+    global _profile
+    _profile = RunProfile(path, trace_memory)
+    return _profile
+
+
+def current() -> Optional[RunProfile]:
+    return _profile
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """`RunProfile.span` no perfil ativo; sem perfil só executa o bloco"""
+    if _profile is None:
+        yield attrs
+        return
+    with _profile.span(name, **attrs) as span_attrs:
+        yield span_attrs
+
+
+def add(name: str, seconds: float, count: int = 1) -> None:
+    if _profile is not None:
+        _profile.add(name, seconds, count)
+
+
+def count(name: str, value: float = 1) -> None:
+    if _profile is not None:
+        _profile.count(name, value)
+
+
+def finish() -> Optional[str]:
+    """Grava e desativa o perfil ativo; devolve o caminho do JSON"""
+    global _profile
+    profile, _profile = _profile, None
+    if profile is None:
+        return None
+    profile.save()
+    if profile.trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return profile.path
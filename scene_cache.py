@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Cache em disco dos frames renderizados de cada cena
+
+A maior parte da animação é igual em todas as execuções (BIOS, logo, arte da
+Mona); só o ano, o horário do login e as estatísticas do GitHub mudam. Cada
+cena é guardada num arquivo .npz cujo nome é o hash de tudo que influencia
+seus frames, então só as cenas com entradas novas são renderizadas de novo.
+"""
+
+import hashlib
+import importlib.metadata
+import os
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+CACHE_VERSION = b"2"  # mudar quando o formato dos arquivos mudar
+DEFAULT_CACHE_DIR = ".cache/scenes"
+# Arquivos não usados há mais tempo que isso são apagados (ambientes antigos,
+# temporários de processos interrompidos)
+MAX_AGE_DAYS = 14
+
+# Módulos que definem como os frames são desenhados e codificados em índices
+ENGINE_FILES = ["cell_terminal.py", "frame_sink.py", "palette.py", "scenes.py", "scene_cache.py"]
+
+
+def _file_digest(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def render_fingerprint(files: Iterable[str], palette_bytes: bytes = b"") -> bytes:
+    """Hash do ambiente de renderização comum a todas as cenas
+
+    Args:
+        files (list): Arquivos que afetam os frames (fontes, código das cenas);
+            os módulos do motor (ENGINE_FILES) são incluídos automaticamente
+        palette_bytes (bytes): Paleta global (`ColorPalette.to_bytes()`), que
+            muda com o esquema de cores
+
+    Returns:
+        bytes: Digest SHA-256
+    """
+    here = Path(__file__).parent
+    digest = hashlib.sha256(CACHE_VERSION)
+    for path in [*files, *(str(here / name) for name in ENGINE_FILES)]:
+        digest.update(_file_digest(path) if os.path.exists(path) else b"missing")
+    digest.update(palette_bytes)
+    # configurações do gifos (fps, cursor...) e o motor escolhido
+    for name in sorted(os.environ):
+        if name.startswith("GIFOS_GENERAL_") or name == "TERMINAL_ENGINE":
+            digest.update(f"{name}={os.environ[name]}".encode())
+    try:
+        digest.update(importlib.metadata.version("github-readme-terminal").encode())
+    except importlib.metadata.PackageNotFoundError:
+        pass
+    return digest.digest()
+
+
+class SceneCache:
+    """Guarda e recupera os frames (`SceneFrames`) de cada cena
+
+    Uma versão nova de uma cena substitui só as versões com o mesmo
+    `fingerprint`: no modo batch, cada conjunto de fontes (e o main.py) guarda
+    a sua. O resto sai por idade (MAX_AGE_DAYS sem uso).
+
+    Attributes:
+        directory: Pasta dos arquivos `<cena>-<ambiente>-<hash>.npz`
+        fingerprint: Hash do ambiente de renderização (ver `render_fingerprint`)
+        hits / misses: Nomes das cenas reaproveitadas / renderizadas nesta execução
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, fingerprint: bytes = b""):
+        self.directory = Path(directory)
+        self.fingerprint = fingerprint
+        self.hits: List[str] = []
+        self.misses: List[str] = []
+
+    def key(self, scene) -> str:
+        """Hash das entradas da cena: nome (semente do random), argumentos e ambiente"""
+        digest = hashlib.sha256(self.fingerprint)
+        digest.update(scene.name.encode())
+        digest.update(repr(sorted(scene.inputs.items())).encode())
+        return digest.hexdigest()[:32]
+
+    def _prefix(self, scene) -> str:
+        """Início do nome dos arquivos da cena neste ambiente de renderização"""
+        return f"{scene.name}-{hashlib.sha256(self.fingerprint).hexdigest()[:8]}-"
+
+    def _path(self, scene) -> Path:
+        return self.directory / f"{self._prefix(scene)}{self.key(scene)}.npz"
+
+    def load(self, scene) -> Optional[list]:
+        """Frames da cena guardados em disco, ou None se ainda não existem"""
+        path = self._path(scene)
+        try:
+            with np.load(path) as data:
+                # retângulos desconhecidos são gravados como (-1, -1, -1, -1)
+                dirty = [None if rect[0] < 0 else tuple(rect) for rect in data["dirty"].tolist()]
+                frames = list(zip(data["frames"], data["counts"].tolist(), dirty))
+        except (OSError, KeyError, ValueError):
+            self.misses.append(scene.name)
+            return None
+        try:
+            os.utime(path)  # marca o uso (ver `prune`)
+        except OSError:
+            pass
+        self.hits.append(scene.name)
+        return frames
+
+    def store(self, scene, frames: list) -> None:
+        """Grava os frames da cena e apaga versões antigas da mesma cena e ambiente"""
+        if not frames:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(scene)
+        # nome temporário por processo: no modo batch, vários processos gravam no mesmo cache
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            frames=np.stack([indices for indices, _, _ in frames]),
+            counts=np.array([count for _, count, _ in frames], dtype=np.int64),
+            dirty=np.array([(-1,) * 4 if dirty is None else dirty for _, _, dirty in frames], dtype=np.int32),
+        )
+        os.replace(tmp_path, path)
+        # `*.tmp.npz` são gravações em andamento de outros processos
+        for old in self.directory.glob(f"{self._prefix(scene)}*.npz"):
+            if old != path and not old.name.endswith(".tmp.npz"):
+                old.unlink(missing_ok=True)
+        self.prune()
+
+    def prune(self, max_age_days: float = MAX_AGE_DAYS) -> None:
+        """Apaga os arquivos que não foram gravados nem lidos nos últimos `max_age_days`"""
+        limit = time.time() - max_age_days * 86400
+        for old in self.directory.glob("*.npz"):
+            try:
+                if old.stat().st_mtime < limit:
+                    old.unlink()
+            except OSError:
+                pass
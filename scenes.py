@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Módulo para renderizar as cenas da animação em processos separados"""
+
+import hashlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import run_profile
+from palette import ColorPalette
+
+# Frame de uma cena: (índices da paleta, quantas vezes o frame se repete,
+# retângulo (x1, y1, x2, y2) que pode ter mudado desde o frame anterior da cena,
+# ou None se não se sabe)
+SceneFrames = List[Tuple[np.ndarray, int, Optional[Tuple[int, int, int, int]]]]
+
+
+def render_workers_from_env(default: int = 1) -> int:
+    """Processos de renderização de RENDER_WORKERS (0: um por CPU; inválido ou ausente: `default`)"""
+    value = os.getenv("RENDER_WORKERS", "").strip()
+    if not value:
+        return default
+    try:
+        workers = int(value)
+    except ValueError:
+        print(f"RENDER_WORKERS inválido ignorado: {value!r}")
+        return default
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+class Scene:
+    """Trecho independente da animação
+
+    Uma cena começa sempre de um terminal limpo (como depois de um
+    `clear_frame()`), então pode ser renderizada sozinha em qualquer processo.
+
+    Attributes:
+        name: Nome da cena, também usado como semente do `random`, para que o
+            ritmo de digitação seja o mesmo na execução serial e na paralela
+        render: Função `render(t, **inputs)` que desenha a cena no terminal `t`
+        inputs: Argumentos nomeados passados para `render`
+    """
+
+    def __init__(self, name: str, render: Callable[..., None], **inputs: Any):
+        self.name = name
+        self.render = render
+        self.inputs: Dict[str, Any] = inputs
+
+
+class FrameRecorder:
+    """Sink que guarda os frames de uma cena como índices da paleta global
+
+    Frames consecutivos idênticos são guardados uma única vez, com a contagem
+    de repetições, para que o resultado seja pequeno o bastante para voltar
+    do processo filho. Quando o terminal informa o retângulo alterado
+    (`dirty`), só ele é comparado com o frame anterior.
+    """
+
+    def __init__(self, palette: ColorPalette):
+        self.palette = palette
+        self.frames: SceneFrames = []
+        self._last_digest: Optional[bytes] = None
+
+    def add_frame(self, frame, count: int = 1, dirty: Optional[Tuple[int, int, int, int]] = None) -> None:
+        if isinstance(frame, np.ndarray):
+            # frames do CellTerminal já chegam como índices da paleta (num buffer reutilizado)
+            self._last_digest = None
+            if self.frames and self._same_as_last(frame, dirty):
+                self._repeat_last(count)
+                return
+            self.frames.append((frame.copy(), count, dirty))
+            return
+        if frame.mode != "RGB":
+            frame = frame.convert("RGB")
+        digest = hashlib.sha256(frame.tobytes()).digest()
+        if digest == self._last_digest:
+            self._repeat_last(count)
+            return
+        self._last_digest = digest
+        self.frames.append((self.palette.map_image(frame), count, None))
+
+    def _same_as_last(self, frame: np.ndarray, dirty) -> bool:
+        last = self.frames[-1][0]
+        if dirty is None:
+            return np.array_equal(frame, last)
+        x1, y1, x2, y2 = dirty
+        return np.array_equal(frame[y1:y2, x1:x2], last[y1:y2, x1:x2])
+
+    def _repeat_last(self, count: int) -> None:
+        run_profile.count("scene.frames_deduplicated", count)
+        indices, repeat, dirty = self.frames[-1]
+        self.frames[-1] = (indices, repeat + count, dirty)
+
+
+def render_scene(scene: Scene, make_terminal: Callable) -> SceneFrames:
+    """Renderiza uma cena num terminal novo e devolve os frames gravados"""
+    random.seed(scene.name)
+    with run_profile.span("scene", scene=scene.name) as attrs:
+        recorder = FrameRecorder(ColorPalette.from_color_scheme())
+        t = make_terminal(recorder)
+        scene.render(t, **scene.inputs)
+        attrs.update(frames=len(recorder.frames), source_frames=sum(frame[1] for frame in recorder.frames))
+    return recorder.frames
+
+
+def _render_scene_in_worker(scene: Scene, make_terminal: Callable):
+    """`render_scene` num processo filho, devolvendo também o que o perfil mediu nele"""
+    profile = run_profile.current()
+    if profile is None:
+        return render_scene(scene, make_terminal), None
+    # o fork copiou o que o processo pai já tinha medido
+    profile.spans, profile.aggregates, profile.counters = [], {}, {}
+    frames = render_scene(scene, make_terminal)
+    return frames, (profile.spans, profile.aggregates, profile.counters)
+
+
+def render_scenes(scenes: List[Scene], make_terminal: Callable, sink,
+                  workers: Optional[int] = None, cache=None) -> None:
+    """Renderiza as cenas (em paralelo, se possível) e envia os frames em ordem ao `sink`
+
+    Args:
+        scenes (list): Cenas na ordem em que aparecem na animação
+        make_terminal (callable): Cria o terminal de uma cena a partir de um sink
+        sink: Destino final dos frames (ex.: `GifWriter`)
+        workers (int): Número de processos; por padrão RENDER_WORKERS ou 1.
+            Com 1 as cenas são renderizadas neste processo: com o CellTerminal
+            e o cache de cenas a renderização inteira leva ~0,1s, menos que
+            criar o pool com fork e mandar os frames de volta por pickle
+        cache (SceneCache): Se informado, cenas já renderizadas com as mesmas
+            entradas são lidas do disco e as novas são gravadas nele
+    """
+    results: Dict[int, SceneFrames] = {}
+    if cache is not None:
+        for i, scene in enumerate(scenes):
+            with run_profile.span("scene_cache.load", scene=scene.name) as attrs:
+                frames = cache.load(scene)
+                attrs["hit"] = frames is not None
+            if frames is not None:
+                results[i] = frames
+    pending = [i for i in range(len(scenes)) if i not in results]
+
+    if workers is None:
+        workers = render_workers_from_env()
+    workers = min(workers, len(pending))
+
+    def emit(frames: SceneFrames) -> None:
+        for indices, count, dirty in frames:
+            sink.add_frame(indices, count, dirty)
+
+    def finish(i: int, frames: SceneFrames) -> SceneFrames:
+        if cache is not None:
+            with run_profile.span("scene_cache.store", scene=scenes[i].name):
+                cache.store(scenes[i], frames)
+        return frames
+
+    def collect(i: int, future) -> SceneFrames:
+        frames, measured = future.result()
+        profile = run_profile.current()
+        if measured is not None and profile is not None:
+            profile.merge(*measured)
+        return finish(i, frames)
+
+    if workers <= 1:
+        for i, scene in enumerate(scenes):
+            emit(results[i] if i in results else finish(i, render_scene(scene, make_terminal)))
+        return
+
+    # "fork" reaproveita o gifos e as fontes já carregados no processo pai
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("fork")) as executor:
+        futures = {i: executor.submit(_render_scene_in_worker, scenes[i], make_terminal) for i in pending}
+        for i in range(len(scenes)):
+            emit(results[i] if i in results else collect(i, futures[i]))
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""Modo serviço: servidor HTTP local que entrega o GIF e o README direto da memória
+
+O processo fica de pé com o gifos, as fontes (atlas de glifos) e os frames das
+cenas já carregados. Uma thread refaz o perfil a cada intervalo; uma requisição
+que encontra a versão atual vencida também pede uma atualização, mas é
+respondida na hora com a versão que está na memória. Pedidos que chegam
+durante uma atualização esperam por ela em vez de começar outra.
+
+Como no main.py, o GIF só é renderizado de novo quando algo que aparece nele
+ou no README mudou (ver `OutputManifest`); senão as respostas, e os ETags,
+continuam os mesmos.
+
+Uso:
+    python service.py [--host 127.0.0.1] [--port 8080] [--interval 3600]
+
+Rotas:
+    GET  /output.gif   o GIF atual
+    GET  /README.md    o README atual
+    GET  /status       JSON com o horário da versão atual e os contadores
+    POST /refresh      atualiza agora e responde quando a atualização terminar
+
+As respostas têm ETag (If-None-Match devolve 304) e Cache-Control com o tempo
+até a próxima atualização. O intervalo também pode vir de SERVICE_INTERVAL;
+0 desliga a thread e cada requisição pede uma atualização. As estatísticas
+usam GITHUB_TOKEN e uma sessão HTTP que dura o serviço todo.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import main
+import run_profile
+from output_manifest import OutputManifest
+from reflexao_diaria_generator import generate_reflexao_diaria_section
+from scene_cache import DEFAULT_CACHE_DIR, SceneCache
+
+DEFAULT_INTERVAL = 3600
+DEFAULT_WORK_DIR = ".cache/service"
+
+CONTENT_TYPES = {"/output.gif": "image/gif", "/README.md": "text/markdown; charset=utf-8"}
+
+
+class Snapshot:
+    """Uma versão gerada do perfil, servida sem ser copiada
+
+    Attributes:
+        files: {rota: bytes} do GIF e do README
+        etags: {rota: ETag} (hash do conteúdo)
+        digest: Hash das entradas (ver `main.add_output_inputs`)
+        built_at: time.time() da geração
+    """
+
+    def __init__(self, gif: bytes, readme: bytes, digest: str):
+        self.files = {"/output.gif": gif, "/README.md": readme}
+        self.etags = {path: f'"{hashlib.sha256(body).hexdigest()[:32]}"' for path, body in self.files.items()}
+        self.digest = digest
+        self.built_at = time.time()
+
+
+class MemorySceneCache(SceneCache):
+    """Cache de cenas na memória, com o cache em disco (SCENE_CACHE_DIR) por trás
+
+    Guarda só a última versão de cada cena: as que não mudam (BIOS, boot) são
+    reaproveitadas em toda atualização; o login (horário) e o fetch
+    (estatísticas) trocam de versão.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, fingerprint: bytes = b""):
+        super().__init__(directory or DEFAULT_CACHE_DIR, fingerprint)
+        self.persist = bool(directory)  # SCENE_CACHE_DIR vazio: só a memória
+        self._frames: Dict[str, Tuple[str, list]] = {}
+
+    def load(self, scene) -> Optional[list]:
+        key, frames = self._frames.get(scene.name, (None, None))
+        if key == self.key(scene):
+            self.hits.append(scene.name)
+            return frames
+        if not self.persist:
+            self.misses.append(scene.name)
+            return None
+        frames = super().load(scene)
+        if frames is not None:
+            self._frames[scene.name] = (self.key(scene), frames)
+        return frames
+
+    def store(self, scene, frames: list) -> None:
+        self._frames[scene.name] = (self.key(scene), frames)
+        if self.persist:
+            super().store(scene, frames)
+
+
+class ProfileService:
+    """Mantém a versão atual do perfil na memória e a atualiza em segundo plano
+
+    Args:
+        interval (float): Segundos entre atualizações; 0 atualiza a cada requisição
+        token (str): Token do GitHub (padrão GITHUB_TOKEN)
+        work_dir (str): Pasta onde o GIF é gravado antes de ser lido para a memória
+
+    Attributes:
+        builds: Atualizações concluídas
+        renders: Quantas delas renderizaram o GIF (as demais não tinham mudanças)
+        coalesced: Pedidos de atualização que aproveitaram uma já em andamento
+        failures: Atualizações que falharam (a versão anterior continua no ar)
+        checked_at / failed_at: Fim da última atualização concluída / que falhou;
+            depois de uma falha a próxima tentativa espera `interval`, como
+            depois de um sucesso, para não buscar no GitHub a cada requisição
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, token: Optional[str] = None,
+                 work_dir: str = DEFAULT_WORK_DIR):
+        self.interval = interval
+        self.token = os.getenv("GITHUB_TOKEN") if token is None else token
+        self.work_dir = Path(work_dir)
+        self.builds = 0
+        self.renders = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.checked_at = 0.0
+        self.failed_at = 0.0
+        self._snapshot: Optional[Snapshot] = None
+        self._pending: Optional[Future] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        # uma atualização por vez; é nesta thread que o gifos e as fontes são usados
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="service-build")
+        self._timer: Optional[threading.Thread] = None
+        self._session = None
+        self._rate_limiter = None
+        self._scene_cache = MemorySceneCache(os.getenv("SCENE_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+    def start(self) -> 'ProfileService':
+        """Carrega o gifos, pede a primeira versão e inicia a thread de atualização"""
+        from github_stats import RateLimiter, shared_session
+
+        main.preload_gifos()
+        self._session = shared_session()
+        self._rate_limiter = RateLimiter()
+        self.refresh()
+        if self.interval > 0:
+            self._timer = threading.Thread(target=self._refresh_periodically, daemon=True)
+            self._timer.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._executor.shutdown(wait=True)
+        if self._session is not None:
+            self._session.close()
+
+    def _refresh_periodically(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        return self._snapshot
+
+    def _attempted_at(self) -> float:
+        return max(self.checked_at, self.failed_at)
+
+    def is_stale(self) -> bool:
+        return time.time() - self._attempted_at() >= self.interval
+
+    def max_age(self) -> int:
+        """Segundos até a próxima atualização, para o Cache-Control"""
+        return max(int(self._attempted_at() + self.interval - time.time()), 0)
+
+    def refresh(self) -> Future:
+        """Pede uma atualização; se já houver uma em andamento, devolve a mesma"""
+        with self._lock:
+            if self._pending is not None and not self._pending.done():
+                self.coalesced += 1
+                return self._pending
+            self._pending = self._executor.submit(self._refresh)
+            return self._pending
+
+    def current(self, timeout: Optional[float] = None) -> Optional[Snapshot]:
+        """Versão para responder agora; só espera se ainda não existir nenhuma
+
+        Uma versão vencida é devolvida assim mesmo, e a atualização fica em segundo plano.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            if self.failed_at and not self.is_stale():
+                return None  # a primeira versão falhou: espera o intervalo antes de tentar de novo
+            try:
+                self.refresh().result(timeout)
+            except Exception:
+                pass
+            return self._snapshot
+        if self.is_stale():
+            self.refresh()
+        return snapshot
+
+    def _refresh(self) -> Snapshot:
+        try:
+            with run_profile.span("service.build") as attrs:
+                snapshot = self.build()
+                attrs["rendered"] = snapshot is not self._snapshot
+        except Exception as e:
+            self.failures += 1
+            self.failed_at = time.time()
+            print(f"Erro ao atualizar o perfil: {type(e).__name__}: {e}")
+            raise
+        if snapshot is not self._snapshot:
+            self.renders += 1
+        self._snapshot = snapshot
+        self.checked_at = time.time()
+        self.builds += 1
+        return snapshot
+
+    def build(self) -> Snapshot:
+        """Busca as entradas e gera uma versão nova, ou devolve a atual se nada mudou"""
+        year_now, time_now = main.now_strings()
+        git_user_details = main.fetch_user_details(main.USERNAME, self.token, session=self._session,
+                                                   rate_limiter=self._rate_limiter)
+        about_me_section = main.generate_about_me_section()
+        reflexao_diaria_section = generate_reflexao_diaria_section()
+        fingerprint = main.render_fingerprint_for_gif()
+
+        # o manifesto só é usado para o hash das entradas; nada é lido nem gravado
+        manifest = OutputManifest(os.devnull, outputs=[])
+        main.add_output_inputs(manifest, git_user_details, about_me_section, reflexao_diaria_section,
+                               year_now, time_now, fingerprint, ["gif"])
+        digest = manifest.digest()
+        if self._snapshot is not None and self._snapshot.digest == digest:
+            return self._snapshot
+
+        gif = self._render_gif(year_now, time_now, git_user_details, fingerprint)
+        readme = main.readme_text(time_now, about_me_section, reflexao_diaria_section)
+        return Snapshot(gif, readme.encode("utf-8"), digest)
+
+    def _render_gif(self, year_now: str, time_now: str, git_user_details, fingerprint: bytes) -> bytes:
+        from gif_writer import gif_writer_for
+        from scenes import render_scenes
+
+        user_details_lines = main.user_details_text(git_user_details, main.calc_user_age())
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        cache = self._scene_cache
+        cache.fingerprint, cache.hits, cache.misses = fingerprint, [], []
+        # workers=1: fazer fork de um servidor com várias threads não é seguro, e as
+        # fontes e as cenas já estão carregadas neste processo
+        with gif_writer_for(str(self.work_dir / "output.gif"), workers=1) as gif_writer:
+            render_scenes(main.build_scenes(year_now, time_now, user_details_lines), main.new_terminal,
+                          gif_writer, workers=1, cache=cache)
+        if gif_writer.frame_count == 0:
+            raise RuntimeError("nenhum frame gerado")
+        print(f"GIF atualizado ({gif_writer.frame_count} frames; cenas reaproveitadas: "
+              f"{', '.join(cache.hits) or '-'})")
+        return Path(gif_writer.file_name).read_bytes()
+
+    def status(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "built_at": snapshot.built_at if snapshot else None,
+            "checked_at": self.checked_at or None,
+            "failed_at": self.failed_at or None,
+            "etags": snapshot.etags if snapshot else {},
+            "builds": self.builds,
+            "renders": self.renders,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "interval": self.interval,
+        }
+
+
+def make_handler(service: ProfileService):
+    """Classe de handler do http.server ligada ao `service`"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/status":
+                return self._send(200, json.dumps(service.status()).encode(), "application/json")
+            if path not in CONTENT_TYPES:
+                return self._send(404, b"Not Found", "text/plain")
+            snapshot = service.current()
+            if snapshot is None:
+                return self._send(503, b"Perfil ainda indisponivel", "text/plain", {"Retry-After": str(service.max_age() or 5)})
+            headers = {"ETag": snapshot.etags[path], "Cache-Control": f"public, max-age={service.max_age()}"}
+            if snapshot.etags[path] in self.headers.get("If-None-Match", ""):
+                return self._send(304, b"", None, headers)
+            self._send(200, snapshot.files[path], CONTENT_TYPES[path], headers)
+
+        def do_POST(self):
+            if self.path.split("?", 1)[0] != "/refresh":
+                return self._send(404, b"Not Found", "text/plain")
+            try:
+                service.refresh().result()
+            except Exception as e:
+                return self._send(500, f"{type(e).__name__}: {e}".encode(), "text/plain")
+            self._send(200, json.dumps(service.status()).encode(), "application/json")
+
+        def _send(self, status: int, body: bytes, content_type: Optional[str],
+                  headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            if content_type:
+                self.send_header("Content-Type", content_type)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        do_HEAD = do_GET
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(service: ProfileService, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    """Servidor HTTP (ainda não iniciado: chamar `serve_forever`) para o `service`"""
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    return server
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--interval", type=float,
+                        default=float(os.getenv("SERVICE_INTERVAL", DEFAULT_INTERVAL)),
+                        help="segundos entre atualizações (0: a cada requisição)")
+    args = parser.parse_args(argv)
+
+    service = ProfileService(args.interval).start()
+    server = serve(service, args.host, args.port)
+    print(f"Servindo em http://{args.host}:{server.server_address[1]} (atualização a cada {args.interval:g}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Testes do modo batch: vários perfis num só processo"""
+
+import importlib.util
+import json
+import os
+
+import pytest
+
+import batch
+from github_stub import GitHubStub, sample_data
+
+GIFOS_SPEC = importlib.util.find_spec("gifos")
+FONT_FILE = (os.path.join(GIFOS_SPEC.submodule_search_locations[0], "fonts", "gohufont-uni-14.pil")
+             if GIFOS_SPEC else "")
+FONTS = {"logo": FONT_FILE, "bitmap": FONT_FILE, "mona": FONT_FILE}
+
+
+def test_stats_are_fetched_over_one_shared_connection(monkeypatch):
+    monkeypatch.setenv("GITHUB_CACHE_DIR", "")
+    # uma requisição por usuário: as conexões contadas são as do reaproveitamento entre usuários
+    monkeypatch.setenv("GITHUB_STATS_BACKEND", "graphql")
+    users = [batch.UserConfig("dudupys"), batch.UserConfig("octo"), batch.UserConfig("hubot")]
+    with GitHubStub(sample_data(num_repos=3)) as stub:
+        monkeypatch.setenv("GITHUB_API_URL", stub.url)
+        details = batch.fetch_all(users, "token", workers=1)
+
+    assert list(details) == ["dudupys", "octo", "hubot"]
+    assert details["dudupys"].total_commits_last_year == 6
+    # usuários que a API não conhece ficam com os dados mock
+    assert details["octo"].total_stargazers == 11
+    # as conexões abertas pela primeira busca são reaproveitadas pelas seguintes
+    assert stub.connections < len(users) < len(stub.requests)
+
+
+def test_invalid_user_lists_are_rejected(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text(json.dumps([{"username": "octo"}, {"username": "Octo"}]))
+    with pytest.raises(ValueError, match="repetidos"):
+        batch.load_users(str(path))
+    with pytest.raises(ValueError, match="fuso"):
+        batch.UserConfig("octo", timezone="Marte/Olympus")
+    with pytest.raises(ValueError, match="campos"):
+        batch.UserConfig.from_dict({"username": "octo", "avatar": "x"})
+
+
+@pytest.mark.skipif(not os.path.exists(FONT_FILE), reason="gifos não instalado")
+def test_each_user_gets_a_gif_and_readme(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SCENE_CACHE_DIR", "")
+    users = [
+        batch.UserConfig("octo", about="Octo text", details={"OS": "Linux"}, fonts=FONTS),
+        batch.UserConfig("hubot", timezone="Asia/Tokyo", birth_date="2008-04-10", fonts=FONTS),
+        batch.UserConfig("mona", fonts=FONTS),
+    ]
+    results = batch.run_batch(users, "profiles", workers=2, token="")
+
+    assert [result["username"] for result in results] == ["octo", "hubot", "mona"]
+    assert all("error" not in result and result["frames"] > 0 for result in results)
+    for user in users:
+        folder = tmp_path / "profiles" / user.username
+        assert (folder / "output.gif").read_bytes().startswith(b"GIF89a")
+        readme = (folder / "README.md").read_text(encoding="utf-8")
+        assert f"{user.username} (@{user.username})" in readme and f"user={user.username}" in readme
+    assert "Octo text" in (tmp_path / "profiles" / "octo" / "README.md").read_text(encoding="utf-8")
+    # as cenas comuns só existem durante a execução
+    assert not batch._shared_frames and not batch._jobs
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Testes do benchmark (casos de busca no stub e comparação com a linha de base)"""
+
+import json
+
+import benchmark
+
+
+def test_compare_reports_only_regressions_beyond_tolerance():
+    baseline = {"render_bios": {"frames": 17, "seconds": 0.2, "peak_mb": 40.0},
+                "encode_main": {"bytes": 45000}}
+    results = {
+        "render_bios": {"frames": 17, "seconds": 0.3, "peak_mb": 41.0},  # dentro da tolerância
+        "encode_main": {"bytes": 44000},  # melhorou
+        "fetch_rest": {"requests": 99},  # sem linha de base
+    }
+    assert benchmark.compare(results, baseline) == []
+
+    results["render_bios"] = {"frames": 18, "seconds": 0.5, "peak_mb": 41.0}
+    results["encode_main"] = {"bytes": 50000}
+    regressions = benchmark.compare(results, baseline)
+    assert [r.split(":")[0] for r in regressions] == [
+        "render_bios.frames", "render_bios.seconds", "encode_main.bytes"]
+
+
+def test_fetch_cases_run_against_local_stub():
+    results = benchmark.run_benchmarks(repos=5, latency=0.0, render=False)
+
+    # REST: usuário + listagem + 5 contagens de commits + 2 buscas de PRs; GraphQL: 1 página
+    assert results["fetch_rest"]["requests"] == 9
+    assert results["fetch_graphql"]["requests"] == 1
+    assert all(r["seconds"] > 0 and r["peak_mb"] >= 0 for r in results.values())
+
+
+def test_regression_makes_the_script_fail(tmp_path, capsys):
+    baseline_path = tmp_path / "baseline.json"
+    args = ["--no-render", "--repos", "5", "--latency", "0", "--repeat", "1",
+            "--baseline", str(baseline_path)]
+    assert benchmark.main(args + ["--update-baseline"]) == 0
+    assert benchmark.main(args) == 0
+
+    saved = json.loads(baseline_path.read_text())
+    saved["results"]["fetch_rest"]["requests"] = 5
+    baseline_path.write_text(json.dumps(saved))
+    assert benchmark.main(args) == 1
+    assert "REGRESSÃO fetch_rest.requests" in capsys.readouterr().out
+
+
+def test_fetch_cases_replay_a_cassette(tmp_path, monkeypatch):
+    from github_stats import fetch_github_stats
+    from github_stub import GitHubStub, sample_data
+
+    cassette = str(tmp_path / "github.json")
+    monkeypatch.setenv("GITHUB_CACHE_DIR", "")
+    monkeypatch.setenv("GITHUB_CASSETTE", cassette)
+    monkeypatch.setenv("GITHUB_CASSETTE_MODE", "record")
+    with GitHubStub(sample_data(num_repos=5)) as stub:
+        monkeypatch.setenv("GITHUB_API_URL", stub.url)
+        for backend in ("rest", "graphql"):
+            fetch_github_stats("token", "dudupys", backend=backend)
+    monkeypatch.delenv("GITHUB_CASSETTE")
+    monkeypatch.setenv("GITHUB_API_URL", "http://127.0.0.1:9")
+
+    results = benchmark.run_benchmarks(latency=0.0, repeat=2, render=False, cassette=cassette)
+    assert results["fetch_rest"]["requests"] == 9
+    assert results["fetch_graphql"]["requests"] == 1
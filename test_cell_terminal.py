@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Testes do CellTerminal: os frames devem ser iguais aos do gifos.Terminal"""
+
+import importlib
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+
+from cell_terminal import CellTerminal
+from palette import ColorPalette
+from scenes import FrameRecorder
+
+# fonte bitmap que acompanha o pacote do gifos (as do repositório ficam no Git LFS)
+GIFOS_SPEC = importlib.util.find_spec("gifos")
+FONT_FILE = (os.path.join(GIFOS_SPEC.submodule_search_locations[0], "fonts", "gohufont-uni-14.pil")
+             if GIFOS_SPEC else "")
+
+
+def draw(t):
+    t.toggle_show_cursor(False)
+    t.gen_text("GIF_OS Modular BIOS v1.0.11", 1)
+    t.gen_text("Copyright (C) \x1b[31mEduardo\x1b[0m \x1b[30;101mInc.\x1b[0m", 2, count=3)
+    for i in range(3):
+        t.delete_row(3)
+        t.gen_text(f"Memory Test: {i}", 3, contin=True)
+    t.set_prompt("\x1b[0;91mdudupys\x1b[0m@\x1b[0;93mgifos ~> \x1b[0m")
+    t.gen_prompt(5)
+    t.gen_typing_text("ls", 5, contin=True, speed=1)
+    t.gen_text("linha\n" * 12, 6)  # força a rolagem da tela
+    t.clear_frame()
+    t.gen_text("fim", 1, count=2)
+
+
+@pytest.mark.skipif(not os.path.exists(FONT_FILE), reason="gifos não instalado")
+def test_frames_match_gifos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # importar o gifos apaga o output.gif do diretório atual
+    frame_sink = importlib.import_module("frame_sink")
+    palette = ColorPalette.from_color_scheme("yoru")
+    monkeypatch.setenv("GIFOS_GENERAL_COLOR_SCHEME", "yoru")
+
+    expected = FrameRecorder(palette)
+    draw(frame_sink.SinkTerminal(expected, 200, 160, 5, 5, FONT_FILE, 14))
+    actual = FrameRecorder(palette)
+    draw(CellTerminal(actual, 200, 160, 5, 5, FONT_FILE, 14))
+
+    assert [count for _, count, _ in actual.frames] == [count for _, count, _ in expected.frames]
+    for (cell_frame, _, _), (gifos_frame, _, _) in zip(actual.frames, expected.frames):
+        assert np.array_equal(cell_frame, gifos_frame)
+
+
+@pytest.mark.skipif(not os.path.exists(FONT_FILE), reason="gifos não instalado")
+def test_dirty_rects_cover_every_change(tmp_path):
+    class Sink:
+        def __init__(self):
+            self.frames = []
+
+        def add_frame(self, frame, count=1, dirty=None):
+            self.frames.append((frame.copy(), dirty))
+
+    sink = Sink()
+    t = CellTerminal(sink, 200, 160, 5, 5, FONT_FILE, 14)
+    draw(t)
+    t.toggle_show_cursor(True)
+    t.gen_typing_text("cursor", 2, contin=True, speed=1)
+
+    for (previous, _), (frame, (x1, y1, x2, y2)) in zip(sink.frames, sink.frames[1:]):
+        outside = frame != previous
+        outside[y1:y2, x1:x2] = False
+        assert not outside.any()
+    # o contador da memória só redesenha a própria linha
+    rects = [dirty for _, dirty in sink.frames[1:]]
+    assert sum((y2 - y1) * (x2 - x1) for x1, y1, x2, y2 in rects) < len(rects) * 200 * 160 / 4
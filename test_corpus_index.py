@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Testes do índice de corpus usado pelas reflexões e versículos do dia"""
+
+import os
+
+from biblical_verse_generator import load_verses, parse_verse
+from corpus_index import CorpusIndex
+from reflexao_diaria_generator import load_reflexoes, parse_reflexao
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_index_matches_full_parse(tmp_path):
+    for file_name, parse, load in [("reflexoes_diarias.txt", parse_reflexao, load_reflexoes),
+                                   ("versiculos_biblicos.txt", parse_verse, load_verses)]:
+        source_path = os.path.join(HERE, file_name)
+        expected = load(source_path)
+        with CorpusIndex(source_path, parse, str(tmp_path / f"{file_name}.idx")) as corpus:
+            assert len(corpus) == len(expected)
+            assert [corpus[i] for i in range(len(corpus))] == expected
+
+
+def test_index_is_rebuilt_when_source_changes(tmp_path):
+    source_path = tmp_path / "reflexoes.txt"
+    index_path = str(tmp_path / "reflexoes.idx")
+    source_path.write_text("linha inválida\nPrimeira|Autor\n\nSegunda|\n", encoding="utf-8")
+    with CorpusIndex(str(source_path), parse_reflexao, index_path) as corpus:
+        assert len(corpus) == 2
+        assert corpus[1] == {"texto": "Segunda", "autor": None}
+
+    source_path.write_text("Terceira ação|Autora\n", encoding="utf-8")
+    with CorpusIndex(str(source_path), parse_reflexao, index_path) as corpus:
+        assert len(corpus) == 1
+        assert corpus[0] == {"texto": "Terceira ação", "autor": "Autora"}
+
+
+def test_large_corpus_reads_single_record(tmp_path):
+    source_path = tmp_path / "grande.txt"
+    with open(source_path, "w", encoding="utf-8") as f:
+        for i in range(200_000):
+            f.write(f"Livro|{i // 50}|{i % 50}|Texto {i}\n")
+    index_path = str(tmp_path / "grande.idx")
+    with CorpusIndex(str(source_path), parse_verse, index_path) as corpus:
+        assert len(corpus) == 200_000
+    # segunda abertura: índice já existe e só um registro é decodificado
+    calls = []
+
+    def counting_parse(line):
+        calls.append(line)
+        return parse_verse(line)
+
+    with CorpusIndex(str(source_path), counting_parse, index_path) as corpus:
+        assert corpus[123_456]["text"] == "Texto 123456"
+    assert len(calls) == 1
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Testes do SinkTerminal: os frames do gifos vão direto para o GifWriter, sem PNGs em disco"""
+
+import importlib
+import importlib.util
+import os
+
+import pytest
+from PIL import Image
+
+from gif_writer import TAIL_DURATIONS, GifWriter
+from palette import ColorPalette
+
+GIFOS_SPEC = importlib.util.find_spec("gifos")
+FONT_FILE = (os.path.join(GIFOS_SPEC.submodule_search_locations[0], "fonts", "gohufont-uni-14.pil")
+             if GIFOS_SPEC else "")
+
+pytestmark = pytest.mark.skipif(not os.path.exists(FONT_FILE), reason="gifos não instalado")
+
+
+class BoundedWriter(GifWriter):
+    """GifWriter que registra quantos frames comprimidos ficaram em memória de uma vez"""
+
+    max_pending = 0
+
+    def add_frame(self, frame, count=1, dirty=None):
+        super().add_frame(frame, count, dirty)
+        self.max_pending = max(self.max_pending, len(self._pending))
+
+
+def test_frames_stream_into_the_gif_without_png_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # importar o gifos apaga o output.gif do diretório atual
+    monkeypatch.setenv("GIFOS_GENERAL_COLOR_SCHEME", "yoru")
+    frame_sink = importlib.import_module("frame_sink")
+
+    with BoundedWriter("output.gif", duration=100, palette=ColorPalette.from_color_scheme("yoru")) as writer:
+        t = frame_sink.SinkTerminal(writer, 200, 160, 5, 5, FONT_FILE, 14)
+        t.toggle_show_cursor(False)
+        for row in range(1, 9):
+            t.gen_typing_text(f"linha {row}", row, speed=1)
+        # o GIF é escrito enquanto os frames chegam, não no fim
+        assert writer.frame_count > 0 and os.path.exists("output.gif.tmp")
+
+    # (o gifos.Terminal cria a pasta frames/, mas nenhum PNG é gravado nela)
+    assert not list(tmp_path.rglob("*.png")) and not list(tmp_path.glob("*.tmp"))
+    assert writer.source_frame_count > 50
+    # só os últimos frames (os que recebem as durações finais) ficam em memória
+    assert writer.max_pending <= len(TAIL_DURATIONS) + 1
+    with Image.open("output.gif") as im:
+        assert im.n_frames == writer.frame_count
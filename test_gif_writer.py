@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Testes do GifWriter: o GIF gravado deve reproduzir exatamente os frames recebidos"""
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+import pytest
+
+from gif_writer import (DEFAULT_DURATION, TAIL_DURATIONS, BudgetedGifWriter, GifBudget, GifWriter,
+                        frame_duration_from_env)
+from palette import ColorPalette
+
+
+def make_frame(palette, text_rows):
+    """Frame 60x40 com blocos "de texto" em cores do esquema nas linhas indicadas"""
+    frame = np.zeros((40, 60, 3), dtype=np.uint8)
+    frame[:] = palette.colors[0]
+    for row, color_index in text_rows:
+        frame[row * 8:row * 8 + 6, 4:40] = palette.colors[color_index]
+    return Image.fromarray(frame)
+
+
+def decode(file_name):
+    with Image.open(file_name) as im:
+        return [(np.asarray(f.convert("RGB")).copy(), f.info["duration"])
+                for f in ImageSequence.Iterator(im)]
+
+
+def test_round_trip_with_dedup(tmp_path):
+    palette = ColorPalette.from_color_scheme("yoru")
+    frames = [
+        make_frame(palette, []),
+        make_frame(palette, []),
+        make_frame(palette, [(0, 3)]),
+        make_frame(palette, [(0, 3), (2, 5)]),
+        make_frame(palette, [(0, 3), (2, 5)]),
+        make_frame(palette, [(0, 3), (2, 5)]),
+        make_frame(palette, [(2, 5)]),
+    ]
+    file_name = str(tmp_path / "out.gif")
+    with GifWriter(file_name, duration=100, tail_durations=(), palette=palette) as writer:
+        for frame in frames:
+            writer.add_frame(frame)
+
+    decoded = decode(file_name)
+    assert writer.source_frame_count == 7
+    assert writer.frame_count == len(decoded) == 4
+    assert [duration for _, duration in decoded] == [200, 100, 300, 100]
+    for (pixels, _), expected in zip(decoded, [frames[0], frames[2], frames[3], frames[6]]):
+        assert np.array_equal(pixels, np.asarray(expected))
+
+
+def test_repeated_frames_add_up_their_durations(tmp_path, monkeypatch):
+    monkeypatch.setenv("GIFOS_GENERAL_FPS", "13")  # 76,9ms por frame
+    palette = ColorPalette.from_color_scheme("yoru")
+    a, b, c, d, e = (make_frame(palette, [(row, 3)]) for row in range(5))
+    file_name = str(tmp_path / "out.gif")
+    with GifWriter(file_name, palette=palette) as writer:
+        for frame, count in ((a, 1), (a, 1), (b, 3), (b, 1), (c, 1), (d, 12), (e, 1)):
+            writer.add_frame(frame, count)
+
+    decoded = decode(file_name)
+    assert writer.source_frame_count == 20
+    assert writer.frame_count == len(decoded) == 5
+    # a: 2 frames, b: 4; os três últimos ficam com pelo menos TAIL_DURATIONS
+    # (d já passa de 800ms). Os atrasos são arredondados sobre o tempo
+    # acumulado, em centésimos, então o total não perde os 0,9ms de cada frame
+    assert TAIL_DURATIONS == (600, 800, 1000)
+    assert [duration for _, duration in decoded] == [150, 310, 600, 920, 1000]
+    assert writer.total_duration == 2980
+
+
+@pytest.mark.parametrize("fps, expected", [
+    (None, DEFAULT_DURATION), ("20", 50), ("12.5", 80), ("0", DEFAULT_DURATION), ("rápido", DEFAULT_DURATION),
+])
+def test_frame_duration_from_env(monkeypatch, fps, expected):
+    if fps is None:
+        monkeypatch.delenv("GIFOS_GENERAL_FPS", raising=False)
+    else:
+        monkeypatch.setenv("GIFOS_GENERAL_FPS", fps)
+    assert frame_duration_from_env() == expected
+
+
+def test_unchanged_pixels_become_transparent(tmp_path):
+    palette = ColorPalette.from_color_scheme("yoru")
+    noise = np.random.default_rng(0).integers(1, 18, size=(40, 60), dtype=np.uint8)
+    changed = noise.copy()
+    changed[::4, ::4] = 0  # mudanças espalhadas: o retângulo cobre quase tudo
+    file_name = str(tmp_path / "out.gif")
+    with GifWriter(file_name, duration=100, tail_durations=(), palette=palette) as writer:
+        writer.add_frame(noise)
+        writer.add_frame(changed)
+
+    with open(file_name, "rb") as f:
+        data = f.read()
+    # segunda extensão de controle gráfico: disposal 1 com a flag de transparência
+    second_gce = data.index(b"!\xf9\x04", data.index(b"!\xf9\x04") + 1)
+    assert data[second_gce + 3] == (1 << 2) | 1
+    decoded = decode(file_name)
+    assert np.array_equal(decoded[1][0], palette.colors[changed])
+
+
+def test_anti_aliased_colors_map_to_nearest_entry():
+    palette = ColorPalette.from_color_scheme("yoru")
+    rgb = np.array([[palette.colors[5], palette.colors[5] - 1]], dtype=np.uint8)
+    assert palette.map_rgb(rgb).tolist() == [[5, 5]]
+
+
+def test_dirty_rects_give_the_same_bytes(tmp_path):
+    palette = ColorPalette.from_color_scheme("yoru")
+    frame = np.zeros((40, 60), dtype=np.uint8)
+    frames = []
+    for step in range(6):
+        dirty = (0, 8 * (step % 3), 60, 8 * (step % 3) + 8)
+        if step != 3:  # um frame marcado como alterado, mas igual ao anterior
+            frame[dirty[1]:dirty[3], step:step + 10] = step + 1
+        frames.append((frame.copy(), dirty))
+
+    outputs = []
+    for use_dirty in (False, True):
+        file_name = tmp_path / f"out-{use_dirty}.gif"
+        with GifWriter(str(file_name), duration=100, palette=palette) as writer:
+            for indices, dirty in frames:
+                writer.add_frame(indices, 1, dirty if use_dirty else None)
+        outputs.append(file_name.read_bytes())
+    assert outputs[0] == outputs[1]
+    assert writer.frame_count == 5
+
+
+def test_parallel_compression_gives_the_same_bytes(tmp_path):
+    palette = ColorPalette.from_color_scheme("yoru")
+    rng = np.random.default_rng(1)
+    frame = rng.integers(0, 18, size=(120, 160), dtype=np.uint8)
+    frames = [frame.copy()]
+    for step in range(12):
+        if step % 3 == 0:  # tela quase toda: vai para o pool
+            frame[10:110, 5:155] = rng.integers(0, 18, size=(100, 150), dtype=np.uint8)
+        else:  # uma "tecla": comprimida na hora
+            frame[step * 8:step * 8 + 8, step * 6:step * 6 + 6] = step
+        frames.append(frame.copy())
+
+    outputs = []
+    for workers in (1, 2):
+        file_name = tmp_path / f"out-{workers}.gif"
+        with GifWriter(str(file_name), duration=100, palette=palette, workers=workers) as writer:
+            for indices in frames:
+                writer.add_frame(indices)
+        outputs.append(file_name.read_bytes())
+    assert outputs[0] == outputs[1]
+    # as telas grandes passaram pelo pool, que já foi encerrado
+    assert writer._slots and writer._shared is None and writer._pool is None
+    assert writer.frame_count == 13
+
+
+def test_failed_render_keeps_the_previous_gif(tmp_path):
+    palette = ColorPalette.from_color_scheme("yoru")
+    frame = np.random.default_rng(2).integers(0, 18, size=(120, 160), dtype=np.uint8)
+    file_name = tmp_path / "out.gif"
+    file_name.write_bytes(b"GIF anterior")
+    writers = [GifWriter(str(file_name), duration=100, palette=palette, workers=2),
+               BudgetedGifWriter(str(file_name), GifBudget(max_frames=1), duration=100, palette=palette)]
+    for writer in writers:
+        try:
+            with writer:
+                writer.add_frame(frame)
+                writer.add_frame(frame[::-1].copy())
+                raise RuntimeError("falha na renderização")
+        except RuntimeError:
+            pass
+
+    # nada de GIF truncado, temporários, pool ou memória compartilhada sobrando
+    assert file_name.read_bytes() == b"GIF anterior"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["out.gif"]
+    assert writers[0]._pool is None and writers[0]._shared is None
+
+
+def typing_frames():
+    """Tela 40x60: uma linha digitada tecla a tecla, uma pausa longa, a tela limpa e outra linha"""
+    frame = np.zeros((40, 60), dtype=np.uint8)
+    frames = [(frame.copy(), 1)]
+    for row, color in ((1, 3), (3, 5)):
+        if row == 3:
+            frame[:] = 2  # redesenho da tela (nova cena)
+            frames.append((frame.copy(), 1))
+        for col in range(12):
+            frame[row * 8:row * 8 + 4, col * 4:col * 4 + 4] = color  # uma tecla
+            frames.append((frame.copy(), 1))
+        frames.append((frame.copy(), 12))
+    return frames
+
+
+def test_budget_drops_typing_frames_but_keeps_key_frames(tmp_path):
+    palette = ColorPalette.from_color_scheme("yoru")
+    frames = typing_frames()
+    plain, budgeted = str(tmp_path / "plain.gif"), str(tmp_path / "budget.gif")
+    with GifWriter(plain, duration=100, tail_durations=(), palette=palette) as writer:
+        for indices, count in frames:
+            writer.add_frame(indices, count)
+    with BudgetedGifWriter(budgeted, GifBudget(max_frames=12), duration=100, tail_durations=(),
+                           palette=palette) as budget_writer:
+        for indices, count in frames:
+            budget_writer.add_frame(indices, count)
+
+    assert budget_writer.fits and budget_writer.settings != (None, 1)
+    decoded = [pixels for pixels, _ in decode(budgeted)]
+    assert budget_writer.frame_count == len(decoded) <= 12 < writer.frame_count
+    # a tela final e a pausa antes do redesenho continuam no GIF; a duração total não muda
+    full = [pixels for pixels, _ in decode(plain)]
+    assert np.array_equal(decoded[-1], full[-1])
+    assert any(np.array_equal(pixels, palette.colors[frames[13][0]]) for pixels in decoded)
+    assert budget_writer.total_duration == writer.total_duration
+    assert "12 frames" in budget_writer.report()
+
+
+def test_budget_without_pressure_matches_gif_writer(tmp_path):
+    palette = ColorPalette.from_color_scheme("yoru")
+    outputs = []
+    for writer_class in (GifWriter, BudgetedGifWriter):
+        file_name = tmp_path / f"{writer_class.__name__}.gif"
+        with writer_class(str(file_name), duration=100, palette=palette) as writer:
+            for indices, count in typing_frames():
+                writer.add_frame(indices, count)
+        outputs.append(file_name.read_bytes())
+    assert outputs[0] == outputs[1]
+    assert writer.settings == (None, 1) and len(writer.attempts) == 1
+
+
+def test_budget_from_env(monkeypatch):
+    monkeypatch.setenv("GIF_MAX_BYTES", "300k")
+    monkeypatch.setenv("GIF_MAX_FRAMES", "")
+    budget = GifBudget.from_env()
+    assert (budget.max_bytes, budget.max_frames) == (300 * 1024, None)
+    monkeypatch.setenv("GIF_MAX_BYTES", "muito")
+    assert GifBudget.from_env() is None
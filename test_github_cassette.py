@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Testes do cassete: gravar o tráfego com a API e reproduzi-lo sem rede"""
+
+import json
+import time
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+import github_cassette
+from github_stats import fetch_github_stats
+from github_stub import GitHubStub, sample_data
+
+# Porta fechada: na reprodução, nenhuma requisição pode chegar à rede
+OFFLINE_URL = "http://127.0.0.1:9"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cassettes():
+    """Cada teste abre os cassetes de novo (o módulo guarda um por arquivo e modo)"""
+    yield
+    github_cassette._cassettes.clear()
+
+
+def summary(stats):
+    return (stats.user_rank.level, stats.total_stargazers, stats.total_commits_last_year,
+            stats.total_pull_requests_made, stats.pull_requests_merge_percentage,
+            stats.total_repo_contributions, stats.languages_sorted)
+
+
+def record(tmp_path, monkeypatch, backend):
+    cassette = tmp_path / "github.json"
+    monkeypatch.setenv("GITHUB_CACHE_DIR", "")
+    monkeypatch.setenv("GITHUB_CASSETTE", str(cassette))
+    monkeypatch.setenv("GITHUB_CASSETTE_MODE", "record")
+    with GitHubStub(sample_data(num_repos=8)) as stub:
+        monkeypatch.setenv("GITHUB_API_URL", stub.url)
+        stats = fetch_github_stats("segredo-123", "dudupys", backend=backend)
+    monkeypatch.setenv("GITHUB_CASSETTE_MODE", "replay")
+    monkeypatch.setenv("GITHUB_API_URL", OFFLINE_URL)
+    return cassette, stats, len(stub.requests)
+
+
+@pytest.mark.parametrize("backend", ["rest", "graphql"])
+def test_replay_gives_the_same_stats_offline(tmp_path, monkeypatch, backend):
+    cassette, recorded, requests_made = record(tmp_path, monkeypatch, backend)
+    text = cassette.read_text(encoding="utf-8")
+    interactions = json.loads(text)["interactions"]
+    assert len(interactions) == requests_made and "segredo-123" not in text
+    assert all("ETag" in item["response"]["headers"] for item in interactions)
+
+    start = time.perf_counter()
+    replayed = fetch_github_stats("outro-token", "dudupys", backend=backend)
+    assert summary(replayed) == summary(recorded)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_replay_answers_conditional_requests_and_simulates_latency(tmp_path, monkeypatch):
+    cassette, recorded, _ = record(tmp_path, monkeypatch, "rest")
+    monkeypatch.setenv("GITHUB_CACHE_DIR", str(tmp_path / "cache"))
+    fetch_github_stats("token", "dudupys", backend="rest")  # enche o cache de respostas
+
+    interaction = github_cassette.Cassette.load(str(cassette)).interactions[0]
+    recorded_url = urlparse(interaction["request"]["url"])
+    session = requests.Session()
+    session.mount("http://", github_cassette.CassetteAdapter(github_cassette.open_cassette(str(cassette)),
+                                                             latency=0.02))
+    start = time.perf_counter()
+    response = session.get(f"{OFFLINE_URL}{recorded_url.path}?{recorded_url.query}",
+                           headers={"If-None-Match": interaction["response"]["headers"]["ETag"]})
+    assert response.status_code == 304 and response.content == b""
+    assert time.perf_counter() - start >= 0.02
+
+    # a segunda execução revalida tudo com If-None-Match e usa o cache
+    assert summary(fetch_github_stats("token", "dudupys", backend="rest")) == summary(recorded)
+
+
+def test_unknown_request_fails_like_a_connection_error(tmp_path, monkeypatch):
+    record(tmp_path, monkeypatch, "graphql")
+    # outro usuário não está no cassete: a busca falha sem tocar a rede
+    assert fetch_github_stats("token", "octocat", backend="rest") is None
+
+
+def test_batch_replays_without_a_token(tmp_path, monkeypatch):
+    import batch
+
+    _, recorded, _ = record(tmp_path, monkeypatch, "graphql")
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setenv("GITHUB_STATS_BACKEND", "graphql")
+    details = batch.fetch_all([batch.UserConfig("dudupys")], None, workers=1)
+    assert summary(details["dudupys"]) == summary(recorded)
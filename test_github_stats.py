@@ -2,20 +2,27 @@
 """Script para testar a integração com a API do GitHub"""
 
 import os
-from github_stats import fetch_github_stats
+from github_stats import GitHubGraphQLFetcher, GitHubStatsFetcher, RateLimiter, fetch_github_stats
+from github_stub import GitHubStub, sample_data
 
-def test_github_integration():
-    """Testa a busca de dados do GitHub"""
+def test_github_integration(monkeypatch):
+    """Testa a busca de dados do GitHub
     
-    # Substitua pelo seu token real
-    github_token = "seu_token_aqui"  # OU use variável de ambiente
-    
-    # Se não tiver variável de ambiente, peça ao usuário
-    if not github_token or github_token == "seu_token_aqui":
-        github_token = input("Digite seu token do GitHub (gif-generation): ").strip()
+    Por padrão usa o servidor local do github_stub (sem rede e sem pedir nada
+    no terminal); a API real só com GITHUB_LIVE_TESTS=1 e um GITHUB_TOKEN.
+    """
+    live = os.getenv("GITHUB_LIVE_TESTS", "") not in ("", "0")
+    github_token = os.getenv("GITHUB_TOKEN") if live else None
     
     if not github_token:
-        print("❌ Token não fornecido. Não é possível testar.")
+        print("🔍 Testando contra a API local (github_stub); GITHUB_LIVE_TESTS=1 usa a API real...")
+        with GitHubStub(sample_data(num_repos=6)) as stub:
+            monkeypatch.setenv("GITHUB_API_URL", stub.url)
+            monkeypatch.setenv("GITHUB_CACHE_DIR", "")
+            stats = fetch_github_stats("token", "dudupys")
+        assert stats is not None
+        assert stats.total_commits_last_year == sum(range(1, 7))
+        assert [lang for lang, _ in stats.languages_sorted][:2] == ["Python", "TypeScript"]
         return
     
     print("🔍 Testando integração com a API do GitHub...")
@@ -24,26 +31,211 @@ def test_github_integration():
     try:
         # Buscar estatísticas
         stats = fetch_github_stats(github_token, "dudupys")
-        
-        print("\n✅ Dados obtidos com sucesso!")
-        print("\n📊 Estatísticas do GitHub:")
-        print(f"   • Nível: {stats.user_rank.level}")
-        print(f"   • Seguidores: {stats.total_stargazers}")
-        print(f"   • Commits (último ano): {stats.total_commits_last_year}")
-        print(f"   • Pull Requests: {stats.total_pull_requests_made}")
-        print(f"   • Taxa de Merge: {stats.pull_requests_merge_percentage}%")
-        print(f"   • Repositórios: {stats.total_repo_contributions}")
-        print(f"   • Linguagens Top 5: {', '.join([lang[0] for lang in stats.languages_sorted[:5]])}")
-        
-        return True
-        
     except Exception as e:
         print(f"\n❌ Erro ao buscar dados: {e}")
         print("\n🔧 Possíveis soluções:")
         print("   1. Verifique se o token está correto")
         print("   2. Verifique se o token tem permissões suficientes")
         print("   3. Verifique sua conexão com a internet")
-        return False
+        raise
+    
+    assert stats is not None
+    print("\n✅ Dados obtidos com sucesso!")
+    print("\n📊 Estatísticas do GitHub:")
+    print(f"   • Nível: {stats.user_rank.level}")
+    print(f"   • Estrelas: {stats.total_stargazers}")
+    print(f"   • Commits (último ano): {stats.total_commits_last_year}")
+    print(f"   • Pull Requests: {stats.total_pull_requests_made}")
+    print(f"   • Taxa de Merge: {stats.pull_requests_merge_percentage}%")
+    print(f"   • Repositórios públicos: {stats.total_repo_contributions}")
+    print(f"   • Linguagens Top 5: {', '.join([lang[0] for lang in stats.languages_sorted[:5]])}")
+
+def test_per_repo_requests_fan_out_over_pooled_connections():
+    """Commits e PRs de cada repositório são buscados em paralelo, reaproveitando conexões"""
+    with GitHubStub(sample_data(num_repos=12), delay=0.02) as stub:
+        with GitHubStatsFetcher("token", max_workers=4, base_url=stub.url, cache_dir="") as fetcher:
+            commits = fetcher.get_user_commits_last_year()
+            total_prs, merge_percentage = fetcher.get_pull_requests_stats()
+    
+    assert commits == sum(range(1, 13))
+    assert total_prs == sum(i % 4 for i in range(12))
+    assert round(merge_percentage) == 67
+    assert 1 < stub.max_in_flight <= 4
+    # 1 listagem + 12 contagens de commits + 2 buscas de PRs,
+    # em no máximo 4 conexões keep-alive
+    assert len(stub.requests) == 15
+    assert stub.connections <= 4
+
+def test_conditional_requests_between_runs(tmp_path):
+    """Execuções seguintes revalidam a listagem pelo ETag e só consultam repositórios com push novo"""
+    with GitHubStub(sample_data(num_repos=3)) as stub:
+        def run():
+            with GitHubStatsFetcher("token", base_url=stub.url, cache_dir=str(tmp_path)) as fetcher:
+                return fetcher.get_user_commits_last_year(), fetcher.get_language_stats()
+        
+        first = run()
+        requests_first_run = len(stub.requests)
+        second = run()
+        # novo push em repo-1: só ele é consultado de novo (o resto vem do snapshot)
+        stub.data["repos"][1]["pushed_at"] = "2999-01-01T00:00:00Z"
+        stub.data["repos"][1]["commits"].insert(0, {"sha": "new", "author": {"login": "dudupys"}})
+        before_push = len(stub.requests)
+        third = run()
+    
+    assert second == first and first[0] == 1 + 2 + 3
+    assert requests_first_run == 4
+    # segunda execução: só a listagem, respondida com 304
+    assert before_push - requests_first_run == 1
+    assert stub.not_modified == 1
+    assert third[0] == first[0] + 1
+    assert len(stub.requests[before_push:]) == 2
+    assert "/repos/dudupys/repo-1/commits" in stub.requests[-1]
+
+def test_stale_cache_entries_are_pruned_on_close(tmp_path):
+    """Respostas sem uso há mais que o limite (ex.: `since` de outro dia) saem do cache"""
+    stale = tmp_path / f"{'0' * 40}.json"
+    stale.write_text("{}")
+    leftover = tmp_path / f"{'1' * 40}.123.tmp"
+    leftover.write_text("")
+    for path in (stale, leftover):
+        os.utime(path, (0, 0))
+    with GitHubStub(sample_data(num_repos=3)) as stub:
+        for _ in range(2):
+            with GitHubStatsFetcher("token", base_url=stub.url, cache_dir=str(tmp_path)) as fetcher:
+                fetcher.get_user_commits_last_year()
+    
+    assert not stale.exists() and not leftover.exists()
+    # as respostas desta execução e o snapshot continuam lá
+    assert len([path for path in tmp_path.glob("*.json") if len(path.stem) == 40]) == 4
+    assert (tmp_path / "repos-dudupys.json").exists()
+    assert stub.not_modified == 1
+
+def test_graphql_backend_fills_details_with_real_counts():
+    """O backend GraphQL traz contagens reais em uma requisição por página de repositórios"""
+    with GitHubStub(sample_data(num_repos=12)) as stub:
+        with GitHubGraphQLFetcher("token", base_url=stub.url, page_size=5, cache_dir="") as fetcher:
+            stats = fetcher.get_complete_stats()
+    
+    assert stub.requests == ["/graphql"] * 3  # 12 repositórios em páginas de 5
+    assert stats.total_commits_last_year == sum(range(1, 13))
+    assert stats.total_pull_requests_made == sum(i % 4 for i in range(12))
+    assert stats.pull_requests_merge_percentage == 66.67  # 12 de 18
+    assert stats.total_stargazers == sum(i % 3 for i in range(12))
+    assert stats.total_repo_contributions == 12
+    assert [lang for lang, _ in stats.languages_sorted] == ["JavaScript", "Python", "TypeScript", "CSS", "HTML"]
+    assert round(sum(pct for _, pct in stats.languages_sorted)) == 100
+
+def test_graphql_errors_fall_back_to_rest(monkeypatch):
+    """Se a consulta GraphQL falhar, fetch_github_stats usa o backend REST"""
+    with GitHubStub(sample_data(username="outro", num_repos=2)) as stub:
+        monkeypatch.setenv("GITHUB_API_URL", stub.url)
+        monkeypatch.setenv("GITHUB_CACHE_DIR", "")
+        stats = fetch_github_stats("token", "outro", backend="graphql")
+        graphql_calls = stub.requests.count("/graphql")
+        stub.graphql = lambda variables: {"errors": [{"message": "Something went wrong"}]}
+        fallback = fetch_github_stats("token", "outro", backend="graphql")
+    
+    assert graphql_calls == 1 and stats.total_commits_last_year == 3
+    assert fallback is not None
+    assert fallback.total_commits_last_year == 3
+
+def test_rest_and_graphql_fill_the_same_details():
+    """Os dois backends preenchem cada campo com o mesmo sentido (o fallback não muda o GIF)"""
+    data = sample_data(num_repos=6)
+    # forks e repositórios de outros donos não contam estrelas nem linguagens
+    data["repos"].append({"name": "fork", "fork": True, "language": "Rust", "size": 900,
+                          "pushed_at": "2999-01-01T00:00:00Z", "stargazers_count": 50,
+                          "commits": [], "pulls": []})
+    data["user"]["public_repos"] = 7
+    with GitHubStub(data) as stub:
+        details = {}
+        for fetcher_class in (GitHubStatsFetcher, GitHubGraphQLFetcher):
+            with fetcher_class("token", base_url=stub.url, cache_dir="") as fetcher:
+                stats = fetcher.get_complete_stats()
+            details[fetcher_class] = {**vars(stats), "user_rank": stats.user_rank.level}
+    
+    assert details[GitHubStatsFetcher] == details[GitHubGraphQLFetcher]
+    assert details[GitHubStatsFetcher]["total_stargazers"] == sum(i % 3 for i in range(6))
+    assert details[GitHubStatsFetcher]["total_repo_contributions"] == 7
+    assert "Rust" not in dict(details[GitHubStatsFetcher]["languages_sorted"])
+
+def test_counts_use_link_header_and_search_total():
+    """Contagens exatas além de 100 itens, com uma requisição de 1 item por repositório ou busca"""
+    data = sample_data(num_repos=2)
+    data["repos"][0]["commits"] = [{"sha": str(c), "author": {"login": "dudupys"}} for c in range(250)]
+    data["repos"][1]["pulls"] = [{"number": p, "user": {"login": "dudupys"},
+                                  "merged_at": "2025-01-01T00:00:00Z" if p < 90 else None}
+                                 for p in range(120)]
+    with GitHubStub(data) as stub:
+        with GitHubStatsFetcher("token", base_url=stub.url, cache_dir="") as fetcher:
+            commits = fetcher.get_user_commits_last_year()
+            total_prs, merge_percentage = fetcher.get_pull_requests_stats()
+    
+    assert commits == 250 + 2
+    assert (total_prs, merge_percentage) == (120, 75.0)
+    assert len(stub.requests) == 1 + 2 + 2
+    assert all("per_page=1" in path for path in stub.requests[1:])
+
+def test_search_counts_use_total_count_beyond_the_pagination_limit():
+    """A busca só pagina 1000 resultados: o total vem de `total_count`, não do Link"""
+    data = sample_data(num_repos=1)
+    data["repos"][0]["pulls"] = [{"number": p, "user": {"login": "dudupys"},
+                                  "merged_at": "2025-01-01T00:00:00Z" if p < 300 else None}
+                                 for p in range(1500)]
+    with GitHubStub(data) as stub:
+        with GitHubStatsFetcher("token", base_url=stub.url, cache_dir="") as fetcher:
+            total_prs, merge_percentage = fetcher.get_pull_requests_stats()
+    
+    assert (total_prs, merge_percentage) == (1500, 20.0)
+
+def test_rate_limit_budget_prioritizes_recent_repos():
+    """Com pouco limite sobrando, só os repositórios mais recentes são consultados"""
+    with GitHubStub(sample_data(num_repos=12)) as stub:
+        stub.rate_limit_remaining = 10
+        limiter = RateLimiter(reserve=2, max_wait=0)
+        with GitHubStatsFetcher("token", base_url=stub.url, cache_dir="", rate_limiter=limiter) as fetcher:
+            commits = fetcher.get_user_commits_last_year()
+    
+    # a listagem deixa 9 requisições, 2 ficam de reserva: repo-5 a repo-11 (os mais recentes)
+    assert commits == sum(range(6, 13))
+    assert len(stub.requests) == 1 + 7
+    assert stub.rate_limit_remaining == 2
+
+def test_search_rate_limit_does_not_stall_core_requests():
+    """O limite da busca (30 por minuto) é separado do limite principal"""
+    waits = []
+    with GitHubStub(sample_data(num_repos=12)) as stub:
+        stub.rate_limit_remaining = 5000
+        stub.search_rate_limit_remaining = 2
+        limiter = RateLimiter(sleep=waits.append)
+        with GitHubStatsFetcher("token", base_url=stub.url, cache_dir="", rate_limiter=limiter) as fetcher:
+            total_prs, _ = fetcher.get_pull_requests_stats()
+            commits = fetcher.get_user_commits_last_year()
+    
+    # só a segunda busca espera o reset da busca; os commits seguem no limite principal
+    assert len(waits) == 1 and 0 < waits[0] <= 60
+    assert total_prs == sum(i % 4 for i in range(12))
+    assert commits == sum(range(1, 13))
+    assert limiter.available("core") == 5000 - 13 - 50
+
+def test_secondary_rate_limit_is_retried_after_waiting():
+    """Um 403 de limite secundário com Retry-After é repetido depois da espera"""
+    waits = []
+    with GitHubStub(sample_data(num_repos=1)) as stub:
+        stub.failures.append((403, {"Retry-After": "3"},
+                              {"message": "You have exceeded a secondary rate limit."}))
+        limiter = RateLimiter(sleep=waits.append)
+        with GitHubStatsFetcher("token", base_url=stub.url, cache_dir="", rate_limiter=limiter) as fetcher:
+            info = fetcher.get_user_info()
+        
+        # espera longa demais: a requisição é adiada em vez de travar a execução
+        stub.failures.append((429, {"Retry-After": "3600"}, {"message": "slow down"}))
+        with GitHubStatsFetcher("token", base_url=stub.url, cache_dir="", rate_limiter=limiter) as fetcher:
+            deferred = fetcher.get_user_info()
+    
+    assert waits == [3.0]
+    assert info["login"] == "dudupys"
+    assert deferred == {} and limiter.deferred == 1
 
 def show_token_instructions():
     """Mostra instruções sobre como usar o token"""
@@ -60,4 +252,5 @@ def show_token_instructions():
 if __name__ == "__main__":
     show_token_instructions()
     print("\n" + "="*50)
-    test_github_integration()
+    import pytest
+    raise SystemExit(pytest.main(["-q", __file__, "-k", "test_github_integration", "-s"]))
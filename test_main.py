@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Testes do início rápido do main.py (imports preguiçosos e modo README-only)"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Orçamento do `import main` (cumulativo, em microssegundos); hoje fica perto de 10ms
+IMPORT_TIME_BUDGET_US = 150_000
+HEAVY_MODULES = {"gifos", "PIL", "numpy", "requests"}
+
+
+def run_python(args, cwd, **env):
+    # Sempre fora do repositório: importar o gifos apaga output.gif e frames/ do diretório atual
+    return subprocess.run(
+        [sys.executable, *args], cwd=cwd, capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": HERE, **env},
+    )
+
+
+def test_import_main_skips_heavy_modules_and_fits_budget(tmp_path):
+    stderr = run_python(["-X", "importtime", "-c", "import main"], tmp_path).stderr
+    imported = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        if cumulative.strip().isdigit():
+            imported[name.strip()] = int(cumulative)
+
+    assert "main" in imported
+    assert not HEAVY_MODULES & {name.split(".")[0] for name in imported}
+    assert imported["main"] < IMPORT_TIME_BUDGET_US
+
+
+def test_readme_only_mode_writes_readme_without_gif(tmp_path):
+    shutil.copy(os.path.join(HERE, "reflexoes_diarias.txt"), tmp_path)
+    stdout = run_python([os.path.join(HERE, "main.py"), "--readme-only"], tmp_path,
+                        GITHUB_TOKEN="nao-deve-ser-usado").stdout
+
+    assert "README-only" in stdout
+    readme = (tmp_path / "README.md").read_text(encoding="utf-8")
+    assert "Daily Reflection" in readme and "output.gif" in readme
+    assert not (tmp_path / "output.gif").exists()
+    assert sorted(os.listdir(tmp_path)) == [".cache", "README.md", "reflexoes_diarias.txt"]
+
+
+def test_text_only_run_keeps_the_committed_gif(tmp_path):
+    shutil.copy(os.path.join(HERE, "reflexoes_diarias.txt"), tmp_path)
+    (tmp_path / "output.gif").write_bytes(b"GIF89a")
+    (tmp_path / "frames").mkdir()
+    env = {name: value for name, value in os.environ.items() if name != "GITHUB_TOKEN"}
+    subprocess.run([sys.executable, os.path.join(HERE, "main.py")], cwd=tmp_path, capture_output=True,
+                   env={**env, "PYTHONPATH": HERE, "OUTPUT_FORMATS": "svg"}, timeout=300)
+
+    # o caminho só em texto importa o gifos, que apagaria output.gif e frames/
+    assert (tmp_path / "output.gif").read_bytes() == b"GIF89a"
+    assert (tmp_path / "frames").is_dir()
+
+
+def test_unchanged_run_skips_render_and_writes(tmp_path, monkeypatch):
+    import main
+
+    renders = []
+
+    def fake_render_gif(year_now, time_now, git_user_details, fingerprint):
+        renders.append(time_now)
+        (tmp_path / "output.gif").write_bytes(b"GIF89a")
+        return True
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["main.py"])
+    monkeypatch.setattr(main, "render_gif", fake_render_gif)
+    for name in ("GITHUB_TOKEN", "README_ONLY", "FORCE_RENDER", "MANIFEST_TIMESTAMPS"):
+        monkeypatch.delenv(name, raising=False)
+
+    main.main()
+    readme_mtime = os.stat("README.md").st_mtime_ns
+    main.main()
+    assert len(renders) == 1
+    assert os.stat("README.md").st_mtime_ns == readme_mtime
+
+    monkeypatch.setenv("FORCE_RENDER", "1")
+    main.main()
+    assert len(renders) == 2
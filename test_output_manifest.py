@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Testes do manifesto que evita renderizar e regravar saídas sem mudanças"""
+
+from output_manifest import OutputManifest
+
+
+def make_manifest(tmp_path, stats, time_now, rule="ignore"):
+    manifest = OutputManifest(str(tmp_path / "output.manifest.json"),
+                              outputs=[str(tmp_path / "README.md")], rule=rule)
+    manifest.add("stats", stats)
+    manifest.add("reflexao_diaria", "Reflexão do dia")
+    manifest.add("time", time_now, timestamp=True)
+    return manifest
+
+
+def test_unchanged_inputs_are_current(tmp_path):
+    (tmp_path / "README.md").write_text("readme")
+    first = make_manifest(tmp_path, {"commits": 10, "top_languages": ["Python"]}, "08:00")
+    assert not first.is_current()
+    assert first.changed() == ["reflexao_diaria", "stats"]
+    first.save()
+
+    # só o horário mudou: com a regra padrão, nada precisa ser refeito
+    second = make_manifest(tmp_path, {"top_languages": ["Python"], "commits": 10}, "20:00")
+    assert second.is_current() and second.changed() == []
+
+    third = make_manifest(tmp_path, {"commits": 11, "top_languages": ["Python"]}, "20:00")
+    assert not third.is_current() and third.changed() == ["stats"]
+
+
+def test_timestamps_count_when_configured(tmp_path):
+    (tmp_path / "README.md").write_text("readme")
+    make_manifest(tmp_path, {"commits": 10}, "08:00", rule="count").save()
+
+    assert make_manifest(tmp_path, {"commits": 10}, "08:00", rule="count").is_current()
+    later = make_manifest(tmp_path, {"commits": 10}, "20:00", rule="count")
+    assert not later.is_current() and later.changed() == ["time"]
+    # trocar de regra também invalida o manifesto salvo
+    assert not make_manifest(tmp_path, {"commits": 10}, "08:00").is_current()
+
+
+def test_missing_output_or_corrupt_manifest_is_not_current(tmp_path):
+    make_manifest(tmp_path, {"commits": 10}, "08:00").save()
+    assert not make_manifest(tmp_path, {"commits": 10}, "08:00").is_current()  # sem README.md
+
+    (tmp_path / "README.md").write_text("readme")
+    (tmp_path / "output.manifest.json").write_text("{corrompido")
+    manifest = make_manifest(tmp_path, {"commits": 10}, "08:00")
+    assert manifest.previous == {} and not manifest.is_current()
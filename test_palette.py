@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Testes da paleta global: cores do esquema, tabela de consulta e cor mais próxima"""
+
+import numpy as np
+
+from gif_writer import GifWriter
+from palette import TRANSPARENT_INDEX, ColorPalette, _hex_to_rgb, load_color_scheme
+
+
+def image_descriptors(data):
+    """Byte de flags do cabeçalho e de cada descritor de imagem de um GIF"""
+    flags = data[10]
+    pos = 13 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+    descriptors = []
+    while data[pos] != 0x3B:
+        if data[pos] == 0x21:  # extensão: rótulo e sub-blocos
+            pos += 2
+        else:  # 0x2C: descritor, tabela local opcional, tamanho mínimo do LZW e sub-blocos
+            packed = data[pos + 9]
+            descriptors.append(packed)
+            pos += 10 + (3 << ((packed & 7) + 1) if packed & 0x80 else 0) + 1
+        while data[pos]:
+            pos += data[pos] + 1
+        pos += 1
+    return flags, descriptors
+
+
+def test_scheme_colors_come_first_with_the_background_at_zero():
+    codes = load_color_scheme("yoru")
+    palette = ColorPalette.from_color_scheme("yoru")
+    assert tuple(palette.colors[0]) == _hex_to_rgb(codes["49"])
+    scheme = {_hex_to_rgb(color) for color in codes.values()}
+    assert {tuple(rgb) for rgb in palette.colors[:len(scheme)]} == scheme
+    assert len(palette.colors) < TRANSPARENT_INDEX
+
+    table = palette.to_bytes()
+    assert len(table) == 256 * 3
+    assert table[:len(palette.colors) * 3] == palette.colors.tobytes()
+
+
+def test_exact_colors_use_the_lookup_table_and_others_the_nearest_entry():
+    palette = ColorPalette.from_color_scheme("yoru")
+    exact = palette.colors[None, :, :]
+    assert palette.map_rgb(exact).tolist() == [list(range(len(palette.colors)))]
+
+    # bordas suavizadas das fontes TTF: cores fora da paleta
+    off = np.random.default_rng(0).integers(0, 256, size=(8, 16, 3), dtype=np.uint8)
+    assert (palette._lookup[ColorPalette._keys(off)] == TRANSPARENT_INDEX).all()
+    distances = ((off[:, :, None, :].astype(int) - palette.colors.astype(int)) ** 2).sum(axis=3)
+    assert np.array_equal(palette.map_rgb(off), distances.argmin(axis=2))
+    # a cor calculada fica memorizada na tabela para os próximos frames
+    assert np.array_equal(palette._lookup[ColorPalette._keys(off)], distances.argmin(axis=2).ravel())
+
+
+def test_gif_has_one_global_palette_and_no_local_tables(tmp_path):
+    palette = ColorPalette.from_color_scheme("yoru")
+    rng = np.random.default_rng(1)
+    file_name = str(tmp_path / "out.gif")
+    with GifWriter(file_name, duration=100, tail_durations=(), palette=palette) as writer:
+        for _ in range(4):
+            writer.add_frame(rng.integers(0, len(palette.colors), size=(20, 30), dtype=np.uint8))
+
+    with open(file_name, "rb") as f:
+        data = f.read()
+    flags, descriptors = image_descriptors(data)
+    assert flags & 0x80 and flags & 7 == 7  # tabela global de 256 cores
+    assert data[13:13 + 768] == palette.to_bytes()
+    assert len(descriptors) == writer.frame_count == 4
+    assert not any(packed & 0x80 for packed in descriptors)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Testes do perfil de execução (trechos, totais e picos de memória)"""
+
+import json
+
+import run_profile
+from github_stats import GitHubStatsFetcher
+from github_stub import GitHubStub, sample_data
+
+
+def test_nested_spans_counters_and_memory_peaks(tmp_path):
+    path = tmp_path / "profile.json"
+    profile = run_profile.start(str(path), trace_memory=True)
+    try:
+        with run_profile.span("render_gif") as outer:
+            with run_profile.span("scene", scene="bios") as attrs:
+                buffer = bytearray(4 * 2**20)
+                attrs["frames"] = 3
+            del buffer
+            run_profile.add("gif.encode_frame", 0.25)
+            run_profile.add("gif.encode_frame", 0.5)
+            run_profile.count("gif.frames_deduplicated", 2)
+            outer["ok"] = True
+    finally:
+        assert run_profile.finish() == str(path)
+
+    data = json.loads(path.read_text())
+    outer, inner = data["spans"]
+    assert (outer["name"], outer["parent"], outer["attrs"]) == ("render_gif", None, {"ok": True})
+    assert (inner["name"], inner["parent"]) == ("scene", outer["id"])
+    assert inner["attrs"] == {"scene": "bios", "frames": 3}
+    assert inner["peak_mb"] >= 4 and outer["peak_mb"] >= inner["peak_mb"]
+    assert data["peak_memory_mb"] >= 4
+    assert data["aggregates"] == {"gif.encode_frame": {"count": 2, "seconds": 0.75}}
+    assert data["counters"] == {"gif.frames_deduplicated": 2}
+    assert profile.spans and run_profile.current() is None
+
+
+def test_api_calls_are_recorded_with_status_and_bytes(tmp_path):
+    run_profile.start(str(tmp_path / "profile.json"))
+    try:
+        with GitHubStub(sample_data(num_repos=3)) as stub:
+            with GitHubStatsFetcher("token", base_url=stub.url, cache_dir="") as fetcher:
+                fetcher.get_user_commits_last_year()
+        spans = run_profile.current().spans
+    finally:
+        run_profile.finish()
+
+    calls = [span["attrs"] for span in spans if span["name"] == "api"]
+    assert len(calls) == len(stub.requests) == 4
+    assert {call["path"] for call in calls} >= {"/users/dudupys/repos", "/repos/dudupys/repo-0/commits"}
+    assert all(call["status"] == 200 and call["bytes"] > 0 and call["method"] == "GET" for call in calls)
+
+
+def test_without_profile_everything_is_a_no_op():
+    assert run_profile.current() is None
+    with run_profile.span("scene", scene="bios") as attrs:
+        attrs["frames"] = 1
+    run_profile.add("gif.encode_frame", 1.0)
+    run_profile.count("gif.frames")
+    assert run_profile.finish() is None
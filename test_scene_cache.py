@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Testes do cache de cenas: cenas com as mesmas entradas não são renderizadas de novo"""
+
+import os
+
+import numpy as np
+
+from scene_cache import SceneCache
+from scenes import Scene, render_scenes
+
+
+class ListSink:
+    def __init__(self):
+        self.frames = []
+
+    def add_frame(self, frame, count=1, dirty=None):
+        self.frames.append((frame.copy(), count))
+
+
+def make_terminal(sink):
+    return sink
+
+
+def test_cached_scenes_are_not_rendered_again(tmp_path):
+    calls = []
+
+    def draw(sink, value):
+        calls.append(value)
+        for i in range(3):
+            sink.add_frame(np.full((4, 6), value + i, dtype=np.uint8), count=i + 1)
+
+    def run(values):
+        sink = ListSink()
+        cache = SceneCache(str(tmp_path), b"fingerprint")
+        scenes = [Scene(f"scene{i}", draw, value=value) for i, value in enumerate(values)]
+        render_scenes(scenes, make_terminal, sink, workers=1, cache=cache)
+        return sink.frames, cache
+
+    first, _ = run([1, 10])
+    calls.clear()
+    second, cache = run([1, 20])
+
+    assert calls == [20]
+    assert cache.hits == ["scene0"] and cache.misses == ["scene1"]
+    assert [count for _, count in second] == [count for _, count in first]
+    for (cached, _), (rendered, _) in zip(second[:3], first[:3]):
+        assert np.array_equal(cached, rendered)
+    # a versão antiga da cena alterada é removida
+    assert len(list(tmp_path.glob("scene1-*.npz"))) == 1
+
+
+def test_each_fingerprint_keeps_its_own_version(tmp_path):
+    def draw(sink):
+        sink.add_frame(np.zeros((4, 6), dtype=np.uint8))
+
+    scene = Scene("bios", draw)
+    caches = [SceneCache(str(tmp_path), fingerprint) for fingerprint in (b"fontes-a", b"fontes-b")]
+    # gravação em andamento de outro processo, com o mesmo prefixo
+    in_progress = tmp_path / f"{caches[1]._prefix(scene)}outra.123.tmp.npz"
+    in_progress.write_bytes(b"")
+    for cache in caches:
+        cache.store(scene, [(np.zeros((4, 6), dtype=np.uint8), 1, None)])
+
+    # dois conjuntos de fontes no mesmo batch não apagam o arquivo um do outro
+    assert all(cache.load(scene) is not None for cache in caches)
+    assert in_progress.exists()
+
+    # o que ficou sem uso por mais que o limite é apagado
+    os.utime(in_progress, (0, 0))
+    caches[0].prune()
+    assert not in_progress.exists() and len(list(tmp_path.glob("bios-*.npz"))) == 2
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Testes da renderização das cenas: em paralelo, o GIF é o mesmo da renderização serial"""
+
+import random
+
+import numpy as np
+import pytest
+
+import scenes
+from gif_writer import GifWriter
+from palette import ColorPalette
+from scenes import Scene, render_scenes
+
+
+class BlockTerminal:
+    """Terminal mínimo: desenha blocos em posições sorteadas pelo `random` da cena"""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.frame = np.zeros((48, 64), dtype=np.uint8)
+
+    def block(self, color, count=1):
+        y, x = random.randrange(0, 40), random.randrange(0, 56)
+        self.frame[y:y + 8, x:x + 8] = color
+        self.sink.add_frame(self.frame, count, (x, y, x + 8, y + 8))
+
+
+def draw(t, colors, pause):
+    for color in colors:
+        t.block(color)
+    t.block(colors[-1], count=pause)  # quadro parado: vira uma repetição
+
+
+def make_terminal(sink):
+    return BlockTerminal(sink)
+
+
+def render_gif(file_name, workers):
+    scene_list = [Scene(f"cena-{i}", draw, colors=list(range(1 + i, 8 + i)), pause=3 + i) for i in range(4)]
+    with GifWriter(str(file_name), duration=100, palette=ColorPalette.from_color_scheme("yoru")) as writer:
+        render_scenes(scene_list, make_terminal, writer, workers=workers)
+    return file_name.read_bytes()
+
+
+def test_parallel_render_gives_the_same_gif(tmp_path):
+    serial = render_gif(tmp_path / "serial.gif", workers=1)
+    assert render_gif(tmp_path / "paralelo.gif", workers=3) == serial
+
+
+@pytest.mark.parametrize("value, expected", [("", 1), ("2", 2), ("dois", 1), ("0", None)])
+def test_render_workers_from_env(monkeypatch, capsys, value, expected):
+    monkeypatch.setenv("RENDER_WORKERS", value)
+    monkeypatch.setattr(scenes.os, "cpu_count", lambda: 6)
+    assert scenes.render_workers_from_env() == (6 if expected is None else expected)
+    assert ("inválido" in capsys.readouterr().out) == (value == "dois")
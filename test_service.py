@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Testes do modo serviço: respostas da memória, ETag e atualizações agrupadas"""
+
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import service
+
+
+@pytest.fixture
+def profile_service(tmp_path, monkeypatch):
+    """Serviço com estatísticas mock e um GIF falso no lugar da renderização"""
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setenv("SCENE_CACHE_DIR", "")
+    renders = []
+
+    def fake_render_gif(year_now, time_now, git_user_details, fingerprint):
+        renders.append(time_now)
+        return b"GIF89a" + str(len(renders)).encode()
+
+    svc = service.ProfileService(interval=3600, token="", work_dir=str(tmp_path))
+    monkeypatch.setattr(svc, "_render_gif", fake_render_gif)
+    svc.renders_seen = renders
+    yield svc
+    svc.stop()
+
+
+def test_concurrent_refreshes_share_one_build(profile_service, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    builds = []
+
+    def slow_build():
+        builds.append(1)
+        started.set()
+        release.wait(5)
+        return service.Snapshot(b"GIF89a", b"readme", "digest")
+
+    monkeypatch.setattr(profile_service, "build", slow_build)
+    first = profile_service.refresh()
+    started.wait(5)
+    futures = [profile_service.refresh() for _ in range(5)]
+    release.set()
+
+    assert all(future is first for future in futures)
+    assert first.result(5).files["/README.md"] == b"readme"
+    assert builds == [1] and profile_service.coalesced == 5
+    # terminada a atualização, um novo pedido começa outra
+    profile_service.refresh().result(5)
+    assert len(builds) == 2
+
+
+def test_http_serves_from_memory_with_etags(profile_service):
+    server = service.serve(profile_service.start(), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{url}/output.gif") as response:
+            etag = response.headers["ETag"]
+            assert response.read() == b"GIF89a1"
+            assert response.headers["Content-Type"] == "image/gif"
+            assert 3590 <= int(response.headers["Cache-Control"].split("max-age=")[1]) <= 3600
+        with urllib.request.urlopen(f"{url}/README.md") as response:
+            assert b"output.gif" in response.read()
+
+        request = urllib.request.Request(f"{url}/output.gif", headers={"If-None-Match": etag})
+        with pytest.raises(urllib.error.HTTPError) as not_modified:
+            urllib.request.urlopen(request)
+        assert not_modified.value.code == 304
+
+        # nada mudou: a atualização não renderiza e o ETag continua o mesmo
+        with urllib.request.urlopen(urllib.request.Request(f"{url}/refresh", method="POST")):
+            pass
+        assert profile_service.builds == 2 and profile_service.renders == 1
+        assert profile_service.snapshot.etags["/output.gif"] == etag
+        assert len(profile_service.renders_seen) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_stale_snapshot_is_served_while_refreshing(profile_service, monkeypatch):
+    profile_service.refresh().result(5)
+    snapshot = profile_service.snapshot
+    monkeypatch.setattr(profile_service, "interval", 0)
+    monkeypatch.setattr(profile_service, "build", lambda: (time.sleep(0.2), service.Snapshot(b"new", b"", "x"))[1])
+
+    start = time.perf_counter()
+    assert profile_service.current() is snapshot
+    assert time.perf_counter() - start < 0.1
+    profile_service.refresh().result(5)
+    assert profile_service.snapshot.files["/output.gif"] == b"new"
+
+
+def test_failed_refresh_backs_off_until_the_next_interval(profile_service, monkeypatch):
+    profile_service.refresh().result(5)
+    snapshot = profile_service.snapshot
+    monkeypatch.setattr(profile_service, "interval", 60)
+    monkeypatch.setattr(profile_service, "checked_at", time.time() - 61)  # versão vencida
+    attempts = []
+
+    def failing_build():
+        attempts.append(1)
+        raise ConnectionError("GitHub fora do ar")
+
+    monkeypatch.setattr(profile_service, "build", failing_build)
+    assert profile_service.current() is snapshot
+    with pytest.raises(ConnectionError):
+        profile_service._pending.result(5)
+
+    # a falha conta como tentativa: as próximas requisições não disparam outra busca
+    for _ in range(5):
+        assert profile_service.current() is snapshot
+    assert attempts == [1] and profile_service.failures == 1
+    assert profile_service.max_age() > 0 and not profile_service.is_stale()
+
+    profile_service.failed_at -= 60  # passou o intervalo
+    assert profile_service.is_stale()
+    profile_service.current()
+    profile_service._pending.exception(5)
+    assert attempts == [1, 1]
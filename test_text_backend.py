@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Testes do TextTerminal e das saídas em SVG e asciicast"""
+
+import importlib.util
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from cell_terminal import CellTerminal
+from gif_writer import GifWriter
+from text_backend import AsciicastWriter, SvgWriter, TextFanout, TextTerminal
+
+GIFOS_SPEC = importlib.util.find_spec("gifos")
+FONT_FILE = (os.path.join(GIFOS_SPEC.submodule_search_locations[0], "fonts", "gohufont-uni-14.pil")
+             if GIFOS_SPEC else "")
+
+pytestmark = pytest.mark.skipif(not os.path.exists(FONT_FILE), reason="gifos não instalado")
+
+
+def draw(t):
+    t.toggle_show_cursor(False)
+    t.gen_text("GIF_OS Modular BIOS v1.0.11", 1)
+    t.gen_text("Copyright (C) \x1b[31mEduardo\x1b[0m \x1b[30;101mInc.\x1b[0m", 2, count=3)
+    for i in range(3):
+        t.delete_row(3)
+        t.gen_text(f"Memory Test: {i}", 3, contin=True)
+    t.set_prompt("\x1b[0;91mdudupys\x1b[0m@\x1b[0;93mgifos ~> \x1b[0m")
+    t.gen_prompt(5)
+    t.gen_typing_text("fetch.sh -u dudupys", 5, contin=True, speed=1)
+    t.gen_text("linha\n" * 12, 6)  # força a rolagem da tela
+    t.clear_frame()
+    t.gen_text("fim", 1, count=2)
+
+
+class Recorder:
+    def __init__(self):
+        self.frames = []
+
+    def add_frame(self, frame, count=1, dirty=None):
+        self.frames.append((frame, count))
+
+
+def test_same_frames_and_final_screen_as_cell_terminal():
+    text, cells = Recorder(), Recorder()
+    draw(TextTerminal(text, 300, 260, 10, 10, FONT_FILE, 15))
+    draw(CellTerminal(cells, 300, 260, 10, 10, FONT_FILE, 15))
+
+    assert [count for _, count in text.frames] == [count for _, count in cells.frames]
+    assert [run[:3] for run in text.frames[-1][0]] == [(10, 10, "fim")]
+    # a linha 3 só mostra o último "Memory Test" depois de cada delete_row
+    memory = [[run[2] for run in frame if run[2].startswith("Memory")] for frame, _ in text.frames]
+    assert all(len(runs) <= 1 for runs in memory) and ["Memory Test: 2"] in memory
+
+
+def test_svg_is_valid_compact_and_keeps_typed_text_linear(tmp_path):
+    svg, gif = tmp_path / "output.svg", tmp_path / "output.gif"
+    with SvgWriter(str(svg), 300, 260, duration=100) as writer:
+        draw(TextTerminal(writer, 300, 260, 10, 10, FONT_FILE, 15))
+    with GifWriter(str(gif), duration=100) as gif_writer:
+        draw(CellTerminal(gif_writer, 300, 260, 10, 10, FONT_FILE, 15))
+
+    root = ET.parse(svg).getroot()
+    texts = [element.text for element in root.iter("{http://www.w3.org/2000/svg}text")]
+    assert "GIF_OS Modular BIOS v1.0.11" in texts and "fim" in texts
+    # cada tecla digitada vira um trecho novo, sem repetir o começo da linha
+    assert texts.count("f") >= 1 and not any(text.startswith("fetch.") for text in texts)
+    style = root.find("{http://www.w3.org/2000/svg}style").text
+    # duração total: frames de 100ms mais as durações finais do GIF
+    assert float(re.search(r"animation:([\d.]+)s", style).group(1)) == pytest.approx(gif_writer.total_duration / 1000, abs=0.2)
+    assert svg.stat().st_size < gif.stat().st_size
+
+
+def test_asciicast_replays_to_the_final_screen(tmp_path):
+    svg, cast = tmp_path / "output.svg", tmp_path / "output.cast"
+    sink = TextFanout(SvgWriter(str(svg), 300, 260), AsciicastWriter(str(cast), 300, 260, 10, 10, 8, 18))
+    draw(TextTerminal(sink, 300, 260, 10, 10, FONT_FILE, 15))
+    sink.close()
+
+    header, *events = [json.loads(line) for line in cast.read_text().splitlines()]
+    assert header["version"] == 2 and (header["width"], header["height"]) == (35, 13)
+    times = [event[0] for event in events]
+    assert times == sorted(times) and all(event[1] == "o" for event in events)
+    # o último evento com saída redesenha a linha 1 com "fim" e apaga as demais
+    last = next(event[2] for event in reversed(events) if event[2])
+    assert re.sub(r"\x1b\[[\d;]*[A-Za-z]", "", last).strip().startswith("fim")
+    assert svg.exists()
@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+"""Saídas vetoriais/texto da animação: SVG animado e asciicast
+
+O `TextTerminal` tem a mesma interface do `CellTerminal` (gen_text,
+gen_typing_text, delete_row, clear_frame, set_font...), então as cenas do
+main.py rodam nele sem mudanças. Em vez de pixels, cada frame é uma tupla de
+trechos de texto com cor e posição, e os sinks transformam a sequência em:
+
+- `SvgWriter`: SVG com keyframes CSS; cada trecho de texto aparece uma vez no
+  arquivo, com os intervalos em que está visível;
+- `AsciicastWriter`: arquivo .cast (asciicast v2) do asciinema, com só as
+  linhas que mudaram em cada frame.
+
+Nada é rasterizado nem comprimido com LZW; as fontes só são abertas para
+obter as medidas das células, as mesmas do GIF.
+"""
+
+import json
+import os
+import random
+import re
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+import run_profile
+from cell_terminal import (ANSI_ESCAPE_PATTERN, BG_COLOR_CODES, COLOR_CODE_PATTERN, TXT_COLOR_CODES,
+                           FontMetrics)
+from gif_writer import TAIL_DURATIONS, frame_duration_from_env
+from palette import load_color_scheme
+
+# Fonte de um trecho: (tamanho, largura da célula, altura da célula)
+FontBox = Tuple[int, int, int]
+# Trecho de texto de um frame: (x, y, texto, cor do texto, cor de fundo, fonte)
+Run = Tuple[int, int, str, str, str, FontBox]
+TextFrame = Tuple[Run, ...]
+
+# Célula da grade: (caractere, cor do texto, cor de fundo)
+Cell = Optional[Tuple[str, str, str]]
+
+
+class TextTerminal:
+    """Terminal com a interface do `CellTerminal` que produz frames de texto
+
+    Os frames são enviados para `sink.add_frame(frame, count)` como
+    `TextFrame`s. Como no `CellTerminal`, há uma camada fixa (trechos de
+    fontes anteriores e rolagem), agora em coordenadas de pixel, e a grade de
+    células da fonte atual.
+    """
+
+    def __init__(self, sink, width: int, height: int, xpad: int, ypad: int,
+                 font_file: str, font_size: int = 16, line_spacing: int = 4):
+        self.sink = sink
+        self._width = width
+        self._height = height
+        self._xpad = xpad
+        self._ypad = ypad
+        self._metrics: Dict[tuple, FontMetrics] = {}
+        self._colors = load_color_scheme()
+        self._txt_color = self._def_txt_color = self._colors["39"]
+        self._bg_color = self._def_bg_color = self._colors["49"]
+        self._frame_count = 0
+        self.curr_row = 0
+        self.curr_col = 0
+        self._fixed: List[Run] = []
+        self._cells: Optional[List[List[Cell]]] = None
+        self.set_font(font_file, font_size, line_spacing)
+        # mesmas configurações (e variáveis de ambiente) que o gifos lê
+        self._cursor = self._cursor_orig = os.getenv("GIFOS_GENERAL_CURSOR", "_")
+        self._show_cursor = os.getenv("GIFOS_GENERAL_SHOW_CURSOR", "true").lower() == "true"
+        self._blink_cursor = os.getenv("GIFOS_GENERAL_BLINK_CURSOR", "true").lower() == "true"
+        self._fps = float(os.getenv("GIFOS_GENERAL_FPS", "15"))
+        self._prompt = "\x1b[0;91mx0rzavi\x1b[0m@\x1b[0;93mgifos ~> \x1b[0m"
+        self.clear_frame()
+
+    # -- estado -----------------------------------------------------------
+
+    def set_txt_color(self, txt_color: Optional[str] = None) -> None:
+        self._txt_color = txt_color or self._def_txt_color
+
+    def set_bg_color(self, bg_color: Optional[str] = None) -> None:
+        self._bg_color = bg_color or self._def_bg_color
+
+    def set_font(self, font_file: str, font_size: int = 16, line_spacing: int = 4) -> None:
+        with run_profile.span("font", file=os.path.basename(font_file), size=font_size):
+            if self._cells is not None:
+                self._fixed = self._runs()  # fixa o que foi escrito com a fonte anterior
+            key = (font_file, font_size, line_spacing)
+            if key not in self._metrics:
+                self._metrics[key] = FontMetrics(font_file, font_size, line_spacing)
+            self._font = self._metrics[key]
+            self._box: FontBox = (font_size, self._font.width, self._font.cell_height)
+            self.num_rows = (self._height - 2 * self._ypad) // self._font.cell_height
+            self.num_cols = (self._width - 2 * self._xpad) // self._font.width
+            self._grid_cols = -(-(self._width - self._xpad) // self._font.width)
+            self._cells = [[None] * self._grid_cols for _ in range(self.num_rows)]
+            self._col_in_row = {_ + 1: 1 for _ in range(self.num_rows)}
+
+    def toggle_show_cursor(self, choice: Optional[bool] = None) -> None:
+        self._show_cursor = not self._show_cursor if choice is None else choice
+
+    def toggle_blink_cursor(self, choice: Optional[bool] = None) -> None:
+        self._blink_cursor = not self._blink_cursor if choice is None else choice
+
+    def set_prompt(self, prompt: str) -> None:
+        self._prompt = prompt
+
+    def set_fps(self, fps: float) -> None:
+        self._fps = fps
+
+    # -- frames -----------------------------------------------------------
+
+    def _cell_origin(self, row_num: int, col_num: int) -> Tuple[int, int]:
+        x1 = self._xpad + (col_num - 1) * self._font.width
+        y1 = self._ypad + (row_num - 1) * self._font.cell_height
+        return x1, y1
+
+    def _runs(self, cursor: Optional[Tuple[int, int]] = None) -> List[Run]:
+        """Trechos do frame atual: camada fixa e células vizinhas de mesma cor agrupadas"""
+        runs = list(self._fixed)
+        for row, cells in enumerate(self._cells):
+            col = 0
+            while col < len(cells):
+                cell = cells[col]
+                if cell is None:
+                    col += 1
+                    continue
+                start, chars = col, []
+                while col < len(cells) and cells[col] is not None and cells[col][1:] == cell[1:]:
+                    chars.append(cells[col][0])
+                    col += 1
+                x, y = self._cell_origin(row + 1, start + 1)
+                runs.append((x, y, "".join(chars), cell[1], cell[2], self._box))
+        if cursor is not None:
+            x, y = self._cell_origin(*cursor)
+            runs.append((x, y, str(self._cursor), self._def_txt_color, self._def_bg_color, self._box))
+        return runs
+
+    def _emit(self, count: int = 1, cursor: Optional[Tuple[int, int]] = None) -> None:
+        if count <= 0:
+            return
+        self._frame_count += count
+        self.sink.add_frame(tuple(self._runs(cursor)), count)
+
+    def clear_frame(self) -> None:
+        self._fixed = []
+        self._cells = [[None] * self._grid_cols for _ in range(self.num_rows)]
+        self._col_in_row = {_ + 1: 1 for _ in range(self.num_rows)}
+        self.cursor_to_box(1, 1)
+
+    def clone_frame(self, count: int = 1) -> None:
+        self._emit(count)
+
+    # -- cursor e texto ---------------------------------------------------
+
+    def cursor_to_box(self, row_num: int, col_num: int, text_num_lines: int = 1,
+                      text_num_chars: int = 1, contin: bool = False,
+                      force_col: bool = False) -> tuple:
+        """Mesma lógica de posicionamento (e rolagem) do gifos"""
+        if row_num < 1 or col_num < 1:
+            raise ValueError
+        elif row_num > self.num_rows:
+            row_num = self.num_rows
+        max_row_num = self.num_rows - text_num_lines + 1
+        min_col_num = self._col_in_row[row_num]
+
+        if not contin:
+            first_blank_row = self.num_rows + 1
+            for i in range(self.num_rows, row_num - 1, -1):
+                if self._col_in_row[i] == 1:
+                    first_blank_row = i
+                else:
+                    break
+            if row_num > max_row_num:
+                row_num = max_row_num
+            elif first_blank_row > row_num:
+                self.scroll_up(first_blank_row - row_num)
+        elif col_num < min_col_num and not force_col:
+            col_num = self._col_in_row[row_num]
+        self.curr_row, self.curr_col = row_num, col_num
+
+        x1, y1 = self._cell_origin(row_num, col_num)
+        return x1, y1, x1 + self._font.width, y1 + self._font.cell_height
+
+    def _apply_escape(self, word: str) -> None:
+        codes = [code for _ in re.findall(COLOR_CODE_PATTERN, word) for code in _ if code]
+        for code in codes:
+            if code == "0":
+                self.set_txt_color()
+                self.set_bg_color()
+            elif code in TXT_COLOR_CODES:
+                self.set_txt_color(self._colors[code])
+            elif code in BG_COLOR_CODES:
+                self.set_bg_color(self._colors[code])
+
+    def _put_text(self, word: str) -> None:
+        if not self._font.fits_grid:
+            # fontes fora da grade (TTF proporcional, sem espaçamento) vão direto para a camada fixa
+            x, y = self._cell_origin(self.curr_row, self.curr_col)
+            self._fixed.append((x, y, word, self._txt_color, self._bg_color, self._box))
+        else:
+            cells = self._cells[self.curr_row - 1]
+            start = self.curr_col - 1
+            for offset, col in enumerate(range(start, min(start + len(word), self._grid_cols))):
+                cells[col] = (word[offset], self._txt_color, self._bg_color)
+        self.curr_col += len(word)
+        self._col_in_row[self.curr_row] = self.curr_col
+
+    def gen_text(self, text, row_num: int, col_num: int = 1, count: int = 1,
+                 prompt: bool = False, contin: bool = False) -> None:
+        if prompt and contin:
+            print("ERROR: Both prompt and contin can't be simultaneously True")
+            sys.exit(1)
+
+        text_lines = text.splitlines() if isinstance(text, str) else text
+        for i, line in enumerate(text_lines):
+            self.cursor_to_box(row_num + i, col_num, 1, 1, contin)
+            for word in [word for word in re.split(ANSI_ESCAPE_PATTERN, line) if word]:
+                if re.match(ANSI_ESCAPE_PATTERN, word):
+                    self._apply_escape(word)
+                else:
+                    self.cursor_to_box(row_num + i, col_num, 1, len(word), True)
+                    self._put_text(word)
+        multiline = len(text_lines) > 1
+        if multiline:
+            self.cursor_to_box(self.curr_row + 1, 1, 1, 1, contin)
+        if prompt and multiline:
+            self.gen_prompt(self.curr_row, 1, 1)
+
+        if not self._show_cursor:
+            self._emit(count)
+            return
+        for _ in range(count):
+            self.cursor_to_box(self.curr_row, self.curr_col, 1, 1, contin=True)
+            self._emit(1, cursor=(self.curr_row, self.curr_col))
+            # como no gifos, a célula do cursor volta a ficar vazia
+            self._erase(self.curr_row, self.curr_col, self.curr_col + 1)
+            if self._blink_cursor and self._frame_count % max(int(self._fps) // 3, 1) == 0:
+                self._cursor = self._cursor_orig if self._cursor != self._cursor_orig else " "
+
+    def gen_typing_text(self, text: str, row_num: int, col_num: int = 1,
+                        contin: bool = False, speed: int = 0) -> None:
+        if not contin:
+            self.cursor_to_box(row_num, col_num, 1, 1, contin)
+        for word in [word for word in re.split(ANSI_ESCAPE_PATTERN, text) if word]:
+            if re.match(ANSI_ESCAPE_PATTERN, word):
+                self.gen_text(word, row_num, self._col_in_row[row_num], 0, False, True)
+            else:
+                for char in word:
+                    count = speed if speed in [1, 2, 3] else random.choice([1, 2, 3])
+                    self.gen_text(char, row_num, self._col_in_row[row_num], count, False, True)
+
+    def gen_prompt(self, row_num: int, col_num: int = 1, count: int = 1) -> None:
+        self.clone_frame(1)
+        orig_cursor_state = self._show_cursor
+        self.toggle_show_cursor(True)
+        self.gen_text(self._prompt, row_num, col_num, count, False, False)
+        self._show_cursor = orig_cursor_state
+
+    def scroll_up(self, count: int = 1) -> None:
+        for _ in range(count):
+            runs = self._runs()
+            shift = self._font.cell_height
+            # o que sai pelo topo do frame é descartado
+            self._fixed = [(x, y - shift, *rest) for x, y, *rest in runs if y - shift >= 0]
+            self._cells = [[None] * self._grid_cols for _ in range(self.num_rows)]
+            self.curr_row -= 1
+            values = list(self._col_in_row.values())
+            self._col_in_row = dict(zip(self._col_in_row.keys(), values[1:] + [1]))
+
+    def _erase(self, row_num: int, col_num: int, end_col: Optional[int] = None) -> None:
+        """Apaga as células e os trechos fixos da faixa da linha, da coluna até `end_col` (ou a borda)"""
+        cells = self._cells[row_num - 1]
+        for col in range(col_num - 1, min(end_col - 1 if end_col else self._grid_cols, self._grid_cols)):
+            cells[col] = None
+        x1, y1 = self._cell_origin(row_num, col_num)
+        x2 = self._cell_origin(row_num, end_col)[0] if end_col else self._width
+        y2 = y1 + self._font.cell_height
+        kept = []
+        for run in self._fixed:
+            x, y, text, fg, bg, box = run
+            run_x2 = x + len(text) * box[1]
+            if y + box[2] <= y1 or y >= y2 or run_x2 <= x1 or x >= x2:
+                kept.append(run)
+                continue
+            # mantém os caracteres inteiros de fora da faixa apagada
+            before = max(0, (x1 - x) // box[1])
+            after = max(0, -(-(x2 - x) // box[1]))
+            if before:
+                kept.append((x, y, text[:before], fg, bg, box))
+            if after < len(text):
+                kept.append((x + after * box[1], y, text[after:], fg, bg, box))
+        self._fixed = kept
+
+    def delete_row(self, row_num: int, col_num: int = 1) -> None:
+        self.cursor_to_box(row_num, col_num, 1, 1, True, force_col=True)
+        self._col_in_row[row_num] = col_num
+        self._erase(row_num, col_num)
+
+
+class _TextAnimation:
+    """Base dos sinks de texto: junta frames repetidos e aplica as durações finais do GIF"""
+
+    def __init__(self, file_name: str, duration: Optional[float] = None,
+                 tail_durations: Sequence[int] = TAIL_DURATIONS):
+        self.file_name = file_name
+        self.duration = duration if duration is not None else frame_duration_from_env()
+        self.tail_durations = tuple(tail_durations)
+        self.frames: List[Tuple[TextFrame, float]] = []
+        self.source_frame_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def add_frame(self, frame: TextFrame, count: int = 1) -> None:
+        self.source_frame_count += count
+        if self.frames and self.frames[-1][0] == frame:
+            last, duration = self.frames[-1]
+            self.frames[-1] = (last, duration + self.duration * count)
+            run_profile.count("text.frames_deduplicated", count)
+        else:
+            self.frames.append((frame, self.duration * count))
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.frames)
+
+    def _timeline(self) -> List[Tuple[TextFrame, float, float]]:
+        """(frame, início, fim) em segundos, com as durações mínimas dos últimos frames"""
+        tail = self.tail_durations[-len(self.frames):] if self.frames else ()
+        minimums = (0,) * (len(self.frames) - len(tail)) + tail
+        timeline, start = [], 0.0
+        for (frame, duration), minimum in zip(self.frames, minimums):
+            end = start + max(duration, minimum) / 1000
+            timeline.append((frame, start, end))
+            start = end
+        return timeline
+
+    def close(self) -> None:
+        if not self.frames:
+            return
+        with run_profile.span("text.write", file=self.file_name) as attrs:
+            content = self._render(self._timeline())
+            tmp_path = self.file_name + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, self.file_name)
+            attrs.update(frames=self.frame_count, bytes=os.path.getsize(self.file_name))
+
+    def _render(self, timeline: List[Tuple[TextFrame, float, float]]) -> str:
+        raise NotImplementedError
+
+
+def _percent(seconds: float, total: float) -> str:
+    return f"{100 * seconds / total:.2f}".rstrip("0").rstrip(".") + "%"
+
+
+class SvgWriter(_TextAnimation):
+    """SVG animado: cada trecho de texto é um elemento visível só nos seus intervalos
+
+    Trechos com os mesmos intervalos compartilham um grupo e uma animação
+    `@keyframes` (opacidade em degraus), então o tamanho cresce com o texto
+    novo de cada frame, e não com o número de frames.
+    """
+
+    def __init__(self, file_name: str = "output.svg", width: int = 750, height: int = 500,
+                 background: Optional[str] = None, **kwargs):
+        super().__init__(file_name, **kwargs)
+        self.width = width
+        self.height = height
+        self.background = background or load_color_scheme()["49"]
+
+    def _render(self, timeline: List[Tuple[TextFrame, float, float]]) -> str:
+        total = timeline[-1][2]
+        intervals: Dict[Run, List[List[float]]] = {}
+        previous: Dict[tuple, Dict[int, str]] = {}
+        for frame, start, end in timeline:
+            frame = self._split_typed(frame, previous)
+            previous = {}
+            for x, y, text, fg, bg, box in frame:
+                previous.setdefault((y, fg, bg, box), {})[x] = text
+            for run in frame:
+                spans = intervals.setdefault(run, [])
+                if spans and spans[-1][1] == start:
+                    spans[-1][1] = end
+                else:
+                    spans.append([start, end])
+
+        groups: Dict[tuple, List[Run]] = {}
+        for run, spans in intervals.items():
+            groups.setdefault(tuple(map(tuple, spans)), []).append(run)
+
+        # cor e tamanho viram classes CSS (.s0, .s1...), para não repetir em cada trecho
+        self._styles: Dict[Tuple[str, int], str] = {}
+        body = [f'<rect width="100%" height="100%" fill="{self.background}"/>']
+        keyframes = []
+        for spans, runs in groups.items():
+            elements = "".join(self._element(run) for run in runs)
+            if not elements:
+                continue
+            if spans == ((0.0, total),):
+                body.append(elements)
+                continue
+            # sem 0% e 100% explícitos, a animação parte (e termina) da opacidade 0 do grupo
+            steps = []
+            for start, end in spans:
+                steps.append(f"{_percent(start, total)}{{opacity:1}}")
+                if end < total:
+                    steps.append(f"{_percent(end, total)}{{opacity:0}}")
+            name = f"k{len(keyframes)}"
+            keyframes.append(f"@keyframes {name}{{{''.join(steps)}}}.{name}{{animation-name:{name}}}")
+            body.append(f'<g class="{name}">{elements}</g>')
+
+        styles = ["text{font-family:'DejaVu Sans Mono',Menlo,Consolas,monospace;white-space:pre}",
+                  f"g{{opacity:0;animation:{total:.3f}s step-end infinite}}"]
+        styles += [f".{name}{{fill:{fg};font-size:{size}px}}" for (fg, size), name in self._styles.items()]
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+                f'viewBox="0 0 {self.width} {self.height}">'
+                f"<style>{''.join(styles + keyframes)}</style>{''.join(body)}</svg>\n")
+
+    @staticmethod
+    def _split_typed(frame: TextFrame, previous: Dict[tuple, Dict[int, str]]) -> List[Run]:
+        """Divide cada trecho nos pedaços que já existiam no frame anterior mais o texto novo
+
+        Sem isso, cada tecla do `gen_typing_text` repetiria a linha inteira digitada até ali.
+        """
+        runs = []
+        for x, y, text, fg, bg, box in frame:
+            pieces = previous.get((y, fg, bg, box), {})
+            while text:
+                piece = pieces.get(x)
+                if not piece or not text.startswith(piece):
+                    piece = text
+                runs.append((x, y, piece, fg, bg, box))
+                x += len(piece) * box[1]
+                text = text[len(piece):]
+        return runs
+
+    def _element(self, run: Run) -> str:
+        x, y, text, fg, bg, (size, cell_w, cell_h) = run
+        width = len(text) * cell_w
+        rect = (f'<rect x="{x}" y="{y}" width="{width}" height="{cell_h}" fill="{bg}"/>'
+                if bg != self.background else "")
+        # sem texto visível: espaços, ou texto da mesma cor do fundo (a arte da Mona)
+        if not text.strip() or fg == bg:
+            return rect
+        style = self._styles.setdefault((fg, size), f"s{len(self._styles)}")
+        length = f' textLength="{width}"' if len(text) > 1 else ""
+        # linha de base aproximada: 80% do tamanho da fonte abaixo do topo da célula
+        return f'{rect}<text x="{x}" y="{y + round(size * 0.8)}" class="{style}"{length}>{escape(text)}</text>'
+
+
+class AsciicastWriter(_TextAnimation):
+    """Gravação asciinema (asciicast v2) numa grade fixa de caracteres
+
+    A grade é a da fonte inicial do terminal (`cell_width` x `cell_height`);
+    trechos de outras fontes (o logo, a arte da Mona) são posicionados pela
+    célula onde começam, um caractere por célula.
+    """
+
+    def __init__(self, file_name: str = "output.cast", width: int = 750, height: int = 500,
+                 xpad: int = 15, ypad: int = 15, cell_width: int = 8, cell_height: int = 18, **kwargs):
+        super().__init__(file_name, **kwargs)
+        self.xpad = xpad
+        self.ypad = ypad
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.cols = (width - 2 * xpad) // cell_width
+        self.rows = (height - 2 * ypad) // cell_height
+        self.default_bg = load_color_scheme()["49"]
+
+    @staticmethod
+    def _sgr(color: str, ground: int) -> str:
+        hex_color = color.lstrip("#")
+        r, g, b = (int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+        return f"{ground};2;{r};{g};{b}"
+
+    def _lines(self, frame: TextFrame) -> List[str]:
+        grid: List[List[Cell]] = [[None] * self.cols for _ in range(self.rows)]
+        for x, y, text, fg, bg, _ in frame:
+            row = round((y - self.ypad) / self.cell_height)
+            col = round((x - self.xpad) / self.cell_width)
+            if not 0 <= row < self.rows:
+                continue
+            for offset, char in enumerate(text):
+                if 0 <= col + offset < self.cols:
+                    grid[row][col + offset] = (char, fg, bg)
+        lines = []
+        for cells in grid:
+            while cells and cells[-1] is None:
+                cells.pop()
+            parts, style = [], None
+            for cell in cells:
+                char, fg, bg = cell or (" ", None, None)
+                cell_style = (fg, bg if bg != self.default_bg else None)
+                if cell_style != style:
+                    codes = ["0"]
+                    if fg:
+                        codes.append(self._sgr(fg, 38))
+                    if cell_style[1]:
+                        codes.append(self._sgr(bg, 48))
+                    parts.append(f"\x1b[{';'.join(codes)}m")
+                    style = cell_style
+                parts.append(char)
+            if style is not None:
+                parts.append("\x1b[0m")
+            lines.append("".join(parts))
+        return lines
+
+    def _render(self, timeline: List[Tuple[TextFrame, float, float]]) -> str:
+        header = {"version": 2, "width": self.cols, "height": self.rows,
+                  "env": {"TERM": "xterm-256color"}}
+        events = [json.dumps(header)]
+        previous: List[str] = []
+        for number, (frame, start, _) in enumerate(timeline):
+            lines = self._lines(frame)
+            output = "\x1b[H\x1b[2J" if number == 0 else ""
+            for row, line in enumerate(lines):
+                if number == 0 or line != previous[row]:
+                    output += f"\x1b[{row + 1};1H{line}\x1b[K"
+            previous = lines
+            if output:
+                events.append(json.dumps([round(start, 3), "o", output]))
+        # mantém o último frame na tela pelo tempo final do GIF
+        events.append(json.dumps([round(timeline[-1][2], 3), "o", ""]))
+        return "\n".join(events) + "\n"
+
+
+class TextFanout:
+    """Repassa cada frame para vários sinks de texto (ex.: SVG e asciicast)"""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def add_frame(self, frame: TextFrame, count: int = 1) -> None:
+        for sink in self.sinks:
+            sink.add_frame(frame, count)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+def render_text_scenes(scenes, make_terminal, sink) -> None:
+    """Roda as cenas em terminais de texto, em ordem, enviando os frames ao `sink`
+
+    Cada cena usa a mesma semente do `random` que na renderização do GIF
+    (`scenes.render_scene`), então o ritmo de digitação é o mesmo.
+    """
+    for scene in scenes:
+        random.seed(scene.name)
+        with run_profile.span("scene", scene=scene.name, backend="text"):
+            scene.render(make_terminal(sink), **scene.inputs)